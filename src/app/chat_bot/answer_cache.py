@@ -0,0 +1,228 @@
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+
+import numpy as np
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from app.chat_bot.models import KnowledgeVersion
+
+KB_VERSION_KEY = "kb"
+DOCUMENT_VERSION_KEY = "document:{id}"
+
+_TRAILING_PUNCTUATION = "?!.~ "
+
+
+def normalize_question(question: str) -> str:
+    """캐시 키용 질문 정규화 - 전각/반각, 대소문자, 공백, 끝 문장부호 차이를 제거"""
+    normalized = unicodedata.normalize("NFKC", question).lower()
+    normalized = re.sub(r"\s+", " ", normalized).strip()
+    return normalized.rstrip(_TRAILING_PUNCTUATION)
+
+
+def _bump_version(key: str):
+    """버전 행을 원자적으로 1 증가 (없으면 만든다) - 여러 프로세스가 동시에 올려도 유실되지 않는다"""
+    if KnowledgeVersion.objects.filter(key=key).update(value=F("value") + 1):
+        return
+    try:
+        with transaction.atomic():
+            KnowledgeVersion.objects.create(key=key, value=1)
+    except IntegrityError:
+        # 다른 프로세스가 먼저 만든 경우
+        KnowledgeVersion.objects.filter(key=key).update(value=F("value") + 1)
+
+
+def get_kb_version() -> int:
+    """지식베이스 버전 - CompanyContent/Project/BlogPost 가 바뀔 때마다 증가"""
+    return KnowledgeVersion.objects.filter(key=KB_VERSION_KEY).values_list("value", flat=True).first() or 0
+
+
+def bump_kb_version():
+    _bump_version(KB_VERSION_KEY)
+
+
+def get_document_versions(document_ids: Iterable[str]) -> Dict[str, Optional[int]]:
+    """원본 문서(CompanyContent/Project/BlogPost)별 버전 조회 - 한 번도 바뀐 적 없으면 None"""
+    keys = {DOCUMENT_VERSION_KEY.format(id=document_id): document_id for document_id in document_ids}
+    found = dict(KnowledgeVersion.objects.filter(key__in=list(keys)).values_list("key", "value"))
+    return {document_id: found.get(key) for key, document_id in keys.items()}
+
+
+def bump_document_version(document_id: str):
+    _bump_version(DOCUMENT_VERSION_KEY.format(id=document_id))
+
+
+class AnswerCache:
+    """정규화된 질문 + 지식베이스 버전 기준 정확 일치 답변 캐시 (프로세스 내 LRU + TTL)"""
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(question: str, kb_version: int) -> str:
+        return f"{kb_version}:{normalize_question(question)}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+class SemanticAnswerCache:
+    """의미 유사 질문 답변 캐시
+
+    답변한 질문의 임베딩을 정규화해 하나의 float32 행렬에 모아 두고, 새 질문과의 코사인 유사도가
+    임계값 이상이면서 키워드(기술명/프로젝트명 등) 집합이 같은 가장 가까운 질문의 답변을 재사용한다.
+    ("파이썬 프로젝트" 와 "자바 프로젝트" 처럼 임베딩은 가깝지만 대상이 다른 질문을 구분하기 위함)
+    답변에 사용된 원본 문서 중 하나라도 바뀌면(문서 버전 변경) 해당 항목은 무효화된다.
+    """
+
+    def __init__(self, max_size: int, threshold: float, ttl_seconds: int):
+        self.max_size = max_size
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+
+        self._vectors: Optional[np.ndarray] = None  # (max_size, dim) - 임베딩 차원은 첫 저장 시 결정
+        self._valid = np.zeros(max_size, dtype=bool)
+        self._expires_at = np.zeros(max_size, dtype=np.float64)
+        self._last_used = np.zeros(max_size, dtype=np.float64)
+        self._entries: List[Optional[Dict[str, Any]]] = [None] * max_size
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, embedding: List[float], keywords: FrozenSet[str] = frozenset()) -> Optional[Dict[str, Any]]:
+        query = self._normalize(embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            if self._vectors is None or not self._valid.any():
+                self.misses += 1
+                return None
+
+            # 만료된 항목 정리 후 한 번의 행렬-벡터 곱으로 임계값 이상인 질문 탐색
+            self._valid &= self._expires_at >= now
+            scores = self._vectors @ query
+            scores[~self._valid] = -np.inf
+            candidates = np.flatnonzero(scores >= self.threshold)
+            candidates = candidates[np.argsort(-scores[candidates])]
+            row = next((int(row) for row in candidates if self._entries[row]["keywords"] == keywords), None)
+            if row is None:
+                self.misses += 1
+                return None
+            entry = self._entries[row]
+
+        # 답변에 사용된 문서가 저장 이후 바뀌었는지 확인 (락 밖에서 캐시 조회)
+        if get_document_versions(entry["document_versions"]) != entry["document_versions"]:
+            with self._lock:
+                if self._entries[row] is entry:
+                    self._valid[row] = False
+                    self._entries[row] = None
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self._last_used[row] = now
+            self.hits += 1
+        return entry["value"]
+
+    def add(
+        self,
+        embedding: List[float],
+        value: Dict[str, Any],
+        document_versions: Dict[str, Optional[int]],
+        keywords: FrozenSet[str] = frozenset(),
+    ):
+        """document_versions 는 답변에 쓴 문서를 검색한 시점의 버전 (get_document_versions)
+
+        답변 생성 후에 읽으면 그 사이 수정된 문서의 새 버전이 이전 내용으로 만든 답변에 붙어 무효화되지 않는다.
+        """
+        vector = self._normalize(embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_size, vector.shape[0]), dtype=np.float32)
+
+            free_rows = np.flatnonzero(~self._valid)
+            if len(free_rows):
+                row = int(free_rows[0])
+            else:
+                # 가득 찬 경우 가장 오래 사용되지 않은 항목 교체
+                row = int(np.argmin(self._last_used))
+
+            self._vectors[row] = vector
+            self._valid[row] = True
+            self._expires_at[row] = now + self.ttl_seconds
+            self._last_used[row] = now
+            self._entries[row] = {"value": value, "document_versions": document_versions, "keywords": keywords}
+
+    def record_saved_latency(self, saved_ms: float):
+        with self._lock:
+            self.saved_ms += max(saved_ms, 0.0)
+
+    def clear(self):
+        with self._lock:
+            self._valid[:] = False
+            self._entries = [None] * self.max_size
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": int(self._valid.sum()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "saved_ms": self.saved_ms,
+        }
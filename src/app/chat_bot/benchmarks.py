@@ -0,0 +1,393 @@
+# 챗봇 성능 벤치마크 - manage.py benchmark_chatbot 에서 사용
+
+import asyncio
+import hashlib
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.knowledge_document.models import ChatLog
+
+BENCHMARK_QUESTIONS = [
+    "이 회사는 뭐하는 회사인가요?",
+    "React 개발 가능한가요?",
+    "어떤 프로젝트를 진행했나요?",
+    "견적 문의는 어떻게 하나요?",
+    "Django로 진행한 프로젝트가 있나요?",
+]
+
+
+class StubChatModel(BaseChatModel):
+    """OpenAI 호출 대신 고정 지연 후 고정 답변을 반환하는 채팅 모델"""
+
+    latency_seconds: float = 1.0
+    answer: str = "벤치마크용 답변입니다."
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _result(self) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.answer))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency_seconds)
+        return self._result()
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency_seconds)
+        return self._result()
+
+
+class StubEmbeddings(Embeddings):
+    """텍스트 해시로 결정되는 단위 벡터를 고정 지연 후 반환하는 임베딩"""
+
+    def __init__(self, dimension: int = 1536, latency_seconds: float = 0.0):
+        self.dimension = dimension
+        self.latency_seconds = latency_seconds
+
+    def _vector(self, text: str) -> List[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dimension).astype(np.float32)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return [self._vector(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+def _latency_summary(latencies_ms: List[float], elapsed_seconds: float) -> Dict[str, Any]:
+    latencies_ms = sorted(latencies_ms)
+    return {
+        "requests": len(latencies_ms),
+        "throughput_rps": len(latencies_ms) / elapsed_seconds if elapsed_seconds else 0.0,
+        "p50_ms": statistics.median(latencies_ms),
+        "p95_ms": latencies_ms[min(len(latencies_ms) - 1, int(len(latencies_ms) * 0.95))],
+        "max_ms": latencies_ms[-1],
+    }
+
+
+def build_stub_service(llm_latency_seconds: float, embedding_latency_seconds: float = 0.0):
+    """OpenAI 대신 스텁 LLM/임베딩, 빈 인메모리 크로마를 사용하는 챗봇 서비스"""
+    from app.chat_bot.rag_service import CompanyChatbotService
+    from app.chat_bot.vector_stores import ChromaVectorStore
+
+    embeddings = StubEmbeddings(latency_seconds=embedding_latency_seconds)
+    service = CompanyChatbotService(
+        llm=StubChatModel(latency_seconds=llm_latency_seconds),
+        embeddings=embeddings,
+        vector_store=ChromaVectorStore(collection_name="benchmark", embedding_function=embeddings),
+    )
+    # 같은 질문이 반복되므로 캐시는 끄고 파이프라인 자체를 측정
+    service.answer_cache = None
+    service.semantic_cache = None
+    service.embeddings = embeddings
+    return service
+
+
+def benchmark_sync_vs_async(
+    requests: int = 200, concurrency: int = 100, sync_threads: int = 4, llm_latency_seconds: float = 1.0
+) -> Dict[str, Dict[str, Any]]:
+    """동기 경로(스레드 수만큼만 동시 처리) vs 비동기 경로(이벤트 루프 하나로 동시 처리) 비교
+
+    지연 시간은 요청 제출 시점부터 측정하므로 스레드를 기다리며 대기한 시간도 포함된다.
+    """
+    service = build_stub_service(llm_latency_seconds)
+    questions = [BENCHMARK_QUESTIONS[i % len(BENCHMARK_QUESTIONS)] for i in range(requests)]
+    chat_log_ids = []
+
+    # 동기 경로 - gunicorn 워커 스레드 수만큼의 스레드 풀
+    def run_sync(question, submitted_at):
+        result = service.process_question(question, "benchmark")
+        chat_log_ids.append(result["chat_log_id"])
+        return (time.perf_counter() - submitted_at) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sync_threads) as executor:
+        futures = [executor.submit(run_sync, question, time.perf_counter()) for question in questions]
+        sync_latencies = [future.result() for future in futures]
+    sync_summary = _latency_summary(sync_latencies, time.perf_counter() - started)
+    sync_summary["concurrency"] = sync_threads
+
+    # 비동기 경로 - 세마포어로 동시 대화 수 제한
+    async def run_async():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(question):
+            submitted_at = time.perf_counter()
+            async with semaphore:
+                result = await service.aprocess_question(question, "benchmark")
+            chat_log_ids.append(result["chat_log_id"])
+            return (time.perf_counter() - submitted_at) * 1000
+
+        return await asyncio.gather(*(one(question) for question in questions))
+
+    started = time.perf_counter()
+    async_latencies = asyncio.run(run_async())
+    async_summary = _latency_summary(list(async_latencies), time.perf_counter() - started)
+    async_summary["concurrency"] = concurrency
+
+    ChatLog.objects.filter(id__in=chat_log_ids).delete()
+
+    return {"sync": sync_summary, "async": async_summary}
+
+
+def _random_unit_vectors(count: int, dimension: int, seed: int) -> np.ndarray:
+    vectors = np.random.default_rng(seed).standard_normal((count, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _benchmark_search(store, queries: np.ndarray, k: int) -> Dict[str, Any]:
+    latencies = []
+    started = time.perf_counter()
+    for query in queries:
+        query_started = time.perf_counter()
+        store.similarity_search_by_vector(query.tolist(), k=k)
+        latencies.append((time.perf_counter() - query_started) * 1000)
+    summary = _latency_summary(latencies, time.perf_counter() - started)
+    summary["qps"] = summary.pop("throughput_rps")
+    return summary
+
+
+def benchmark_vector_store(
+    sizes=(1000, 10000, 100000), dimension: int = 1536, queries: int = 200, k: int = 10
+) -> Dict[str, Dict[str, Any]]:
+    """NumPy 인프로세스 인덱스 vs 크로마(HNSW) 의 적재 시간 / 검색 지연 / QPS 비교
+
+    무작위 단위 벡터를 add_embeddings 로 적재하므로 임베딩 API 는 호출하지 않는다.
+    """
+    from app.chat_bot.vector_stores import ChromaVectorStore, NumpyVectorStore
+
+    embeddings = StubEmbeddings(dimension=dimension)
+    query_vectors = _random_unit_vectors(queries, dimension, seed=1)
+    results = {}
+
+    for size in sizes:
+        vectors = _random_unit_vectors(size, dimension, seed=size)
+        ids = [f"doc_{i}" for i in range(size)]
+        texts = ["" for _ in range(size)]
+        metadatas = [{"source_type": "benchmark", "row": i} for i in range(size)]
+
+        stores = {
+            "numpy": NumpyVectorStore(embedding_function=embeddings),
+            "chroma": ChromaVectorStore(
+                collection_name=f"benchmark_{size}",
+                embedding_function=embeddings,
+                collection_metadata={"hnsw:space": "cosine"},
+            ),
+        }
+        for backend, store in stores.items():
+            started = time.perf_counter()
+            store.add_embeddings(texts, vectors.tolist(), metadatas, ids)
+            build_seconds = time.perf_counter() - started
+
+            summary = _benchmark_search(store, query_vectors, k)
+            summary["build_s"] = build_seconds
+            results[f"{backend}/{size}"] = summary
+
+            if backend == "chroma":
+                store.delete_collection()
+
+    return results
+
+
+def _perturbed_queries(corpus: np.ndarray, count: int, noise: float = 0.5, seed: int = 2) -> np.ndarray:
+    """코퍼스 벡터에 잡음을 섞은 쿼리 (실제 질문처럼 특정 문서 근처에 있는 쿼리)"""
+    rng = np.random.default_rng(seed)
+    base = corpus[rng.integers(0, len(corpus), count)]
+    queries = base + noise * rng.standard_normal(base.shape).astype(np.float32) / np.sqrt(corpus.shape[1])
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def _benchmark_quantized_corpus(
+    vectors: np.ndarray, query_vectors: np.ndarray, k: int, metadatas: List[dict] = None
+) -> Dict[str, Dict[str, Any]]:
+    import tempfile
+
+    from app.chat_bot.vector_stores import NumpyVectorStore
+
+    ids = [f"doc_{i}" for i in range(len(vectors))]
+    texts = ["" for _ in ids]
+    metadatas = metadatas or [{} for _ in ids]
+    embeddings = StubEmbeddings(dimension=vectors.shape[1])
+
+    results = {}
+    exact_ids = None
+    with tempfile.TemporaryDirectory() as directory:
+        for dtype in ("float32", "float16", "int8"):
+            store = NumpyVectorStore(embedding_function=embeddings, persist_path=f"{directory}/{dtype}", dtype=dtype)
+            store.add_embeddings(texts, vectors, metadatas, ids)
+            # persist 후 원본 float32 는 디스크 mmap 으로 바뀐다
+            store.persist()
+
+            summary = _benchmark_search(store, query_vectors, k)
+            found = [
+                [doc.id for doc in store.similarity_search_by_vector(query.tolist(), k=k)] for query in query_vectors
+            ]
+            if exact_ids is None:
+                exact_ids = found
+            summary["recall_at_k"] = float(
+                np.mean([len(set(a) & set(b)) / len(a) for a, b in zip(exact_ids, found) if a])
+            )
+            summary["memory_mb"] = store.memory_bytes() / 1024 / 1024
+            results[dtype] = summary
+    return results
+
+
+def benchmark_quantization(
+    sizes=(10000, 100000), dimension: int = 1536, queries: int = 200, k: int = 10
+) -> Dict[str, Dict[str, Any]]:
+    """float32 / float16 / int8 저장 방식별 메모리, QPS, recall@k (float32 결과 기준)
+
+    - sample: 현재 벡터 저장소에 임베딩된 load_sample_data 코퍼스 (embed_content 실행 후)
+    - synthetic/<n>: 무작위 단위 벡터로 만든 확장 코퍼스
+    """
+    from app.chat_bot.rag_service import get_chatbot_service
+
+    results = {}
+
+    stored = get_chatbot_service().vector_store.get(include=["embeddings", "metadatas"])
+    if stored["ids"]:
+        corpus = np.asarray(stored["embeddings"], dtype=np.float32)
+        corpus = corpus / np.linalg.norm(corpus, axis=1, keepdims=True)
+        sample = _benchmark_quantized_corpus(
+            corpus, _perturbed_queries(corpus, queries), min(k, len(corpus)), stored["metadatas"]
+        )
+        results.update({f"sample/{dtype}": summary for dtype, summary in sample.items()})
+    else:
+        print("⚠️ 벡터 저장소가 비어 있어 sample 코퍼스는 건너뜁니다 (load_sample_data, embed_content 먼저 실행)")
+
+    for size in sizes:
+        corpus = _random_unit_vectors(size, dimension, seed=size)
+        synthetic = _benchmark_quantized_corpus(corpus, _perturbed_queries(corpus, queries), k)
+        results.update({f"synthetic_{size}/{dtype}": summary for dtype, summary in synthetic.items()})
+
+    return results
+
+
+def benchmark_ann(
+    sizes=(10000, 100000), dimension: int = 1536, queries: int = 200, k: int = 10, nprobes=(4, 16, 64)
+) -> Dict[str, Dict[str, Any]]:
+    """IVF-flat 근사 검색 vs 전수 검색의 적재/학습 시간, 지연, QPS, recall@k"""
+    from app.chat_bot.vector_stores import IVFVectorStore, NumpyVectorStore
+
+    embeddings = StubEmbeddings(dimension=dimension)
+    results = {}
+
+    for size in sizes:
+        corpus = _random_unit_vectors(size, dimension, seed=size)
+        query_vectors = _perturbed_queries(corpus, queries)
+        ids = [f"doc_{i}" for i in range(size)]
+        texts = ["" for _ in ids]
+        metadatas = [{} for _ in ids]
+
+        stores = {
+            "brute": NumpyVectorStore(embedding_function=embeddings),
+            "ivf": IVFVectorStore(embedding_function=embeddings, min_train_size=0),
+        }
+        exact_ids = None
+        for backend, store in stores.items():
+            started = time.perf_counter()
+            store.add_embeddings(texts, corpus, metadatas, ids)
+            build_seconds = time.perf_counter() - started
+
+            for nprobe in nprobes if backend == "ivf" else (None,):
+                if nprobe:
+                    store.nprobe = nprobe
+                summary = _benchmark_search(store, query_vectors, k)
+                found = [
+                    [doc.id for doc in store.similarity_search_by_vector(query.tolist(), k=k)]
+                    for query in query_vectors
+                ]
+                if exact_ids is None:
+                    exact_ids = found
+                summary["recall_at_k"] = float(
+                    np.mean([len(set(a) & set(b)) / len(a) for a, b in zip(exact_ids, found)])
+                )
+                summary["build_s"] = build_seconds
+                name = f"{backend}/{size}" if nprobe is None else f"{backend}_nprobe{nprobe}/{size}"
+                results[name] = summary
+
+    return results
+
+
+class _CountingEmbeddings(StubEmbeddings):
+    """호출 횟수를 세는 스텁 임베딩"""
+
+    def __init__(self, dimension: int = 1536, latency_seconds: float = 0.0):
+        super().__init__(dimension=dimension, latency_seconds=latency_seconds)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            self.calls += 1
+        return super().embed_documents(texts)
+
+
+def benchmark_embedding_batching(
+    qps: float = 200,
+    duration_seconds: float = 5.0,
+    api_latency_seconds: float = 0.05,
+    window_ms: float = 5,
+    max_batch_size: int = 64,
+    max_latency_ms: float = 20,
+) -> Dict[str, Dict[str, Any]]:
+    """주어진 QPS(포아송 도착)로 질문 하나씩 임베딩할 때 직접 호출 vs 마이크로 배칭의 API 호출 수/지연 비교"""
+    from app.chat_bot.embedding_batcher import MicroBatchedEmbeddings
+
+    rng = np.random.default_rng(0)
+    arrivals = np.cumsum(rng.exponential(1 / qps, int(qps * duration_seconds)))
+    questions = [f"{BENCHMARK_QUESTIONS[i % len(BENCHMARK_QUESTIONS)]} #{i}" for i in range(len(arrivals))]
+
+    def run(embeddings) -> Dict[str, Any]:
+        def one(question, arrival, started):
+            time.sleep(max(0.0, started + arrival - time.perf_counter()))
+            submitted_at = time.perf_counter()
+            embeddings.embed_query(question)
+            return (time.perf_counter() - submitted_at) * 1000
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=256) as executor:
+            futures = [
+                executor.submit(one, question, arrival, started) for question, arrival in zip(questions, arrivals)
+            ]
+            latencies = [future.result() for future in futures]
+        return _latency_summary(latencies, time.perf_counter() - started)
+
+    direct = _CountingEmbeddings(latency_seconds=api_latency_seconds)
+    direct_summary = run(direct)
+    direct_summary["api_calls"] = direct.calls
+
+    counting = _CountingEmbeddings(latency_seconds=api_latency_seconds)
+    batcher = MicroBatchedEmbeddings(
+        counting, window_ms=window_ms, max_batch_size=max_batch_size, max_latency_ms=max_latency_ms
+    )
+    batched_summary = run(batcher)
+    batcher_stats = batcher.stats()
+    batched_summary["api_calls"] = counting.calls
+    batched_summary["avg_batch_size"] = batcher_stats["avg_batch_size"]
+    batched_summary["api_call_reduction"] = batcher_stats["api_call_reduction"]
+    batched_summary["batch_sizes"] = batcher_stats["batch_sizes"]
+
+    return {"direct": direct_summary, "batched": batched_summary}
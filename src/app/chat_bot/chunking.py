@@ -0,0 +1,104 @@
+# 긴 본문 청크 분할 - 문서 하나를 통째로 임베딩하지 않고 문장 단위로 묶은 청크마다 벡터를 만든다
+
+import re
+from typing import Callable, List, Tuple
+
+from langchain.schema import Document
+
+# 문장 끝: 마침표/물음표/느낌표(연속 포함, 닫는 따옴표/괄호 허용) 뒤 공백, 또는 줄바꿈
+# 한국어 본문은 "~다." "~요." 처럼 대부분 마침표로 끝나므로 종결어미를 따로 보지 않아도 된다.
+_SENTENCE_END = re.compile(r"(?<=[.!?。…])[\"'”’)\]]*\s+|\n+")
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in _SENTENCE_END.split(text or "") if sentence and sentence.strip()]
+
+
+def _split_long_sentence(sentence: str, chunk_size: int, chunk_overlap: int) -> List[str]:
+    """청크보다 긴 문장은 글자 수로 자른다 (가능하면 공백에서)"""
+    pieces, start = [], 0
+    while start < len(sentence):
+        end = min(start + chunk_size, len(sentence))
+        if end < len(sentence):
+            space = sentence.rfind(" ", start + chunk_size // 2, end)
+            if space > start:
+                end = space
+        pieces.append(sentence[start:end].strip())
+        if end >= len(sentence):
+            break
+        start = max(end - chunk_overlap, start + 1)
+    return [piece for piece in pieces if piece]
+
+
+def split_into_chunks(text: str, chunk_size: int, chunk_overlap: int) -> List[str]:
+    """문장을 chunk_size 글자까지 묶은 청크 목록
+
+    다음 청크는 이전 청크 끝의 문장들(최대 chunk_overlap 글자)을 다시 포함해 문맥이 끊기지 않게 한다.
+    """
+    sentences = []
+    for sentence in split_sentences(text):
+        if len(sentence) > chunk_size:
+            sentences.extend(_split_long_sentence(sentence, chunk_size, chunk_overlap))
+        else:
+            sentences.append(sentence)
+
+    chunks, current, length = [], [], 0
+    for sentence in sentences:
+        if current and length + 1 + len(sentence) > chunk_size:
+            chunks.append(" ".join(current))
+            overlap, overlap_length = [], 0
+            for previous in reversed(current):
+                if overlap_length + len(previous) > chunk_overlap:
+                    break
+                overlap.insert(0, previous)
+                overlap_length += len(previous) + 1
+            if overlap_length + len(sentence) > chunk_size:
+                overlap, overlap_length = [], 0
+            current, length = overlap, max(overlap_length - 1, 0)
+
+        current.append(sentence)
+        length += len(sentence) + (1 if len(current) > 1 else 0)
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def chunk_vector_id(vector_id: str, index: int) -> str:
+    """첫 청크는 원본 벡터 id 를 그대로 써서 id 로 문서를 찾는 곳(키워드 검색 등)이 그대로 동작한다"""
+    return vector_id if index == 0 else f"{vector_id}#{index}"
+
+
+def chunk_vector_ids(vector_id: str, chunk_count: int) -> List[str]:
+    return [chunk_vector_id(vector_id, index) for index in range(max(chunk_count, 1))]
+
+
+def chunk_document(
+    vector_id: str,
+    document: Document,
+    body: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    render: Callable[[str], str],
+) -> List[Tuple[str, Document]]:
+    """본문(body)이 chunk_size 보다 긴 문서를 청크별 문서로 나눈다
+
+    각 청크 문서의 임베딩 텍스트는 render(청크) 로 만든다 (원본과 같은 템플릿에 본문 대신 청크를 넣는 함수).
+    제목/태그 등 다른 필드에 본문과 같은 문자열이 있어도 엉뚱한 자리가 바뀌지 않도록 문자열 치환은 쓰지 않는다.
+    원본 메타데이터에는 parent_id(원본 벡터 id) / chunk_index / chunk_count / chunk_text 를 더한다.
+    """
+    chunks = split_into_chunks(body, chunk_size, chunk_overlap) if body and len(body) > chunk_size else []
+    if len(chunks) <= 1:
+        return [(vector_id, document)]
+
+    documents = []
+    for index, chunk in enumerate(chunks):
+        metadata = {
+            **document.metadata,
+            "parent_id": vector_id,
+            "chunk_index": index,
+            "chunk_count": len(chunks),
+            "chunk_text": chunk,
+        }
+        documents.append((chunk_vector_id(vector_id, index), Document(page_content=render(chunk), metadata=metadata)))
+    return documents
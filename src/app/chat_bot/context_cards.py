@@ -0,0 +1,125 @@
+# 컨텍스트 카드 - 문서별로 프롬프트에 들어갈 텍스트를 미리 렌더링해 벡터 메타데이터에 저장
+# 답변 시에는 검색 결과의 메타데이터만으로 컨텍스트를 구성하므로 컨텐츠 테이블을 조회하지 않는다.
+
+import json
+from typing import Any, Dict, List
+
+from django.db.models import Prefetch
+
+from app.knowledge_document.models import BlogPost, CompanyContent, Project
+
+RELATED_BLOGS_PER_PROJECT = 2
+
+# 카드를 만드는 데만 쓰고 API 응답의 sources 에는 내보내지 않는 메타데이터
+CARD_ONLY_METADATA = {"context_card", "chunk_text", "matched_chunks"}
+
+# 프로젝트 여러 개의 카드를 만들 때 관련 블로그를 한 번에 조회
+ACTIVE_BLOG_POSTS_PREFETCH = Prefetch(
+    "blogpost_set",
+    queryset=BlogPost.objects.filter(is_active=True).order_by("-is_featured", "-published_date"),
+    to_attr="active_blog_posts",
+)
+
+
+def render_company_content_card(content: CompanyContent) -> str:
+    return "\n".join([f"**{content.title}**", content.content[:500] + "..."])
+
+
+def render_project_card(project: Project) -> str:
+    lines = [
+        f"**{project.name}** ({project.get_project_type_display()})",
+        f"클라이언트: {project.client_name}",
+        f"설명: {project.description[:300]}...",
+        f"기술스택: {', '.join(project.technologies_used)}",
+        f"기간: {project.duration_months}개월, 팀: {project.team_size}명",
+    ]
+    if project.is_portfolio_highlight:
+        lines.append("🌟 포트폴리오 대표 프로젝트")
+    return "\n".join(lines)
+
+
+def render_blog_post_card(blog_post: BlogPost) -> str:
+    return "\n".join(
+        [f"**{blog_post.title}**", f"요약: {blog_post.content_summary[:200]}...", f"URL: {blog_post.url}"]
+    )
+
+
+def render_passages_card(metadata: Dict[str, Any], passages: List[str]) -> str:
+    """청크로 색인된 문서 - 앞부분 대신 검색된 본문 구절들로 카드 구성"""
+    lines = [f"**{metadata.get('title', '')}**", "\n...\n".join(passages)]
+    if metadata.get("source_type") == "blog_post":
+        lines.append(f"URL: {metadata.get('url', '')}")
+    return "\n".join(lines)
+
+
+def blog_link(blog_post: BlogPost) -> Dict[str, str]:
+    return {
+        "id": str(blog_post.id),
+        "title": blog_post.title,
+        "url": blog_post.url,
+        "excerpt": blog_post.excerpt[:100] + "..." if blog_post.excerpt else "",
+    }
+
+
+def project_related_blog_links(project: Project) -> List[Dict[str, str]]:
+    """프로젝트 카드에 함께 저장할 관련 블로그 링크 (활성 블로그만, 추천/최신순)"""
+    # 중복 제외 후에도 프로젝트당 2개를 채울 수 있도록 여유 있게 저장
+    # 색인 파이프라인은 active_blog_posts 로 미리 prefetch 해 둔다 (ACTIVE_BLOG_POSTS_PREFETCH)
+    blog_posts = getattr(project, "active_blog_posts", None)
+    if blog_posts is None:
+        blog_posts = project.blogpost_set.filter(is_active=True).order_by("-is_featured", "-published_date")
+    return [blog_link(blog_post) for blog_post in blog_posts[: RELATED_BLOGS_PER_PROJECT * 3]]
+
+
+def company_content_card_metadata(content: CompanyContent) -> Dict[str, Any]:
+    return {"context_card": render_company_content_card(content)}
+
+
+def project_card_metadata(project: Project) -> Dict[str, Any]:
+    return {
+        "context_card": render_project_card(project),
+        "related_blogs": json.dumps(project_related_blog_links(project), ensure_ascii=False),
+    }
+
+
+def blog_post_card_metadata(blog_post: BlogPost) -> Dict[str, Any]:
+    return {
+        "context_card": render_blog_post_card(blog_post),
+        "excerpt": blog_link(blog_post)["excerpt"],
+    }
+
+
+def card_from_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """벡터 메타데이터 → 답변 생성에 쓰는 카드"""
+    source_type = metadata.get("source_type")
+    card = {
+        "source_type": source_type,
+        "id": metadata.get("content_id"),
+        "title": metadata.get("project_name") if source_type == "project" else metadata.get("title"),
+        "card": metadata.get("context_card", ""),
+    }
+    passages = json.loads(metadata.get("matched_chunks") or "[]")
+    if not passages and metadata.get("chunk_text"):
+        passages = [metadata["chunk_text"]]
+    if passages:
+        card["card"] = render_passages_card(metadata, passages)
+    if source_type == "project":
+        card["related_blogs"] = json.loads(metadata.get("related_blogs") or "[]")
+    elif source_type == "blog_post":
+        card["url"] = metadata.get("url", "")
+        card["excerpt"] = metadata.get("excerpt", "")
+    return card
+
+
+def card_from_object(source_type: str, obj) -> Dict[str, Any]:
+    """카드가 없는(이전에 인덱싱된) 문서를 DB 객체로 카드 생성"""
+    if source_type == "company_content":
+        metadata = {"source_type": source_type, "content_id": str(obj.id), "title": obj.title}
+        metadata.update(company_content_card_metadata(obj))
+    elif source_type == "project":
+        metadata = {"source_type": source_type, "content_id": str(obj.id), "project_name": obj.name}
+        metadata.update(project_card_metadata(obj))
+    else:
+        metadata = {"source_type": source_type, "content_id": str(obj.id), "title": obj.title, "url": obj.url}
+        metadata.update(blog_post_card_metadata(obj))
+    return card_from_metadata(metadata)
@@ -1,6 +1,13 @@
+from app.chat_bot.tasks import drain_content_outbox, reconcile_vector_store
 from app.common.views import CronView
 
 
 class ChatBotCron(CronView):
     def cron(self):
-        pass
+        # 시그널의 예약이 유실돼도 아웃박스에 남은 변경을 주기적으로 처리
+        drain_content_outbox.delay()
+
+
+class ChatBotReconcileCron(CronView):
+    def cron(self):
+        reconcile_vector_store.delay()
@@ -0,0 +1,138 @@
+# 질문 임베딩 마이크로 배칭 - 동시에 들어온 요청들의 임베딩을 한 번의 API 호출로 묶는다
+
+import asyncio
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from langchain_core.embeddings import Embeddings
+
+
+class MicroBatchedEmbeddings(Embeddings):
+    """여러 스레드/요청의 embed_documents 호출을 모아 한 번에 보내는 임베딩 래퍼
+
+    백그라운드 스레드가 첫 요청을 받은 뒤
+    - window_ms 동안 새 요청이 없거나
+    - 모은 텍스트가 max_batch_size 개가 되거나
+    - 첫 요청이 max_latency_ms 만큼 기다렸으면
+    모아 둔 텍스트를 한 번의 embed_documents 로 보내고 결과를 요청별로 나눠 돌려준다.
+    API 호출은 별도 스레드 풀(max_concurrent_calls)에서 실행되어 호출 중에도 다음 배치를 모은다.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        window_ms: float,
+        max_batch_size: int,
+        max_latency_ms: float,
+        max_concurrent_calls: int = 4,
+    ):
+        self.embeddings = embeddings
+        self.max_concurrent_calls = max_concurrent_calls
+        self.model = getattr(embeddings, "model", None) or type(embeddings).__name__
+        self.window_seconds = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.max_latency_seconds = max_latency_ms / 1000
+
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._worker_pid = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.texts = 0
+        self.api_calls = 0
+        self.batch_sizes: Counter = Counter()
+
+    def _ensure_worker(self):
+        # fork 된 워커에는 스레드가 복사되지 않으므로 프로세스별로 시작
+        if self._worker_pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._worker_pid != os.getpid():
+                self._queue = queue.Queue()
+                self._call_executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrent_calls, thread_name_prefix="embedding-batch-call"
+                )
+                threading.Thread(target=self._run, name="embedding-batcher", daemon=True).start()
+                self._worker_pid = os.getpid()
+
+    def submit(self, texts: List[str]) -> Future:
+        future = Future()
+        if not texts:
+            future.set_result([])
+            return future
+        self._ensure_worker()
+        self._queue.put((list(texts), future))
+        return future
+
+    def _run(self):
+        pending_queue = self._queue
+        while True:
+            batch = [pending_queue.get()]
+            text_count = len(batch[0][0])
+            deadline = time.monotonic() + self.max_latency_seconds
+
+            while text_count < self.max_batch_size:
+                timeout = min(self.window_seconds, deadline - time.monotonic())
+                if timeout <= 0:
+                    break
+                try:
+                    request = pending_queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                text_count += len(request[0])
+
+            self._call_executor.submit(self._flush, batch)
+
+    def _flush(self, batch: List[tuple]):
+        texts = [text for request_texts, _ in batch for text in request_texts]
+        with self._stats_lock:
+            self.requests += len(batch)
+            self.texts += len(texts)
+            self.api_calls += 1
+            self.batch_sizes[len(texts)] += 1
+
+        try:
+            vectors = self.embeddings.embed_documents(texts)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        offset = 0
+        for request_texts, future in batch:
+            future.set_result(vectors[offset : offset + len(request_texts)])
+            offset += len(request_texts)
+
+    # =================== Embeddings 인터페이스 ===================
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.submit(texts).result()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.wrap_future(self.submit(texts))
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+    # =================== 통계 ===================
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "requests": self.requests,
+                "texts": self.texts,
+                "api_calls": self.api_calls,
+                "avg_batch_size": self.texts / self.api_calls if self.api_calls else 0.0,
+                "api_call_reduction": 1 - self.api_calls / self.requests if self.requests else 0.0,
+                "batch_sizes": dict(sorted(self.batch_sizes.items())),
+            }
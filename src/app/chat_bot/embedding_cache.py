@@ -0,0 +1,222 @@
+# 질문 임베딩 캐시 - 같은 텍스트를 다시 임베딩하지 않도록 (모델명, 정규화된 텍스트 해시) 기준으로 저장
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from asgiref.sync import sync_to_async
+from langchain_core.embeddings import Embeddings
+
+# 항목당 키/OrderedDict 노드 등 벡터 외 메모리 사용량 추정치
+_ENTRY_OVERHEAD_BYTES = 200
+
+
+def normalize_text(text: str) -> str:
+    """임베딩 결과가 달라지지 않는 차이(전각/반각, 공백)만 제거"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+
+class _EmbeddingStore:
+    """여러 워커가 공유하는 SQLite 임베딩 저장소 (WAL 모드)
+
+    SQLite 연결은 스레드/프로세스 간 공유할 수 없으므로 (pid, 스레드)별로 연결을 연다.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, created_at REAL NOT NULL, "
+            "PRIMARY KEY (model, text_hash))"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        if getattr(self._local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    def _execute(self, sql: str, parameters=()):
+        return self._connection().execute(sql, parameters)
+
+    def get_many(self, model: str, text_hashes: List[str]) -> Dict[str, np.ndarray]:
+        if not text_hashes:
+            return {}
+        placeholders = ", ".join("?" for _ in text_hashes)
+        rows = self._execute(
+            f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+            [model, *text_hashes],
+        ).fetchall()
+        return {text_hash: np.frombuffer(vector, dtype=np.float32) for text_hash, vector in rows}
+
+    def set_many(self, model: str, vectors: Dict[str, np.ndarray]):
+        now = time.time()
+        self._connection().executemany(
+            "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, created_at) VALUES (?, ?, ?, ?)",
+            [(model, text_hash, vector.tobytes(), now) for text_hash, vector in vectors.items()],
+        )
+
+    def count(self) -> int:
+        return self._execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+class CachedEmbeddings(Embeddings):
+    """임베딩 모델을 감싸는 2단 캐시
+
+    1단: 프로세스 내 LRU (벡터 바이트 합계 기준 예산)
+    2단: 워커들이 공유하는 로컬 SQLite (재시작해도 유지)
+    둘 다 없는 텍스트만 모아 한 번의 배치 호출로 임베딩한다.
+    """
+
+    def __init__(
+        self, embeddings: Embeddings, store_path: Optional[Path], max_memory_bytes: int, model_name: str = None
+    ):
+        self.embeddings = embeddings
+        self.model_name = model_name or getattr(embeddings, "model", None) or type(embeddings).__name__
+        self.max_memory_bytes = max_memory_bytes
+        self.store = _EmbeddingStore(store_path) if store_path else None
+
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.api_calls = 0
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(normalize_text(text).encode()).hexdigest()
+
+    # =================== 1단 (메모리) ===================
+
+    def _get_from_memory(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = vector
+        return found
+
+    def _put_in_memory(self, vectors: Dict[str, np.ndarray]):
+        with self._lock:
+            for key, vector in vectors.items():
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    continue
+                self._entries[key] = vector
+                self._memory_bytes += vector.nbytes + _ENTRY_OVERHEAD_BYTES
+            while self._entries and self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._memory_bytes -= evicted.nbytes + _ENTRY_OVERHEAD_BYTES
+
+    # =================== 조회 ===================
+
+    def _lookup(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """메모리 → SQLite 순서로 조회하고 SQLite 에서 찾은 것은 메모리에 올린다"""
+        found = self._get_from_memory(keys)
+        memory_hits = len(found)
+
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        from_store = {}
+        if missing and self.store is not None:
+            try:
+                from_store = self.store.get_many(self.model_name, missing)
+            except sqlite3.Error as e:
+                print(f"⚠️ 임베딩 캐시 저장소 조회 실패: {e}")
+            self._put_in_memory(from_store)
+            found.update(from_store)
+
+        with self._lock:
+            self.memory_hits += memory_hits
+            self.store_hits += len(from_store)
+        return found
+
+    def _remember(self, vectors: Dict[str, np.ndarray]):
+        self._put_in_memory(vectors)
+        if self.store is not None:
+            try:
+                self.store.set_many(self.model_name, vectors)
+            except sqlite3.Error as e:
+                print(f"⚠️ 임베딩 캐시 저장 실패: {e}")
+
+    def _missing_texts(self, texts: List[str], keys: List[str], found: Dict[str, np.ndarray]) -> Dict[str, str]:
+        """캐시에 없는 텍스트 (키 기준 중복 제거)"""
+        missing = {}
+        for text, key in zip(texts, keys):
+            if key not in found and key not in missing:
+                missing[key] = text
+        with self._lock:
+            self.misses += len(missing)
+            if missing:
+                self.api_calls += 1
+        return missing
+
+    # =================== Embeddings 인터페이스 ===================
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        found = self._lookup(keys)
+
+        missing = self._missing_texts(texts, keys, found)
+        if missing:
+            embedded = self.embeddings.embed_documents(list(missing.values()))
+            vectors = {key: np.asarray(vector, dtype=np.float32) for key, vector in zip(missing, embedded)}
+            self._remember(vectors)
+            found.update(vectors)
+
+        return [found[key].tolist() for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        found = await sync_to_async(self._lookup, thread_sensitive=False)(keys)
+
+        missing = self._missing_texts(texts, keys, found)
+        if missing:
+            embedded = await self.embeddings.aembed_documents(list(missing.values()))
+            vectors = {key: np.asarray(vector, dtype=np.float32) for key, vector in zip(missing, embedded)}
+            await sync_to_async(self._remember, thread_sensitive=False)(vectors)
+            found.update(vectors)
+
+        return [found[key].tolist() for key in keys]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+    # =================== 통계 ===================
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.store_hits + self.misses
+        return {
+            "model": self.model_name,
+            "size": len(self._entries),
+            "memory_bytes": self._memory_bytes,
+            "memory_hits": self.memory_hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+            "api_calls": self.api_calls,
+            "hit_ratio": (self.memory_hits + self.store_hits) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,160 @@
+# 문서 임베딩 저장소 - (임베딩 모델, 임베딩 텍스트 sha256) → 벡터
+# 컬렉션을 새로 빌드하거나 크로마 저장소(CHATBOT_CHROMA_PERSIST_DIRECTORY)를 지운 뒤 다시 색인해도 같은 텍스트는 API 로 다시 보내지 않는다.
+
+import fcntl
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+_KEY_BYTES = 64  # sha256 hex
+
+
+class _ModelStore:
+    """모델 하나의 저장소 - 이어 붙이기만 하는 float32 행렬(vectors.f32) + 같은 순서의 키 목록(keys.txt)
+
+    키의 줄 번호가 행렬의 행 번호(오프셋)다. 벡터를 먼저 쓰고 키를 나중에 쓰므로
+    쓰는 도중 중단되어도 키가 없는 벡터만 남고 (다음 쓰기에서 잘라냄) 잘못된 벡터를 돌려주지는 않는다.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = path / "vectors.f32"
+        self.keys_path = path / "keys.txt"
+        self.dimension_path = path / "dimension"
+        self.dimension: Optional[int] = None
+        self.rows: Dict[str, int] = {}
+        self._keys_offset = 0
+        self._matrix = None
+
+    @contextmanager
+    def _file_lock(self):
+        # 여러 워커 프로세스가 같은 파일에 이어 쓰므로 쓰기는 파일 락으로 직렬화
+        with open(self.path / ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def refresh(self):
+        """다른 프로세스가 추가한 키만 이어서 읽는다"""
+        if self.dimension is None and self.dimension_path.exists():
+            self.dimension = int(self.dimension_path.read_text())
+        if not self.keys_path.exists() or os.path.getsize(self.keys_path) == self._keys_offset:
+            return
+
+        with open(self.keys_path, "rb") as keys_file:
+            keys_file.seek(self._keys_offset)
+            data = keys_file.read()
+        complete = data[: data.rfind(b"\n") + 1]
+        for key in complete.split():
+            self.rows[key.decode()] = len(self.rows)
+        self._keys_offset += len(complete)
+        self._matrix = None
+
+    def matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            if not self.rows:
+                return np.zeros((0, self.dimension or 0), dtype=np.float32)
+            self._matrix = np.memmap(
+                self.vectors_path, dtype=np.float32, mode="r", shape=(len(self.rows), self.dimension)
+            )
+        return self._matrix
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        self.refresh()
+        found = [(key, self.rows[key]) for key in keys if key in self.rows]
+        if not found:
+            return {}
+        vectors = np.asarray(self.matrix()[[row for _, row in found]])
+        return {key: vector for (key, _), vector in zip(found, vectors)}
+
+    def put_many(self, vectors: Dict[str, np.ndarray]):
+        with self._file_lock():
+            self.refresh()
+            new = {key: vector for key, vector in vectors.items() if key not in self.rows}
+            if not new:
+                return
+            matrix = np.asarray(list(new.values()), dtype=np.float32)
+            if self.dimension is None:
+                self.dimension = matrix.shape[1]
+                self.dimension_path.write_text(str(self.dimension))
+            if matrix.shape[1] != self.dimension:
+                raise ValueError(f"임베딩 차원이 다릅니다: {matrix.shape[1]} != {self.dimension}")
+
+            # 이전 쓰기가 중단되어 남은 (키 없는) 벡터는 잘라낸다
+            with open(self.vectors_path, "ab") as vectors_file:
+                vectors_file.truncate(len(self.rows) * self.dimension * 4)
+                vectors_file.write(matrix.tobytes())
+            with open(self.keys_path, "ab") as keys_file:
+                keys_file.write("".join(f"{key}\n" for key in new).encode())
+            self.refresh()
+
+
+class ContentEmbeddingStore:
+    """임베딩 모델별 _ModelStore 묶음 (파일 하나에 모델 하나)"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._stores: Dict[str, _ModelStore] = {}
+        self._lock = threading.Lock()
+
+    def _store(self, model: str) -> _ModelStore:
+        store = self._stores.get(model)
+        if store is None:
+            store = self._stores[model] = _ModelStore(self.root / re.sub(r"[^0-9A-Za-z._-]", "_", model))
+        return store
+
+    def get_many(self, model: str, content_hashes: List[str]) -> Dict[str, np.ndarray]:
+        with self._lock:
+            return self._store(model).get_many(content_hashes)
+
+    def put_many(self, model: str, vectors: Dict[str, np.ndarray]):
+        with self._lock:
+            self._store(model).put_many(vectors)
+
+    def models(self) -> List[str]:
+        return sorted(path.name for path in self.root.iterdir() if path.is_dir()) if self.root.exists() else []
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        stats = {}
+        with self._lock:
+            for model in self.models():
+                store = self._store(model)
+                store.refresh()
+                stats[model] = {
+                    "vectors": len(store.rows),
+                    "dimension": store.dimension or 0,
+                    "bytes": len(store.rows) * (store.dimension or 0) * 4,
+                }
+        return stats
+
+    # =================== 환경 간 이동 ===================
+
+    def export(self, model: str, path: Path) -> int:
+        """모델 하나의 임베딩을 npz 파일 하나로 내보내기"""
+        with self._lock:
+            store = self._store(model)
+            store.refresh()
+            keys = np.array(list(store.rows), dtype=f"S{_KEY_BYTES}")
+            np.savez(path, model=np.array(model), keys=keys, vectors=np.asarray(store.matrix()))
+            return len(keys)
+
+    def import_(self, path: Path) -> int:
+        """export 한 파일을 가져오기 (이미 있는 키는 건너뜀) - 가져온 개수 반환"""
+        with np.load(path) as data:
+            model = str(data["model"])
+            keys = [key.decode() for key in data["keys"]]
+            vectors = data["vectors"]
+        with self._lock:
+            store = self._store(model)
+            store.refresh()
+            before = len(store.rows)
+            store.put_many({key: vector for key, vector in zip(keys, vectors)})
+            return len(store.rows) - before
@@ -0,0 +1,291 @@
+# 컨텐츠 색인 파이프라인 - 변경된 문서만 골라 배치 임베딩 → 벡터 일괄 upsert → ChromaVector 일괄 upsert
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+from langchain.schema import Document
+
+from app.chat_bot.chunking import chunk_vector_ids
+from app.chat_bot.context_cards import ACTIVE_BLOG_POSTS_PREFETCH
+from app.knowledge_document.models import BlogPost, ChromaVector, CompanyContent, Project
+
+
+class IndexItem:
+    """색인 대상 원본 하나 - documents 는 (벡터 id, 문서) 목록 (긴 본문은 청크별로 여러 개)"""
+
+    __slots__ = ("content_type", "content_id", "vector_id", "documents", "content_hash", "previous_chunk_count")
+
+    def __init__(
+        self,
+        content_type: str,
+        content_id,
+        vector_id: str,
+        documents: List[Tuple[str, Document]],
+        content_hash: str,
+        previous_chunk_count: int = 0,
+    ):
+        self.content_type = content_type
+        self.content_id = content_id
+        self.vector_id = vector_id
+        self.documents = documents
+        self.content_hash = content_hash
+        self.previous_chunk_count = previous_chunk_count
+
+
+class ContentIndexer:
+    """embed_all_content 를 대체하는 색인 파이프라인
+
+    1. 컨텐츠 유형별로 문서(긴 본문은 청크별 문서)를 만들고 ChromaVector 의 source_content_hash 와 비교해
+       바뀐 문서만 고른다.
+    2. batch_size 개씩 묶어 embed_documents 를 호출한다 (동시에 concurrency 개까지).
+    3. 임베딩이 끝난 배치마다 벡터 저장소에 add_embeddings 로 한 번에 upsert 하고,
+       ChromaVector 는 bulk_create(update_conflicts=True) 한 번으로 upsert 한다.
+    4. 해시가 같아 임베딩하지 않은 문서도 컨텍스트 카드(메타데이터)가 바뀌었으면 메타데이터만 갱신한다.
+    """
+
+    def __init__(
+        self,
+        service,
+        batch_size: int = None,
+        concurrency: int = None,
+        force: bool = False,
+        stale_only: bool = False,
+        vector_store=None,
+        collection_name: str = None,
+    ):
+        self.service = service
+        self.batch_size = batch_size or settings.CHATBOT_INDEX_BATCH_SIZE
+        self.concurrency = concurrency or settings.CHATBOT_INDEX_CONCURRENCY
+        self.force = force
+        # 시그널로 needs_update 가 표시됐거나 아직 색인되지 않은 문서만 대상으로 (전체 문서를 만들지 않음)
+        self.stale_only = stale_only
+        # 새 컬렉션 빌드 시에는 사용 중인 컬렉션 대신 빌드 대상 저장소/컬렉션에 쓴다
+        self.vector_store = vector_store or service.vector_store
+        self.collection_name = collection_name or service.collection_name
+
+        self._stats_lock = threading.Lock()
+        self.reused = 0
+        self.api_texts = 0
+
+    @staticmethod
+    def sources() -> Dict[str, Any]:
+        """컨텐츠 유형별 색인 대상 queryset"""
+        return {
+            "company_content": CompanyContent.objects.filter(is_active=True).select_related("category"),
+            "project": Project.objects.prefetch_related(ACTIVE_BLOG_POSTS_PREFETCH),
+            "blog_post": BlogPost.objects.filter(is_active=True),
+        }
+
+    # =================== 1. 대상 선정 ===================
+
+    def collect(
+        self, content_types: Optional[Iterable[str]] = None, content_ids: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, List[IndexItem]]:
+        """{"items": 전체 문서, "pending": 새로 임베딩할 문서 (해시가 바뀌었거나 needs_update)}
+
+        content_ids({컨텐츠 유형: id 목록})가 주어지면 해당 문서만 대상으로 한다.
+        """
+        items, pending = [], []
+        self.collected_at = timezone.now()
+        for content_type, queryset in self.sources().items():
+            if content_types and content_type not in content_types:
+                continue
+
+            vectors = ChromaVector.objects.filter(collection_name=self.collection_name, content_type=content_type)
+            if content_ids is not None:
+                if not content_ids.get(content_type):
+                    continue
+                queryset = queryset.filter(id__in=content_ids[content_type])
+                vectors = vectors.filter(content_id__in=content_ids[content_type])
+
+            indexed = {
+                str(content_id): (content_hash, needs_update, chunk_count)
+                for content_id, content_hash, needs_update, chunk_count in vectors.values_list(
+                    "content_id", "source_content_hash", "needs_update", "chunk_count"
+                )
+            }
+            if self.stale_only:
+                up_to_date = vectors.filter(needs_update=False)
+                queryset = queryset.exclude(id__in=up_to_date.values("content_id"))
+
+            for obj in queryset:
+                documents = self.service._build_documents(content_type, obj)
+                content_hash = self.service._get_content_hash("\n".join(doc.page_content for _, doc in documents))
+                previous = indexed.get(str(obj.id))
+                item = IndexItem(
+                    content_type,
+                    obj.id,
+                    documents[0][0],
+                    documents,
+                    content_hash,
+                    previous_chunk_count=previous[2] if previous else 0,
+                )
+                items.append(item)
+                if self.force or previous is None or previous[:2] != (content_hash, False):
+                    pending.append(item)
+        return {"items": items, "pending": pending}
+
+    # =================== 2~3. 임베딩 / 저장 ===================
+
+    def _embed(self, batch: List[IndexItem]) -> List[List[float]]:
+        """배치의 모든 (청크) 문서 임베딩 - 같은 모델로 같은 텍스트를 임베딩한 적이 있으면 저장소의 벡터를 재사용"""
+        texts = [doc.page_content for item in batch for _, doc in item.documents]
+        store = self.service.content_embedding_store
+        if store is None:
+            return self.vector_store.embeddings.embed_documents(texts)
+
+        embeddings = self.vector_store.embeddings
+        model = getattr(embeddings, "model", None) or type(embeddings).__name__
+        hashes = [self.service._get_content_hash(text) for text in texts]
+        found = store.get_many(model, hashes)
+
+        missing = {content_hash: text for content_hash, text in zip(hashes, texts) if content_hash not in found}
+        if missing:
+            embedded = embeddings.embed_documents(list(missing.values()))
+            vectors = {
+                content_hash: np.asarray(vector, dtype=np.float32) for content_hash, vector in zip(missing, embedded)
+            }
+            store.put_many(model, vectors)
+            found.update(vectors)
+
+        with self._stats_lock:
+            self.reused += len(texts) - len(missing)
+            self.api_texts += len(missing)
+        return [found[content_hash].tolist() for content_hash in hashes]
+
+    def _store(self, batch: List[IndexItem], vectors: List[List[float]]):
+        documents = [(vector_id, doc) for item in batch for vector_id, doc in item.documents]
+        self.vector_store.add_embeddings(
+            texts=[doc.page_content for _, doc in documents],
+            embeddings=vectors,
+            metadatas=[doc.metadata for _, doc in documents],
+            ids=[vector_id for vector_id, _ in documents],
+        )
+
+        # 청크 수가 줄었으면 남은 이전 청크 벡터 삭제
+        leftover_ids = [
+            vector_id
+            for item in batch
+            for vector_id in chunk_vector_ids(item.vector_id, item.previous_chunk_count)[len(item.documents) :]
+        ]
+        if leftover_ids:
+            self.vector_store.delete(ids=leftover_ids)
+
+        embedding_model = getattr(self.vector_store.embeddings, "model", "") or ""
+        ChromaVector.objects.bulk_create(
+            [
+                ChromaVector(
+                    content_type=item.content_type,
+                    content_id=item.content_id,
+                    vector_id=item.vector_id,
+                    collection_name=self.collection_name,
+                    embedding_model=embedding_model or settings.CHATBOT_EMBEDDING_MODEL,
+                    source_content_hash=item.content_hash,
+                    needs_update=False,
+                    chunk_count=len(item.documents),
+                )
+                for item in batch
+            ],
+            update_conflicts=True,
+            unique_fields=["content_type", "content_id", "collection_name"],
+            update_fields=[
+                "vector_id",
+                "collection_name",
+                "embedding_model",
+                "source_content_hash",
+                "needs_update",
+                "chunk_count",
+                "last_embedded_at",
+            ],
+        )
+
+    def _refresh_cards(self, items: List[IndexItem]) -> int:
+        """임베딩 텍스트는 그대로인데 메타데이터(컨텍스트 카드)가 바뀐 벡터만 재임베딩 없이 갱신
+
+        프로젝트 카드의 관련 블로그 링크처럼 다른 원본에서 오는 내용은 해시에 포함되지 않으므로
+        아웃박스에 기록된 관련 프로젝트도 여기서 카드가 다시 만들어진다.
+        """
+        documents = {vector_id: doc for item in items for vector_id, doc in item.documents}
+        if not documents:
+            return 0
+
+        stored = self.vector_store.get(ids=list(documents), include=["metadatas"])
+        changed = [
+            vector_id
+            for vector_id, metadata in zip(stored["ids"], stored["metadatas"])
+            if metadata != documents[vector_id].metadata
+        ]
+        if changed:
+            self.vector_store.update_metadatas(
+                ids=changed, metadatas=[documents[vector_id].metadata for vector_id in changed]
+            )
+        return len(changed)
+
+    def _mark_changed_since_collect(self, pending: List[IndexItem]):
+        """임베딩하는 동안 수정된 문서는 _store 가 needs_update=False 로 덮어썼으므로 다시 표시"""
+        sources = self.sources()
+        for content_type in {item.content_type for item in pending}:
+            queryset = sources[content_type]
+            ChromaVector.objects.filter(
+                collection_name=self.collection_name,
+                content_type=content_type,
+                content_id__in=queryset.filter(updated_at__gt=self.collected_at).values("id"),
+            ).update(needs_update=True)
+
+    def run(
+        self, content_types: Optional[Iterable[str]] = None, content_ids: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        collected = self.collect(content_types, content_ids)
+        pending = collected["pending"]
+        total = len(collected["items"])
+        print(f"🔄 색인 시작: 전체 {total}개 중 변경 {len(pending)}개 (배치 {self.batch_size}, 동시 {self.concurrency})")
+
+        embedded, chunks, failed = 0, 0, 0
+        batches = [pending[start : start + self.batch_size] for start in range(0, len(pending), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="content-indexer") as executor:
+            futures = {executor.submit(self._embed, batch): batch for batch in batches}
+            # 저장은 메인 스레드에서 순서대로 (DB 연결/벡터 저장소 쓰기를 한 스레드로 유지)
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    self._store(batch, future.result())
+                    embedded += len(batch)
+                    chunks += sum(len(item.documents) for item in batch)
+                except Exception as e:
+                    failed += len(batch)
+                    print(f"⚠️ 배치 색인 실패 ({len(batch)}개, 첫 문서 {batch[0].vector_id}): {e}")
+
+        cards = self._refresh_cards([item for item in collected["items"] if item not in pending])
+        if embedded or cards:
+            self.vector_store.persist()
+            if self.vector_store is self.service.vector_store:
+                self.service.publish_vector_snapshot()
+        if embedded:
+            self._mark_changed_since_collect(pending)
+
+        elapsed = time.perf_counter() - started
+        summary = {
+            "total": total,
+            "skipped": total - len(pending),
+            "embedded": embedded,
+            "chunks": chunks,
+            "refreshed_cards": cards,
+            "reused_embeddings": self.reused,
+            "api_embeddings": self.api_texts,
+            "failed": failed,
+            "elapsed_seconds": elapsed,
+            "documents_per_second": embedded / elapsed if elapsed else 0.0,
+        }
+        print(
+            f"✅ 색인 완료: 건너뜀 {summary['skipped']}개, 임베딩 {embedded}개 (청크 {chunks}개), 카드 갱신 {cards}개, "
+            f"실패 {failed}개 "
+            f"- 저장된 임베딩 재사용 {self.reused}개, API {self.api_texts}개 "
+            f"({elapsed:.1f}s, {summary['documents_per_second']:.1f} docs/s)"
+        )
+        return summary
@@ -0,0 +1,326 @@
+# 키워드 검색용 BM25 역색인 - 기술명/프로젝트명처럼 정확한 단어가 중요한 질문을 벡터 검색과 함께 찾는다
+
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from django.db.models import Max
+
+from app.chat_bot.answer_cache import get_kb_version
+from app.knowledge_document.models import BlogPost, CompanyContent, Project
+
+# 영문/숫자 단어는 통째로 (c++, c# 포함), 한글은 띄어쓰기와 조사에 덜 민감하도록 문자 바이그램으로 나눈다
+_TOKEN_PATTERN = re.compile(r"[0-9a-z]+[+#]*|[가-힣]+")
+
+# 벡터 저장소와 같은 문서 id 를 쓴다 (rag_service 의 _build_*_document 참고)
+VECTOR_ID_PREFIXES = {"company_content": "company", "project": "project", "blog_post": "blog"}
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for word in _TOKEN_PATTERN.findall(unicodedata.normalize("NFKC", text or "").lower()):
+        if "가" <= word[0] <= "힣" and len(word) > 1:
+            tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def keyword_tokens(text: str) -> List[str]:
+    """질문에서 영문/숫자 단어(기술명, 프로젝트명 등)만 추출"""
+    return [token for token in tokenize(text) if not "가" <= token[0] <= "힣"]
+
+
+def _join(values) -> str:
+    return " ".join(values or [])
+
+
+def company_content_fields(content: CompanyContent) -> List[Tuple[str, float]]:
+    return [(content.title, 2.0), (content.content, 1.0), (_join(content.tags), 2.0), (content.search_keywords, 1.0)]
+
+
+def project_fields(project: Project) -> List[Tuple[str, float]]:
+    return [
+        (project.name, 2.0),
+        (project.client_name, 1.0),
+        (project.description, 1.0),
+        (_join(project.key_features), 1.0),
+        (_join(project.technologies_used), 2.0),
+        (_join(project.search_tags), 2.0),
+    ]
+
+
+def blog_post_fields(blog_post: BlogPost) -> List[Tuple[str, float]]:
+    return [
+        (blog_post.title, 2.0),
+        (blog_post.excerpt, 1.0),
+        (blog_post.content_summary, 1.0),
+        (_join(blog_post.related_topics), 2.0),
+    ]
+
+
+class BM25Index:
+    """문자 바이그램 BM25 역색인 (프로세스 내)
+
+    단어별 게시 목록은 (문서 슬롯, 가중 tf) 리스트로 쌓고, 검색 시 NumPy 배열로 한 번 굳혀 재사용한다.
+    문서 수정은 이전 슬롯을 죽은 슬롯으로 표시하고 새 슬롯을 추가하며, 죽은 슬롯이 살아있는 슬롯보다 많아지면 재구성한다.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._keys: List[str] = []
+            self._slots: Dict[str, int] = {}
+            self._doc_terms: List[Optional[Dict[str, float]]] = []
+            self._lengths = np.zeros(0, dtype=np.float32)
+            self._alive = np.zeros(0, dtype=bool)
+            self._postings: Dict[str, Tuple[List[int], List[float]]] = {}
+            self._frozen: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+            self._df: Counter = Counter()
+            self._total_length = 0.0
+            self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def upsert(self, key: str, fields: List[Tuple[str, float]]):
+        """문서 추가/수정 - fields 는 (텍스트, 가중치) 목록"""
+        terms = Counter()
+        for text, weight in fields:
+            for token in tokenize(text):
+                terms[token] += weight
+
+        with self._lock:
+            self._remove(key)
+            self._add(key, dict(terms))
+            self._compact_if_needed()
+
+    def _add(self, key: str, terms: Dict[str, float]):
+        slot = len(self._keys)
+        if slot == len(self._lengths):
+            capacity = max(256, 2 * slot)
+            lengths = np.zeros(capacity, dtype=np.float32)
+            lengths[:slot] = self._lengths
+            alive = np.zeros(capacity, dtype=bool)
+            alive[:slot] = self._alive
+            self._lengths, self._alive = lengths, alive
+
+        self._keys.append(key)
+        self._slots[key] = slot
+        self._doc_terms.append(terms)
+        self._lengths[slot] = sum(terms.values())
+        self._alive[slot] = True
+        self._total_length += self._lengths[slot]
+
+        for term, frequency in terms.items():
+            slots, frequencies = self._postings.setdefault(term, ([], []))
+            slots.append(slot)
+            frequencies.append(frequency)
+            self._frozen.pop(term, None)
+            self._df[term] += 1
+
+    def remove(self, key: str):
+        with self._lock:
+            self._remove(key)
+            self._compact_if_needed()
+
+    def _remove(self, key: str):
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+        for term in self._doc_terms[slot]:
+            self._df[term] -= 1
+        self._doc_terms[slot] = None
+        self._alive[slot] = False
+        self._total_length -= self._lengths[slot]
+        self._dead += 1
+
+    def _compact_if_needed(self):
+        if self._dead <= max(len(self._slots), 64):
+            return
+        documents = [(key, self._doc_terms[slot]) for key, slot in self._slots.items()]
+        self.clear()
+        for key, terms in documents:
+            self._add(key, terms)
+
+    def _frozen_postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        frozen = self._frozen.get(term)
+        if frozen is None:
+            slots, frequencies = self._postings[term]
+            frozen = (np.asarray(slots, dtype=np.int32), np.asarray(frequencies, dtype=np.float32))
+            self._frozen[term] = frozen
+        return frozen
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """(문서 키, BM25 점수) 상위 k 개"""
+        terms = set(tokenize(query))
+        with self._lock:
+            count = len(self._slots)
+            if not count or not terms:
+                return []
+
+            average_length = self._total_length / count
+            scores = np.zeros(len(self._keys), dtype=np.float32)
+            for term in terms:
+                df = self._df.get(term, 0)
+                if df <= 0:
+                    continue
+                idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+                slots, frequencies = self._frozen_postings(term)
+                lengths = self._lengths[slots]
+                scores[slots] += (
+                    idf
+                    * frequencies
+                    * (self.k1 + 1)
+                    / (frequencies + self.k1 * (1 - self.b + self.b * lengths / average_length))
+                )
+            scores[~self._alive[: len(scores)]] = 0
+
+            candidates = np.flatnonzero(scores > 0)
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            candidates = candidates[np.argsort(-scores[candidates])]
+            return [(self._keys[slot], float(scores[slot])) for slot in candidates]
+
+    def knows_all(self, terms: List[str]) -> bool:
+        with self._lock:
+            return bool(terms) and all(self._df.get(term, 0) > 0 for term in terms)
+
+
+class KnowledgeLexicalIndex(BM25Index):
+    """CompanyContent / Project / BlogPost 를 색인하는 BM25 인덱스
+
+    - 원본 변경은 지식베이스 버전(get_kb_version)이 바뀐 것을 보고, 백그라운드 스레드에서 마지막 동기화 이후
+      updated_at 이 바뀐 문서와 사라진 문서만 따라잡는다 (요청 경로/저장한 프로세스에서 색인하지 않음).
+    """
+
+    SOURCES = {
+        "company_content": (lambda: CompanyContent.objects.filter(is_active=True), company_content_fields),
+        "project": (lambda: Project.objects.all(), project_fields),
+        "blog_post": (lambda: BlogPost.objects.filter(is_active=True), blog_post_fields),
+    }
+
+    def __init__(self, sync_interval: float = None, **kwargs):
+        super().__init__(**kwargs)
+        self.sync_interval = settings.CHATBOT_LEXICAL_SYNC_INTERVAL if sync_interval is None else sync_interval
+        self.kb_version = None
+        self._checked_at = 0.0
+        self._watermarks: Dict[str, Optional[datetime]] = {}
+        self._indexed_ids: Dict[str, Set[str]] = {}
+        self._sync_lock = threading.Lock()
+
+    @staticmethod
+    def document_key(content_type: str, content_id) -> str:
+        return f"{VECTOR_ID_PREFIXES[content_type]}_{content_id}"
+
+    @staticmethod
+    def _latest_update(queryset) -> Optional[datetime]:
+        return queryset.model.objects.aggregate(latest=Max("updated_at"))["latest"]
+
+    def rebuild(self):
+        started = time.perf_counter()
+        with self._sync_lock:
+            # 색인할 행을 읽기 전의 버전/updated_at 을 기록한다 - 읽는 도중 생긴 변경은 다음 확인 때 따라잡는다
+            kb_version = get_kb_version()
+            documents, watermarks, indexed_ids = [], {}, {}
+            for content_type, (queryset, fields) in self.SOURCES.items():
+                watermarks[content_type] = self._latest_update(queryset())
+                indexed_ids[content_type] = set()
+                for obj in queryset():
+                    documents.append((self.document_key(content_type, obj.id), fields(obj)))
+                    indexed_ids[content_type].add(str(obj.id))
+
+            with self._lock:
+                self.clear()
+                for key, document_fields in documents:
+                    self.upsert(key, document_fields)
+                self._watermarks, self._indexed_ids = watermarks, indexed_ids
+                self.kb_version = kb_version
+        print(f"🔤 키워드 색인 구성: {len(self)}개 문서 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+
+    def refresh(self, content_type: str, content_ids: List[str]):
+        """문서 몇 개만 다시 색인 (삭제/비활성화된 문서는 색인에서 제거)
+
+        kb_version 은 건드리지 않는다 - 같은 시점에 다른 워커가 올린 버전까지 반영한 것으로 보이면 안 되므로
+        버전은 catch_up() 이 실제로 따라잡은 시점의 값만 기록한다.
+        """
+        queryset, fields = self.SOURCES[content_type]
+        objects = {str(obj.id): obj for obj in queryset().filter(id__in=content_ids)}
+        with self._lock:
+            indexed_ids = self._indexed_ids.setdefault(content_type, set())
+            for content_id in content_ids:
+                key = self.document_key(content_type, content_id)
+                if content_id in objects:
+                    self.upsert(key, fields(objects[content_id]))
+                    indexed_ids.add(content_id)
+                else:
+                    self.remove(key)
+                    indexed_ids.discard(content_id)
+
+    def catch_up(self):
+        """마지막 동기화 이후 updated_at 이 바뀐 문서는 다시 색인하고, 사라진 문서는 색인에서 제거"""
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            started = time.perf_counter()
+            kb_version = get_kb_version()
+            # 저장 시각(updated_at)보다 늦게 커밋된 트랜잭션과 서버 간 시계 차이를 감안해 조금 겹쳐서 다시 읽는다
+            overlap = timedelta(seconds=settings.CHATBOT_LEXICAL_SYNC_OVERLAP_SECONDS)
+            changed_count = 0
+            for content_type, (queryset, _) in self.SOURCES.items():
+                model = queryset().model
+                since = self._watermarks.get(content_type)
+                watermark = self._latest_update(queryset())
+                changed = model.objects.all()
+                if since is not None:
+                    changed = changed.filter(updated_at__gte=since - overlap)
+                content_ids = {str(content_id) for content_id in changed.values_list("id", flat=True)}
+                alive_ids = {str(content_id) for content_id in queryset().values_list("id", flat=True)}
+                content_ids |= self._indexed_ids.get(content_type, set()) - alive_ids
+                if content_ids:
+                    self.refresh(content_type, list(content_ids))
+                    changed_count += len(content_ids)
+                self._watermarks[content_type] = watermark or since
+            self.kb_version = kb_version
+            print(f"🔤 키워드 색인 동기화: {changed_count}개 문서 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+        finally:
+            self._sync_lock.release()
+
+    def _catch_up_in_background(self):
+        try:
+            self.catch_up()
+        except Exception as e:
+            # kb_version 이 그대로이므로 다음 확인 때 다시 시도한다
+            print(f"⚠️ 키워드 색인 동기화 실패: {e}")
+        finally:
+            connection.close()
+
+    def ensure_synced(self, force: bool = False):
+        if force or self.kb_version is None:
+            self.rebuild()
+            return
+
+        now = time.monotonic()
+        if now - self._checked_at < self.sync_interval:
+            return
+        self._checked_at = now
+        if get_kb_version() != self.kb_version and not self._sync_lock.locked():
+            # 동기화하는 동안에도 검색은 기존 색인으로 계속 처리한다
+            threading.Thread(target=self._catch_up_in_background, name="lexical-index-sync", daemon=True).start()
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        self.ensure_synced()
+        return super().search(query, k)
@@ -0,0 +1,36 @@
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+from django.db import connection
+
+
+class StageTimer:
+    """요청 하나의 단계별 소요 시간(ms) 기록"""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+
+class QueryCounter:
+    """현재 스레드의 DB 연결에서 실행된 쿼리 수 집계"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def track(self):
+        with connection.execute_wrapper(self):
+            yield
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.3 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat_bot", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QueryExpansion",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("question_hash", models.CharField(max_length=64, unique=True, verbose_name="질문 해시")),
+                ("normalized_question", models.TextField(verbose_name="정규화된 질문")),
+                ("sub_queries", models.JSONField(default=list, verbose_name="하위 검색어들")),
+                ("model_name", models.CharField(blank=True, max_length=100, verbose_name="생성 모델")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="생성일")),
+            ],
+            options={
+                "verbose_name": "질문 확장 캐시",
+                "verbose_name_plural": "질문 확장 캐시",
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.3 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat_bot", "0002_queryexpansion"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContentChange",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("content_type", models.CharField(max_length=50, verbose_name="컨텐츠 유형")),
+                ("content_id", models.UUIDField(verbose_name="컨텐츠 ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True, verbose_name="변경일")),
+            ],
+            options={
+                "verbose_name": "컨텐츠 변경 아웃박스",
+                "verbose_name_plural": "컨텐츠 변경 아웃박스",
+                "ordering": ["id"],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.3 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat_bot", "0003_contentchange"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VectorCollection",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=100, unique=True, verbose_name="컬렉션명")),
+                ("embedding_model", models.CharField(max_length=100, verbose_name="임베딩 모델")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("building", "구성 중"), ("ready", "검증 완료"), ("failed", "실패")],
+                        default="building",
+                        max_length=20,
+                        verbose_name="상태",
+                    ),
+                ),
+                ("is_live", models.BooleanField(default=False, verbose_name="사용 중")),
+                ("document_count", models.IntegerField(default=0, verbose_name="문서 수")),
+                ("vector_count", models.IntegerField(default=0, verbose_name="벡터 수")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="생성일")),
+                ("activated_at", models.DateTimeField(blank=True, null=True, verbose_name="마지막 사용 시작일")),
+            ],
+            options={
+                "verbose_name": "벡터 컬렉션",
+                "verbose_name_plural": "벡터 컬렉션",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="vectorcollection",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_live", True)), fields=("is_live",), name="unique_live_vector_collection"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.3 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat_bot", "0004_vectorcollection"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contentchange",
+            name="claim_token",
+            field=models.UUIDField(blank=True, db_index=True, null=True, verbose_name="처리 배치"),
+        ),
+        migrations.AddField(
+            model_name="contentchange",
+            name="claimed_at",
+            field=models.DateTimeField(blank=True, null=True, verbose_name="처리 시작일"),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.3 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat_bot", "0005_contentchange_claim"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="KnowledgeVersion",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("key", models.CharField(max_length=100, unique=True, verbose_name="키")),
+                ("value", models.BigIntegerField(default=0, verbose_name="버전")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="수정일")),
+            ],
+            options={
+                "verbose_name": "지식베이스 버전",
+                "verbose_name_plural": "지식베이스 버전",
+            },
+        ),
+    ]
@@ -32,3 +32,89 @@ class ChatMessage(models.Model):
 
     def __str__(self):
         return f"{self.session.session_id} - {self.user_message[:30]}..."
+
+
+class QueryExpansion(models.Model):
+    question_hash = models.CharField("질문 해시", max_length=64, unique=True)
+    normalized_question = models.TextField("정규화된 질문")
+    sub_queries = models.JSONField("하위 검색어들", default=list)
+    model_name = models.CharField("생성 모델", max_length=100, blank=True)
+
+    created_at = models.DateTimeField("생성일", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "질문 확장 캐시"
+        verbose_name_plural = "질문 확장 캐시"
+
+    def __str__(self):
+        return self.normalized_question[:50]
+
+
+class ContentChange(models.Model):
+    """컨텐츠 변경 아웃박스 - 원본 수정과 같은 트랜잭션에서 기록되고 색인 작업이 배치로 처리한 뒤 지운다"""
+
+    content_type = models.CharField("컨텐츠 유형", max_length=50)
+    content_id = models.UUIDField("컨텐츠 ID")
+    created_at = models.DateTimeField("변경일", auto_now_add=True, db_index=True)
+    # 처리 중인 배치 표시 - 짧은 트랜잭션에서 가져간 뒤 트랜잭션 밖에서 임베딩한다
+    claim_token = models.UUIDField("처리 배치", null=True, blank=True, db_index=True)
+    claimed_at = models.DateTimeField("처리 시작일", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "컨텐츠 변경 아웃박스"
+        verbose_name_plural = "컨텐츠 변경 아웃박스"
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"{self.content_type} {self.content_id}"
+
+
+class KnowledgeVersion(models.Model):
+    """지식베이스/문서 버전 카운터 - 답변 캐시 무효화 기준
+
+    캐시처럼 밀려나지 않고, 여러 호스트의 워커가 같은 값을 보며, F() 로 원자적으로 증가한다.
+    """
+
+    key = models.CharField("키", max_length=100, unique=True)
+    value = models.BigIntegerField("버전", default=0)
+    updated_at = models.DateTimeField("수정일", auto_now=True)
+
+    class Meta:
+        verbose_name = "지식베이스 버전"
+        verbose_name_plural = "지식베이스 버전"
+
+    def __str__(self):
+        return f"{self.key}: {self.value}"
+
+
+class VectorCollection(models.Model):
+    """벡터 컬렉션 빌드 - 전체 재임베딩은 새 컬렉션에 만들고 검증 후 is_live 를 바꿔 한 번에 교체한다"""
+
+    STATUS_CHOICES = [
+        ("building", "구성 중"),
+        ("ready", "검증 완료"),
+        ("failed", "실패"),
+    ]
+
+    name = models.CharField("컬렉션명", max_length=100, unique=True)
+    embedding_model = models.CharField("임베딩 모델", max_length=100)
+    status = models.CharField("상태", max_length=20, choices=STATUS_CHOICES, default="building")
+    is_live = models.BooleanField("사용 중", default=False)
+    document_count = models.IntegerField("문서 수", default=0)
+    vector_count = models.IntegerField("벡터 수", default=0)
+
+    created_at = models.DateTimeField("생성일", auto_now_add=True)
+    activated_at = models.DateTimeField("마지막 사용 시작일", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "벡터 컬렉션"
+        verbose_name_plural = "벡터 컬렉션"
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["is_live"], condition=models.Q(is_live=True), name="unique_live_vector_collection"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.embedding_model}){' - 사용 중' if self.is_live else ''}"
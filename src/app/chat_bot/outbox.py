@@ -0,0 +1,136 @@
+# 컨텐츠 변경 아웃박스 - 원본 수정과 같은 트랜잭션에 변경을 남기고, 색인 작업이 배치로 모아 처리한다
+
+import time
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from app.chat_bot.indexing import ContentIndexer
+from app.chat_bot.models import ContentChange
+
+LAST_DRAIN_CACHE_KEY = "chat_bot:outbox_last_drain"
+
+
+def record_change(content_type: str, content_id):
+    ContentChange.objects.create(content_type=content_type, content_id=content_id)
+
+
+def outbox_stats() -> Dict[str, Any]:
+    """대기 중인 변경 수, 가장 오래된 변경의 대기 시간, 마지막 처리 결과"""
+    oldest = ContentChange.objects.order_by("id").values_list("created_at", flat=True).first()
+    return {
+        "pending": ContentChange.objects.count(),
+        "oldest_pending_age_seconds": (timezone.now() - oldest).total_seconds() if oldest else 0.0,
+        "last_drain": caches[settings.CHATBOT_CACHE_ALIAS].get(LAST_DRAIN_CACHE_KEY),
+    }
+
+
+def _process(service, changes: List[ContentChange]) -> Dict[str, int]:
+    """변경 한 배치를 컨텐츠 유형별로 묶어 처리
+
+    변경 내용이 아니라 현재 DB 상태를 기준으로 처리하므로 같은 변경을 여러 번 처리해도 결과가 같다.
+    - 남아있는 문서: 해시가 바뀐 것만 다시 임베딩
+    - 삭제/비활성화된 문서: 벡터 삭제
+    """
+    content_ids = defaultdict(set)
+    for change in changes:
+        content_ids[change.content_type].add(str(change.content_id))
+    content_ids = {content_type: sorted(ids) for content_type, ids in content_ids.items()}
+
+    indexer = ContentIndexer(service)
+    sources = indexer.sources()
+    removed = 0
+    for content_type, ids in content_ids.items():
+        existing = {str(pk) for pk in sources[content_type].filter(id__in=ids).values_list("id", flat=True)}
+        missing = [content_id for content_id in ids if content_id not in existing]
+        if missing:
+            service.remove_content(content_type, missing)
+            removed += len(missing)
+
+    summary = indexer.run(content_ids=content_ids)
+    return {"embedded": summary["embedded"], "failed": summary["failed"], "removed": removed}
+
+
+def claim_changes(batch_size: int) -> Tuple[Optional[uuid.UUID], List[ContentChange]]:
+    """처리할 변경을 짧은 트랜잭션에서 가져가 claim_token 으로 표시 (커밋 후 락은 풀린다)
+
+    여러 워커가 동시에 비워도 skip_locked 로 서로 다른 행을 가져간다.
+    CHATBOT_OUTBOX_CLAIM_TIMEOUT_SECONDS 가 지나도록 끝나지 않은 표시(워커 중단 등)는 다시 가져간다.
+    """
+    expired = timezone.now() - timedelta(seconds=settings.CHATBOT_OUTBOX_CLAIM_TIMEOUT_SECONDS)
+    token = uuid.uuid4()
+    with transaction.atomic():
+        changes = list(
+            ContentChange.objects.select_for_update(skip_locked=True)
+            .filter(Q(claim_token__isnull=True) | Q(claimed_at__lt=expired))
+            .order_by("id")[:batch_size]
+        )
+        if not changes:
+            return None, []
+        ContentChange.objects.filter(id__in=[change.id for change in changes]).update(
+            claim_token=token, claimed_at=timezone.now()
+        )
+    return token, changes
+
+
+def release_changes(token: uuid.UUID):
+    """처리하지 못한 배치를 아웃박스에 되돌려 다음 처리에서 다시 시도"""
+    ContentChange.objects.filter(claim_token=token).update(claim_token=None, claimed_at=None)
+
+
+def drain_changes(service, batch_size: int = None) -> Dict[str, Any]:
+    """대기 중인 변경을 batch_size 개씩 처리하고 지운다
+
+    임베딩 API 호출과 벡터 저장소 쓰기는 트랜잭션 밖에서 한다 (행 락을 네트워크 호출 동안 잡지 않고,
+    롤백되지 않는 벡터 저장소 쓰기가 DB 트랜잭션과 엇갈리지 않도록).
+    임베딩에 실패했거나 예외가 난 배치는 아웃박스에 되돌려 다음 처리에서 다시 시도한다.
+    """
+    batch_size = batch_size or settings.CHATBOT_OUTBOX_BATCH_SIZE
+    started = time.perf_counter()
+    # 검색 요청을 받지 않는 워커도 교체된 컬렉션에 쓰도록
+    service.sync_live_collection(force=True)
+    result = {"processed": 0, "batches": 0, "embedded": 0, "removed": 0, "failed": 0, "max_lag_seconds": 0.0}
+
+    while True:
+        token, changes = claim_changes(batch_size)
+        if not changes:
+            break
+
+        lag = (timezone.now() - changes[0].created_at).total_seconds()
+        result["max_lag_seconds"] = max(result["max_lag_seconds"], lag)
+        try:
+            processed = _process(service, changes)
+        except Exception:
+            release_changes(token)
+            raise
+        for key, value in processed.items():
+            result[key] += value
+        if processed["failed"]:
+            release_changes(token)
+            print(f"⚠️ 아웃박스 배치 처리 실패 - {len(changes)}개 변경을 되돌리고 중단")
+            break
+
+        ContentChange.objects.filter(claim_token=token).delete()
+        result["processed"] += len(changes)
+        result["batches"] += 1
+
+    elapsed = time.perf_counter() - started
+    result["elapsed_seconds"] = elapsed
+    result["changes_per_second"] = result["processed"] / elapsed if elapsed else 0.0
+    result["finished_at"] = timezone.now().isoformat()
+    caches[settings.CHATBOT_CACHE_ALIAS].set(LAST_DRAIN_CACHE_KEY, result, timeout=None)
+
+    if result["processed"] or result["failed"]:
+        print(
+            f"📤 아웃박스 처리: 변경 {result['processed']}개 ({result['batches']}배치), "
+            f"임베딩 {result['embedded']}개, 삭제 {result['removed']}개, 최대 지연 {result['max_lag_seconds']:.1f}s "
+            f"({result['changes_per_second']:.1f} changes/s)"
+        )
+    return result
@@ -0,0 +1,183 @@
+import asyncio
+import hashlib
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, List
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+
+from app.chat_bot.answer_cache import normalize_question
+from app.chat_bot.models import QueryExpansion
+from app.knowledge_document.models import Category
+
+# 질문 전처리/로컬 확장에 공통으로 쓰는 동의어 테이블
+KEYWORD_SYNONYMS = {
+    "프로젝트": ["프로젝트", "포트폴리오", "개발", "작업", "업무"],
+    "기술": ["기술", "스택", "언어", "프레임워크", "도구"],
+    "회사": ["회사", "기업", "조직", "팀"],
+}
+
+EXPANSION_PROMPT = """당신은 회사 소개 챗봇의 검색 도우미입니다.
+아래 질문과 관련된 문서를 벡터 검색으로 더 잘 찾을 수 있도록, 서로 다른 관점에서 바꿔 쓴 질문 {count}개를 만들어 주세요.
+설명 없이 한 줄에 질문 하나씩만 출력하세요.
+
+질문: {question}"""
+
+CATEGORY_KEYWORDS_TTL_SECONDS = 300
+
+# LLM 확장은 지연 예산을 넘기면 기다리지 않고 로컬 확장으로 대체 (백그라운드에서 완료되면 캐시에 저장)
+_llm_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="query-expansion")
+
+
+class QueryExpander:
+    """검색 전 질문 확장
+
+    - local: 동의어 테이블과 Category.common_keywords 로 만든 하위 검색어 (LLM 호출 없음)
+    - cached: 정규화된 질문 기준으로 저장된 LLM 하위 검색어 사용, 없으면 지연 예산 내에서만 LLM 호출
+    - llm: 매번 LLM 으로 하위 검색어 생성 (기존 MultiQueryRetriever 와 동일한 동작)
+    """
+
+    MODES = ("local", "cached", "llm")
+
+    def __init__(self, llm, mode: str, llm_timeout_seconds: float, max_queries: int):
+        if mode not in self.MODES:
+            raise ValueError(f"지원하지 않는 질문 확장 모드입니다: {mode}")
+
+        self.llm = llm
+        self.mode = mode
+        self.llm_timeout_seconds = llm_timeout_seconds
+        self.max_queries = max_queries
+
+        self._category_keywords: List[Dict] = []
+        self._category_keywords_loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def expand(self, question: str) -> List[str]:
+        """원본 질문을 첫 번째로 포함한 검색어 목록 반환"""
+        if self.mode == "local":
+            return self._expand_locally(question)
+        if self.mode == "llm":
+            return self._merge(question, self._generate_with_llm(question))
+
+        question_hash = self._get_question_hash(question)
+        expansion = QueryExpansion.objects.filter(question_hash=question_hash).only("sub_queries").first()
+        if expansion is not None:
+            return self._merge(question, expansion.sub_queries)
+
+        future = _llm_executor.submit(self._generate_and_store, question, question_hash)
+        try:
+            return self._merge(question, future.result(timeout=self.llm_timeout_seconds))
+        except FutureTimeoutError:
+            print(f"⏱️ 질문 확장 LLM 지연 예산({self.llm_timeout_seconds}s) 초과, 로컬 확장 사용")
+        except Exception as e:
+            print(f"⚠️ 질문 확장 LLM 호출 실패, 로컬 확장 사용: {e}")
+        return self._expand_locally(question)
+
+    async def aexpand(self, question: str) -> List[str]:
+        """expand 의 비동기 버전 - LLM 지연 예산은 asyncio 타임아웃으로 처리"""
+        if self.mode == "local":
+            return await sync_to_async(self._expand_locally)(question)
+        if self.mode == "llm":
+            return self._merge(question, await self._agenerate_with_llm(question))
+
+        question_hash = self._get_question_hash(question)
+        expansion = await QueryExpansion.objects.filter(question_hash=question_hash).only("sub_queries").afirst()
+        if expansion is not None:
+            return self._merge(question, expansion.sub_queries)
+
+        task = asyncio.ensure_future(self._agenerate_and_store(question, question_hash))
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        try:
+            return self._merge(question, await asyncio.wait_for(asyncio.shield(task), self.llm_timeout_seconds))
+        except asyncio.TimeoutError:
+            print(f"⏱️ 질문 확장 LLM 지연 예산({self.llm_timeout_seconds}s) 초과, 로컬 확장 사용")
+        except Exception as e:
+            print(f"⚠️ 질문 확장 LLM 호출 실패, 로컬 확장 사용: {e}")
+        return await sync_to_async(self._expand_locally)(question)
+
+    def _merge(self, question: str, sub_queries: List[str]) -> List[str]:
+        queries = [question]
+        for sub_query in sub_queries:
+            if sub_query and sub_query not in queries:
+                queries.append(sub_query)
+        return queries[: self.max_queries]
+
+    # =================== 로컬 확장 ===================
+
+    def _expand_locally(self, question: str) -> List[str]:
+        sub_queries = []
+
+        for key, synonyms in KEYWORD_SYNONYMS.items():
+            if any(synonym in question for synonym in synonyms):
+                sub_queries.append(f"{key} {' '.join(synonyms)}")
+
+        question_lower = question.lower()
+        for category in self._get_category_keywords():
+            keywords = category["keywords"]
+            if any(keyword.lower() in question_lower for keyword in keywords):
+                sub_queries.append(f"{category['name']} {' '.join(keywords)}")
+
+        return self._merge(question, sub_queries)
+
+    def _get_category_keywords(self) -> List[Dict]:
+        with self._lock:
+            if time.monotonic() - self._category_keywords_loaded_at > CATEGORY_KEYWORDS_TTL_SECONDS:
+                self._category_keywords = [
+                    {"name": name, "keywords": keywords}
+                    for name, keywords in Category.objects.filter(is_active=True).values_list("name", "common_keywords")
+                    if keywords
+                ]
+                self._category_keywords_loaded_at = time.monotonic()
+            return self._category_keywords
+
+    # =================== LLM 확장 ===================
+
+    def _generate_with_llm(self, question: str) -> List[str]:
+        response = self.llm.invoke(self._build_expansion_messages(question))
+        return self._parse_sub_queries(response.content)
+
+    async def _agenerate_with_llm(self, question: str) -> List[str]:
+        response = await self.llm.ainvoke(self._build_expansion_messages(question))
+        return self._parse_sub_queries(response.content)
+
+    def _build_expansion_messages(self, question: str) -> List[Dict[str, str]]:
+        prompt = EXPANSION_PROMPT.format(count=self.max_queries - 1, question=question)
+        return [{"role": "user", "content": prompt}]
+
+    @staticmethod
+    def _parse_sub_queries(content: str) -> List[str]:
+        lines = [re.sub(r"^\s*(\d+[.)]|[-*])\s*", "", line).strip() for line in content.splitlines()]
+        return [line for line in lines if line]
+
+    def _generate_and_store(self, question: str, question_hash: str) -> List[str]:
+        try:
+            sub_queries = self._generate_with_llm(question)
+            QueryExpansion.objects.update_or_create(
+                question_hash=question_hash, defaults=self._expansion_defaults(question, sub_queries)
+            )
+            return sub_queries
+        finally:
+            # 실행자 스레드에서 연 DB 연결 정리
+            connections.close_all()
+
+    async def _agenerate_and_store(self, question: str, question_hash: str) -> List[str]:
+        sub_queries = await self._agenerate_with_llm(question)
+        await QueryExpansion.objects.aupdate_or_create(
+            question_hash=question_hash, defaults=self._expansion_defaults(question, sub_queries)
+        )
+        return sub_queries
+
+    def _expansion_defaults(self, question: str, sub_queries: List[str]) -> Dict:
+        return {
+            "normalized_question": normalize_question(question),
+            "sub_queries": sub_queries,
+            "model_name": getattr(self.llm, "model_name", ""),
+        }
+
+    @staticmethod
+    def _get_question_hash(question: str) -> str:
+        return hashlib.sha256(normalize_question(question).encode()).hexdigest()
@@ -1,12 +1,19 @@
 # chatbot_service.py - 동적 Few-shot 적용된 챗봇 서비스
 
+import asyncio
+import atexit
 import hashlib
 import json
 import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 # Django imports
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from langchain.chains import RetrievalQA
 from langchain.chat_models import ChatOpenAI
@@ -14,30 +21,159 @@ from langchain.chat_models import ChatOpenAI
 from langchain.embeddings import OpenAIEmbeddings
 from langchain.llms import OpenAI
 from langchain.prompts import ChatPromptTemplate
-from langchain.retrievers import MultiQueryRetriever
 from langchain.schema import Document
-from langchain.vectorstores import Chroma
 
+from app.chat_bot.answer_cache import AnswerCache, SemanticAnswerCache, get_document_versions, get_kb_version
+from app.chat_bot.chunking import chunk_document, chunk_vector_ids
+from app.chat_bot.context_cards import (
+    ACTIVE_BLOG_POSTS_PREFETCH,
+    CARD_ONLY_METADATA,
+    RELATED_BLOGS_PER_PROJECT,
+    blog_post_card_metadata,
+    card_from_metadata,
+    card_from_object,
+    company_content_card_metadata,
+    project_card_metadata,
+)
+from app.chat_bot.embedding_batcher import MicroBatchedEmbeddings
+from app.chat_bot.embedding_cache import CachedEmbeddings
+from app.chat_bot.embedding_store import ContentEmbeddingStore
+from app.chat_bot.indexing import ContentIndexer
+from app.chat_bot.lexical_index import KnowledgeLexicalIndex, keyword_tokens
+from app.chat_bot.metrics import QueryCounter, StageTimer
+from app.chat_bot.query_expansion import KEYWORD_SYNONYMS, QueryExpander
+from app.chat_bot.relevance import relevance_cutoff
+from app.chat_bot.retrieval_plans import RetrievalPlan, retrieval_plan, technology_flags
+from app.chat_bot.retrieval_stats import RelevanceStatsBuffer
+from app.chat_bot.vector_collections import live_collection
+from app.chat_bot.vector_stores import SnapshotVectorStore, build_vector_store
 from app.knowledge_document.models import BlogPost, ChatLog, ChromaVector, CompanyContent, Project
 
+# Reciprocal Rank Fusion 상수
+RRF_K = 60
+
 
 class CompanyChatbotService:
     """회사 챗봇 서비스 - 동적 Few-shot Learning 적용"""
 
-    def __init__(self):
-        # OpenAI 설정
-        self.embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+    def __init__(self, llm=None, embeddings=None, vector_store=None):
+        # 사용 중인 벡터 컬렉션과 그 컬렉션을 만든 임베딩 모델 (블루/그린 빌드로 교체될 수 있음)
+        # 벤치마크 등에서 저장소를 주입한 경우에는 교체를 따라가지 않는다
+        self.collection_name, self.embedding_model = live_collection()
+        self._follow_live_collection = vector_store is None and embeddings is None
+        self._collection_checked_at = time.monotonic()
+
+        # OpenAI 설정 (벤치마크 등에서는 대체 구현을 주입할 수 있음)
+        document_embeddings = embeddings or OpenAIEmbeddings(model=self.embedding_model)
         # self.llm = ChatOpenAI(openai_api_key=settings.OPENAI_API_KEY, model="gpt-3.5-turbo", temperature=0.1)
-        self.llm = ChatOpenAI(openai_api_key=settings.OPENAI_API_KEY, model="gpt-4o", temperature=0.1)
+        self.llm = llm or ChatOpenAI(openai_api_key=settings.OPENAI_API_KEY, model="gpt-4o", temperature=0.1)
 
-        # Chroma 벡터스토어 설정
-        self.vector_store = Chroma(
-            collection_name="company_knowledge", embedding_function=self.embeddings, persist_directory="./chroma_db"
-        )
+        # 벡터스토어 설정 (CHATBOT_VECTOR_STORE_BACKEND: chroma | numpy | ivf | snapshot)
+        self.vector_store = vector_store or build_vector_store(document_embeddings, self.collection_name)
+        self._setup_query_embeddings(document_embeddings)
+
+        # (모델, 임베딩 텍스트 해시) → 문서 임베딩 - 같은 텍스트를 다시 색인할 때 API 호출 생략
+        self.content_embedding_store = None
+        if settings.CHATBOT_CONTENT_EMBEDDING_STORE_ENABLED:
+            self.content_embedding_store = ContentEmbeddingStore(settings.CHATBOT_CONTENT_EMBEDDING_STORE_PATH)
 
         # Few-shot 예시들 설정
         self.setup_few_shot_examples()
 
+        self._examples_lock = threading.Lock()
+        self._warmed_up = False
+
+        # 검색 전 질문 확장 (배포 환경별로 local / cached / llm 선택)
+        self.query_expander = QueryExpander(
+            llm=self.llm,
+            mode=settings.CHATBOT_QUERY_EXPANSION_MODE,
+            llm_timeout_seconds=settings.CHATBOT_QUERY_EXPANSION_TIMEOUT,
+            max_queries=settings.CHATBOT_QUERY_EXPANSION_MAX_QUERIES,
+        )
+
+        # 기술명/프로젝트명 등 정확한 단어 검색용 BM25 색인 (벡터 검색 결과와 RRF 로 병합)
+        self.lexical_index = KnowledgeLexicalIndex() if settings.CHATBOT_LEXICAL_SEARCH_ENABLED else None
+
+        # 원본별 검색 횟수/평균 유사도 - 메모리에 모았다가 주기적으로 반영 (워커 종료 시 남은 값은 _flush_relevance_stats)
+        self.relevance_stats = RelevanceStatsBuffer(flush_interval=settings.CHATBOT_RELEVANCE_STATS_FLUSH_INTERVAL)
+
+        # 정확 일치 답변 캐시
+        self.answer_cache = None
+        if settings.CHATBOT_ANSWER_CACHE_ENABLED:
+            self.answer_cache = AnswerCache(
+                max_size=settings.CHATBOT_ANSWER_CACHE_SIZE, ttl_seconds=settings.CHATBOT_ANSWER_CACHE_TTL
+            )
+
+        # 의미 유사 질문 답변 캐시
+        self.semantic_cache = None
+        if settings.CHATBOT_SEMANTIC_CACHE_ENABLED:
+            self.semantic_cache = SemanticAnswerCache(
+                max_size=settings.CHATBOT_SEMANTIC_CACHE_SIZE,
+                threshold=settings.CHATBOT_SEMANTIC_CACHE_THRESHOLD,
+                ttl_seconds=settings.CHATBOT_ANSWER_CACHE_TTL,
+            )
+
+    def _setup_query_embeddings(self, document_embeddings):
+        """질문 임베딩은 캐시 → 마이크로 배칭을 거친다 (문서 임베딩은 벡터스토어가 원본 모델로 직접 수행)"""
+        self.embedding_batcher = None
+        self.embeddings = document_embeddings
+        if settings.CHATBOT_EMBEDDING_BATCH_ENABLED:
+            self.embedding_batcher = MicroBatchedEmbeddings(
+                document_embeddings,
+                window_ms=settings.CHATBOT_EMBEDDING_BATCH_WINDOW_MS,
+                max_batch_size=settings.CHATBOT_EMBEDDING_BATCH_MAX_SIZE,
+                max_latency_ms=settings.CHATBOT_EMBEDDING_BATCH_MAX_LATENCY_MS,
+            )
+            self.embeddings = self.embedding_batcher
+        if settings.CHATBOT_EMBEDDING_CACHE_ENABLED:
+            self.embeddings = CachedEmbeddings(
+                self.embeddings,
+                store_path=settings.CHATBOT_EMBEDDING_CACHE_PATH,
+                max_memory_bytes=settings.CHATBOT_EMBEDDING_CACHE_MEMORY_BYTES,
+            )
+
+    def sync_live_collection(self, force: bool = False):
+        """다른 프로세스가 사용 중 컬렉션을 교체했으면 저장소/질문 임베딩 모델을 새 컬렉션으로 바꾼다
+
+        CHATBOT_VECTOR_COLLECTION_CHECK_INTERVAL 초마다 공유 캐시만 확인한다.
+        진행 중인 요청은 이전 저장소 객체를 그대로 쓰고, 이후 요청부터 새 저장소를 쓴다.
+        """
+        if not self._follow_live_collection:
+            return
+        now = time.monotonic()
+        if not force and now - self._collection_checked_at < settings.CHATBOT_VECTOR_COLLECTION_CHECK_INTERVAL:
+            return
+        self._collection_checked_at = now
+
+        collection_name, embedding_model = live_collection()
+        if collection_name == self.collection_name:
+            return
+
+        document_embeddings = OpenAIEmbeddings(model=embedding_model)
+        self.vector_store = build_vector_store(document_embeddings, collection_name)
+        if embedding_model != self.embedding_model:
+            self._setup_query_embeddings(document_embeddings)
+        self.collection_name, self.embedding_model = collection_name, embedding_model
+        print(f"🔀 벡터 컬렉션 전환: {collection_name} ({embedding_model}, pid={os.getpid()})")
+
+    def warmup(self):
+        """워커 시작 시 1회 호출 - 크로마 컬렉션 로딩 등 첫 요청에서 발생할 초기화 비용을 미리 처리"""
+        if self._warmed_up:
+            return
+
+        # 벡터 컬렉션을 열어 인덱스 로딩을 미리 수행
+        document_count = self.vector_store.count()
+
+        # 키워드 색인 구성
+        if self.lexical_index is not None:
+            self.lexical_index.ensure_synced(force=True)
+
+        # 질문 유형 분석/프롬프트 생성 경로를 한 번 실행해 둔다
+        self._build_few_shot_prompt("워밍업", "")
+
+        self._warmed_up = True
+        print(f"🔥 챗봇 서비스 워밍업 완료 (pid={os.getpid()}, 문서 수={document_count})")
+
     def setup_few_shot_examples(self):
         """질문 유형별 Few-shot 예시 설정"""
 
@@ -535,6 +671,13 @@ A: 죄송합니다. 현재 저희가 보유한 자료에는 블록체인 관련
     def _generate_final_answer(self, question: str, context_info: Dict, related_blogs: List) -> str:
         """동적 Few-shot을 적용한 최종 답변 생성"""
 
+        # ChatGPT 호출
+        messages = self._build_answer_messages(question, context_info, related_blogs)
+        response = self.llm.invoke(messages)
+
+        return response.content
+
+    def _build_answer_messages(self, question: str, context_info: Dict, related_blogs: List) -> List[Dict[str, str]]:
         # 동적 Few-shot 프롬프트 생성
         prompt_text = self._build_few_shot_prompt(question, context_info["context_text"])
 
@@ -545,45 +688,49 @@ A: 죄송합니다. 현재 저희가 보유한 자료에는 블록체인 관련
                 blog_section += f"- [{blog['title']}]({blog['url']})\n"
             prompt_text += blog_section
 
-        # ChatGPT 호출
-        messages = [{"role": "user", "content": prompt_text}]
-        response = self.llm.invoke(messages)
-
-        return response.content
+        return [{"role": "user", "content": prompt_text}]
 
     # 기존 메서드들은 그대로 유지...
-    def embed_all_content(self):
-        """모든 컨텐츠를 크로마에 임베딩"""
-        print("🔄 모든 컨텐츠 임베딩 시작...")
+    def embed_all_content(self, force: bool = False, batch_size: int = None, concurrency: int = None):
+        """모든 컨텐츠를 벡터 저장소에 임베딩 (내용이 바뀐 문서만 배치로 임베딩)"""
+        return ContentIndexer(self, batch_size=batch_size, concurrency=concurrency, force=force).run()
 
-        # 1. 회사 컨텐츠 임베딩
-        company_contents = CompanyContent.objects.filter(is_active=True)
-        for content in company_contents:
-            self._embed_company_content(content)
+    def _build_documents(self, content_type: str, obj) -> List[Tuple[str, Document]]:
+        """원본 하나 → 벡터 문서들 (긴 본문은 청크별 문서로 나눈다)
 
-        # 2. 프로젝트 임베딩
-        projects = Project.objects.all()
-        for project in projects:
-            self._embed_project(project)
-
-        # 3. 블로그 포스트 임베딩
-        blog_posts = BlogPost.objects.filter(is_active=True)
-        for blog_post in blog_posts:
-            self._embed_blog_post(blog_post)
-
-        print("✅ 임베딩 완료!")
+        청크 문서의 임베딩 텍스트는 본문 자리에 청크를 넣어 같은 템플릿으로 다시 만든다.
+        """
+        build_document, embed_text, body_field = {
+            "company_content": (self._build_company_content_document, self._company_content_embed_text, "content"),
+            "project": (self._build_project_document, None, None),
+            "blog_post": (self._build_blog_post_document, self._blog_post_embed_text, "content_summary"),
+        }[content_type]
+        vector_id, document = build_document(obj)
+        if body_field is None:
+            return [(vector_id, document)]
+        return chunk_document(
+            vector_id,
+            document,
+            getattr(obj, body_field),
+            settings.CHATBOT_CHUNK_SIZE,
+            settings.CHATBOT_CHUNK_OVERLAP,
+            render=lambda chunk: embed_text(obj, chunk),
+        )
 
-    def _embed_company_content(self, content: CompanyContent):
-        """회사 컨텐츠 임베딩"""
-        embed_text = f"""
+    @staticmethod
+    def _company_content_embed_text(content: CompanyContent, body: str) -> str:
+        return f"""
         제목: {content.title}
         유형: {content.get_content_type_display()}
         카테고리: {content.category.name}
-        내용: {content.content}
+        내용: {body}
         태그: {', '.join(content.tags)}
         검색키워드: {content.search_keywords}
         """
 
+    def _build_company_content_document(self, content: CompanyContent) -> Tuple[str, Document]:
+        embed_text = self._company_content_embed_text(content, content.content)
+
         metadata = {
             "source_type": "company_content",
             "content_id": str(content.id),
@@ -593,25 +740,12 @@ A: 죄송합니다. 현재 저희가 보유한 자료에는 블록체인 관련
             "priority": content.priority,
             "is_featured": content.is_featured,
             "tags": ", ".join(content.tags) if content.tags else "",
+            **company_content_card_metadata(content),
         }
 
-        document = Document(page_content=embed_text, metadata=metadata)
-        vector_id = f"company_{content.id}"
-        self.vector_store.add_documents([document], ids=[vector_id])
-
-        ChromaVector.objects.update_or_create(
-            content_type="company_content",
-            content_id=content.id,
-            defaults={
-                "vector_id": vector_id,
-                "collection_name": "company_knowledge",
-                "source_content_hash": self._get_content_hash(embed_text),
-                "needs_update": False,
-            },
-        )
+        return f"company_{content.id}", Document(page_content=embed_text, metadata=metadata)
 
-    def _embed_project(self, project: Project):
-        """프로젝트 임베딩"""
+    def _build_project_document(self, project: Project) -> Tuple[str, Document]:
         embed_text = f"""
         프로젝트명: {project.name}
         프로젝트 유형: {project.get_project_type_display()}
@@ -636,33 +770,25 @@ A: 죄송합니다. 현재 저희가 보유한 자료에는 블록체인 관련
             "is_highlight": project.is_portfolio_highlight,
             "duration_months": project.duration_months,
             "team_size": project.team_size,
+            **technology_flags(project.technologies_used),
+            **project_card_metadata(project),
         }
 
-        document = Document(page_content=embed_text, metadata=metadata)
-        vector_id = f"project_{project.id}"
-        self.vector_store.add_documents([document], ids=[vector_id])
-
-        ChromaVector.objects.update_or_create(
-            content_type="project",
-            content_id=project.id,
-            defaults={
-                "vector_id": vector_id,
-                "collection_name": "company_knowledge",
-                "source_content_hash": self._get_content_hash(embed_text),
-                "needs_update": False,
-            },
-        )
+        return f"project_{project.id}", Document(page_content=embed_text, metadata=metadata)
 
-    def _embed_blog_post(self, blog_post: BlogPost):
-        """블로그 포스트 임베딩"""
-        embed_text = f"""
+    @staticmethod
+    def _blog_post_embed_text(blog_post: BlogPost, body: str) -> str:
+        return f"""
         블로그 제목: {blog_post.title}
         발췌: {blog_post.excerpt}
-        내용 요약: {blog_post.content_summary}
+        내용 요약: {body}
         관련 주제: {', '.join(blog_post.related_topics)}
         URL: {blog_post.url}
         """
 
+    def _build_blog_post_document(self, blog_post: BlogPost) -> Tuple[str, Document]:
+        embed_text = self._blog_post_embed_text(blog_post, blog_post.content_summary)
+
         metadata = {
             "source_type": "blog_post",
             "content_id": str(blog_post.id),
@@ -671,22 +797,24 @@ A: 죄송합니다. 현재 저희가 보유한 자료에는 블록체인 관련
             "related_topics": ", ".join(blog_post.related_topics) if blog_post.related_topics else "",
             "is_featured": blog_post.is_featured,
             "published_date": blog_post.published_date.isoformat() if blog_post.published_date else None,
+            **blog_post_card_metadata(blog_post),
         }
 
-        document = Document(page_content=embed_text, metadata=metadata)
-        vector_id = f"blog_{blog_post.id}"
-        self.vector_store.add_documents([document], ids=[vector_id])
-
-        ChromaVector.objects.update_or_create(
-            content_type="blog_post",
-            content_id=blog_post.id,
-            defaults={
-                "vector_id": vector_id,
-                "collection_name": "company_knowledge",
-                "source_content_hash": self._get_content_hash(embed_text),
-                "needs_update": False,
-            },
-        )
+        return f"blog_{blog_post.id}", Document(page_content=embed_text, metadata=metadata)
+
+    def publish_vector_snapshot(self, now: bool = False):
+        """스냅샷 저장소면 다른 워커가 볼 새 스냅샷을 내보낸다 - 기본은 debounce 된 예약 작업으로
+
+        이 프로세스는 쓰기를 로컬 상태에 바로 반영하므로, 전체를 다시 쓰는 내보내기는 요청/시그널 경로에서 하지 않는다.
+        """
+        from app.chat_bot.tasks import schedule_snapshot_export
+
+        if not isinstance(self.vector_store, SnapshotVectorStore):
+            return None
+        if now:
+            return self.vector_store.export()
+        schedule_snapshot_export()
+        return None
 
     def process_question(self, user_question: str, session_id: str = None) -> Dict[str, Any]:
         """사용자 질문 처리 메인 함수 - 동적 Few-shot 적용"""
@@ -694,6 +822,193 @@ A: 죄송합니다. 현재 저희가 보유한 자료에는 블록체인 관련
 
         print(f"📝 사용자 질문: {user_question}")
 
+        # 캐시된 답변 확인
+        cache_lookup = self._lookup_cached_answer(user_question)
+        if cache_lookup["cached"] is not None:
+            return self._respond_from_cache(cache_lookup, user_question, session_id, start_time)
+
+        # 검색 및 컨텍스트 구성
+        prepared = self._prepare_answer_context(user_question, cache_lookup["question_embedding"])
+
+        # 동적 Few-shot 적용하여 AI 답변 생성
+        final_answer = self._generate_final_answer(user_question, prepared["context_info"], prepared["related_blogs"])
+
+        # 결과 로깅
+        response_time = (datetime.now() - start_time).total_seconds() * 1000
+        return self._finish_answer(user_question, session_id, prepared, final_answer, response_time, cache_lookup)
+
+    def stream_question(self, user_question: str, session_id: str = None) -> Iterator[Tuple[str, Any]]:
+        """process_question 의 스트리밍 버전
+
+        ("token", 텍스트 조각) 이벤트를 모델이 생성하는 대로 내보낸 뒤, 채팅 로그를 저장하고
+        ("done", 결과) 이벤트로 끝난다. 결과에는 전체 응답 시간과 별도로 첫 토큰까지의 시간이 포함된다.
+        """
+        start_time = datetime.now()
+
+        print(f"📝 사용자 질문(스트리밍): {user_question}")
+
+        cache_lookup = self._lookup_cached_answer(user_question)
+        if cache_lookup["cached"] is not None:
+            result = self._respond_from_cache(cache_lookup, user_question, session_id, start_time)
+            yield "token", result["answer"]
+            result["time_to_first_token_ms"] = result["response_time_ms"]
+            yield "done", result
+            return
+
+        prepared = self._prepare_answer_context(user_question, cache_lookup["question_embedding"])
+        messages = self._build_answer_messages(user_question, prepared["context_info"], prepared["related_blogs"])
+
+        answer_chunks = []
+        time_to_first_token = None
+        for chunk in self.llm.stream(messages):
+            if not chunk.content:
+                continue
+            if time_to_first_token is None:
+                time_to_first_token = (datetime.now() - start_time).total_seconds() * 1000
+                print(f"⏱️ 첫 토큰까지: {time_to_first_token:.0f}ms")
+            answer_chunks.append(chunk.content)
+            yield "token", chunk.content
+
+        # 스트림이 끝난 뒤 채팅 로그 저장
+        final_answer = "".join(answer_chunks)
+        response_time = (datetime.now() - start_time).total_seconds() * 1000
+        result = self._finish_answer(user_question, session_id, prepared, final_answer, response_time, cache_lookup)
+        result["time_to_first_token_ms"] = time_to_first_token if time_to_first_token is not None else response_time
+        yield "done", result
+
+    async def aprocess_question(self, user_question: str, session_id: str = None) -> Dict[str, Any]:
+        """process_question 의 비동기 버전
+
+        LLM/임베딩 호출은 비동기 클라이언트로, ORM 작업은 sync_to_async 로 처리해
+        OpenAI 응답을 기다리는 동안 스레드를 점유하지 않는다.
+        """
+        start_time = datetime.now()
+
+        print(f"📝 사용자 질문(비동기): {user_question}")
+
+        cache_lookup = await self._alookup_cached_answer(user_question)
+        if cache_lookup["cached"] is not None:
+            return await sync_to_async(self._respond_from_cache)(cache_lookup, user_question, session_id, start_time)
+
+        prepared = await self._aprepare_answer_context(user_question, cache_lookup["question_embedding"])
+
+        messages = self._build_answer_messages(user_question, prepared["context_info"], prepared["related_blogs"])
+        response = await self.llm.ainvoke(messages)
+
+        response_time = (datetime.now() - start_time).total_seconds() * 1000
+        return await sync_to_async(self._finish_answer)(
+            user_question, session_id, prepared, response.content, response_time, cache_lookup
+        )
+
+    async def _alookup_cached_answer(self, user_question: str) -> Dict[str, Any]:
+        lookup = {
+            "cached": None,
+            "cache_type": None,
+            "cache_key": None,
+            "question_embedding": None,
+            "question_keywords": frozenset(),
+        }
+
+        if self.answer_cache is not None:
+            kb_version = await sync_to_async(get_kb_version, thread_sensitive=False)()
+            lookup["cache_key"] = self.answer_cache.make_key(user_question, kb_version)
+            cached = self.answer_cache.get(lookup["cache_key"])
+            if cached is not None:
+                print("⚡ 캐시된 답변 사용")
+                lookup.update(cached=cached, cache_type="exact")
+                return lookup
+
+        if self.semantic_cache is not None:
+            lookup["question_keywords"] = frozenset(keyword_tokens(user_question))
+            lookup["question_embedding"] = await self.embeddings.aembed_query(self._preprocess_question(user_question))
+            cached = await sync_to_async(self.semantic_cache.lookup, thread_sensitive=False)(
+                lookup["question_embedding"], lookup["question_keywords"]
+            )
+            if cached is not None:
+                print("⚡ 유사 질문의 캐시된 답변 사용")
+                lookup.update(cached=cached, cache_type="semantic")
+
+        return lookup
+
+    async def _aprepare_answer_context(
+        self, user_question: str, question_embedding: List[float] = None
+    ) -> Dict[str, Any]:
+        question_type = self._analyze_question_type(user_question)
+        processed_question = self._preprocess_question(user_question)
+
+        timer = StageTimer()
+        relevant_docs = await self._aretrieve_relevant_documents(
+            processed_question, timer=timer, question_type=question_type, question_embedding=question_embedding
+        )
+        print(f"🔍 검색된 문서 수: {len(relevant_docs)} ({self._format_timings(timer.timings)})")
+
+        # 검색 결과 → DB 조회는 한 번의 sync_to_async 호출로 묶어 스레드 전환을 줄인다
+        query_counter = QueryCounter()
+
+        def load_context():
+            document_versions = self._capture_document_versions(relevant_docs)
+            with query_counter.track():
+                context_info = self._analyze_search_results(relevant_docs, user_question)
+                related_blogs = self._find_related_blogs(context_info, user_question)
+            self._record_relevance_scores(relevant_docs)
+            return context_info, related_blogs, document_versions
+
+        context_info, related_blogs, document_versions = await sync_to_async(load_context)()
+
+        return {
+            "question_type": question_type,
+            "processed_question": processed_question,
+            "context_info": context_info,
+            "related_blogs": related_blogs,
+            "timings": timer.timings,
+            "hydration_query_count": query_counter.count,
+            "document_versions": document_versions,
+        }
+
+    def _capture_document_versions(self, documents: List[Document]) -> Optional[Dict[str, Optional[int]]]:
+        """의미 유사 캐시에 저장할 때 쓸 검색된 원본들의 버전 - 원본 내용을 읽기 전에 기록한다"""
+        if self.semantic_cache is None:
+            return None
+        document_ids = {doc.metadata["content_id"] for doc in documents if doc.metadata.get("content_id")}
+        return get_document_versions(document_ids)
+
+    def _lookup_cached_answer(self, user_question: str) -> Dict[str, Any]:
+        """정확 일치 → 의미 유사 순서로 캐시된 답변 조회"""
+        lookup = {
+            "cached": None,
+            "cache_type": None,
+            "cache_key": None,
+            "question_embedding": None,
+            "question_keywords": frozenset(),
+        }
+
+        # 동일한 질문에 대한 캐시된 답변 확인
+        if self.answer_cache is not None:
+            lookup["cache_key"] = self.answer_cache.make_key(user_question, get_kb_version())
+            cached = self.answer_cache.get(lookup["cache_key"])
+            if cached is not None:
+                print("⚡ 캐시된 답변 사용")
+                lookup.update(cached=cached, cache_type="exact")
+                return lookup
+
+        # 의미가 같은 (표현만 다른) 질문에 대한 캐시된 답변 확인
+        # 전처리된 질문을 임베딩해 두면 캐시를 놓쳤을 때 검색이 같은 벡터를 다시 쓴다 (임베딩 호출 1회 절약)
+        if self.semantic_cache is not None:
+            lookup["question_keywords"] = frozenset(keyword_tokens(user_question))
+            lookup["question_embedding"] = self.embeddings.embed_query(self._preprocess_question(user_question))
+            cached = self.semantic_cache.lookup(lookup["question_embedding"], lookup["question_keywords"])
+            if cached is not None:
+                print("⚡ 유사 질문의 캐시된 답변 사용")
+                lookup.update(cached=cached, cache_type="semantic")
+
+        return lookup
+
+    def _prepare_answer_context(self, user_question: str, question_embedding: List[float] = None) -> Dict[str, Any]:
+        """답변 생성 전 단계 - 질문 분석, 검색, 컨텍스트 및 관련 블로그 구성
+
+        question_embedding 은 의미 유사 캐시 조회 때 만든 전처리된 질문의 임베딩 (있으면 검색에서 재사용)
+        """
+
         # 질문 유형 분석
         question_type = self._analyze_question_type(user_question)
         print(f"🎯 질문 유형: {question_type}")
@@ -703,92 +1018,388 @@ A: 죄송합니다. 현재 저희가 보유한 자료에는 블록체인 관련
         print(f"🔄 전처리된 질문: {processed_question}")
 
         # 벡터 검색으로 관련 문서 찾기
-        relevant_docs = self._retrieve_relevant_documents(processed_question)
-        print(f"🔍 검색된 문서 수: {len(relevant_docs)}")
+        timer = StageTimer()
+        relevant_docs = self._retrieve_relevant_documents(
+            processed_question, timer=timer, question_type=question_type, question_embedding=question_embedding
+        )
+        print(f"🔍 검색된 문서 수: {len(relevant_docs)} ({self._format_timings(timer.timings)})")
+        document_versions = self._capture_document_versions(relevant_docs)
 
-        # 검색 결과 분석 및 컨텍스트 구성
-        context_info = self._analyze_search_results(relevant_docs, user_question)
-        print(f"📊 컨텍스트 정보: {context_info['summary']}")
+        query_counter = QueryCounter()
+        with query_counter.track():
+            # 검색 결과 분석 및 컨텍스트 구성
+            context_info = self._analyze_search_results(relevant_docs, user_question)
+            print(f"📊 컨텍스트 정보: {context_info['summary']}")
 
-        # 관련 블로그 포스트 찾기
-        related_blogs = self._find_related_blogs(context_info, user_question)
-        print(f"📝 관련 블로그 수: {len(related_blogs)}")
+            # 관련 블로그 포스트 찾기
+            related_blogs = self._find_related_blogs(context_info, user_question)
+            print(f"📝 관련 블로그 수: {len(related_blogs)}")
+        print(f"🗄️ 문서 조회 쿼리 수: {query_counter.count}")
+        self._record_relevance_scores(relevant_docs)
 
-        # 동적 Few-shot 적용하여 AI 답변 생성
-        final_answer = self._generate_final_answer(user_question, context_info, related_blogs)
+        return {
+            "question_type": question_type,
+            "processed_question": processed_question,
+            "context_info": context_info,
+            "related_blogs": related_blogs,
+            "timings": timer.timings,
+            "hydration_query_count": query_counter.count,
+            "document_versions": document_versions,
+        }
 
-        # 결과 로깅
-        response_time = (datetime.now() - start_time).total_seconds() * 1000
-        chat_log = self._log_conversation(
-            user_question, processed_question, context_info, related_blogs, final_answer, response_time, session_id
+    def _finish_answer(
+        self,
+        user_question: str,
+        session_id: str,
+        prepared: Dict[str, Any],
+        final_answer: str,
+        response_time: float,
+        cache_lookup: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """채팅 로그 저장 및 답변 캐싱"""
+        context_info = prepared["context_info"]
+        related_blogs = prepared["related_blogs"]
+
+        retrieved_ids = self._get_retrieved_ids(context_info)
+        chat_log = self._create_chat_log(
+            user_question,
+            prepared["processed_question"],
+            retrieved_ids,
+            related_blogs,
+            final_answer,
+            response_time,
+            session_id,
         )
 
+        cache_entry = {
+            "answer": final_answer,
+            "related_blogs": related_blogs,
+            "sources_used": context_info["sources"],
+            "question_type": prepared["question_type"],
+            "processed_question": prepared["processed_question"],
+            "retrieved_ids": retrieved_ids,
+            "response_time_ms": response_time,
+        }
+        if cache_lookup["cache_key"] is not None:
+            self.answer_cache.set(cache_lookup["cache_key"], cache_entry)
+        if cache_lookup["question_embedding"] is not None:
+            self.semantic_cache.add(
+                cache_lookup["question_embedding"],
+                cache_entry,
+                prepared["document_versions"],
+                cache_lookup["question_keywords"],
+            )
+
         return {
             "answer": final_answer,
             "related_blogs": related_blogs,
             "sources_used": context_info["sources"],
             "response_time_ms": response_time,
             "chat_log_id": str(chat_log.id),
-            "question_type": question_type,  # 디버깅용
+            "question_type": prepared["question_type"],  # 디버깅용
+            "cached": False,
+            "timings": prepared["timings"],
+            "hydration_query_count": prepared["hydration_query_count"],
         }
 
+    def _respond_from_cache(
+        self, cache_lookup: Dict[str, Any], user_question: str, session_id: str, start_time: datetime
+    ) -> Dict[str, Any]:
+        """캐시된 답변으로 응답 - 캐시 히트도 채팅 로그는 남긴다"""
+        cached = cache_lookup["cached"]
+
+        response_time = (datetime.now() - start_time).total_seconds() * 1000
+        chat_log = self._create_chat_log(
+            user_question,
+            cached["processed_question"],
+            cached["retrieved_ids"],
+            cached["related_blogs"],
+            cached["answer"],
+            response_time,
+            session_id,
+        )
+
+        if cache_lookup["cache_type"] == "semantic":
+            self.semantic_cache.record_saved_latency(cached["response_time_ms"] - response_time)
+
+        return {
+            "answer": cached["answer"],
+            "related_blogs": cached["related_blogs"],
+            "sources_used": cached["sources_used"],
+            "response_time_ms": response_time,
+            "chat_log_id": str(chat_log.id),
+            "question_type": cached["question_type"],
+            "cached": True,
+            "timings": {},
+            "hydration_query_count": 0,
+        }
+
+    @staticmethod
+    def _format_timings(timings: Dict[str, float]) -> str:
+        return ", ".join(f"{stage} {elapsed:.0f}ms" for stage, elapsed in timings.items())
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """답변/임베딩 캐시 히트율, 절약된 응답 시간, 임베딩 배치 통계"""
+        stats = {}
+        if self.answer_cache is not None:
+            stats["answer_cache"] = self.answer_cache.stats()
+        if self.semantic_cache is not None:
+            stats["semantic_cache"] = self.semantic_cache.stats()
+        if isinstance(self.embeddings, CachedEmbeddings):
+            stats["embedding_cache"] = self.embeddings.stats()
+        if self.embedding_batcher is not None:
+            stats["embedding_batcher"] = self.embedding_batcher.stats()
+        return stats
+
     # 나머지 메서드들 (기존과 동일)
     def _preprocess_question(self, question: str) -> str:
         processed = question.strip()
-        keyword_mapping = {
-            "프로젝트": ["프로젝트", "포트폴리오", "개발", "작업", "업무"],
-            "기술": ["기술", "스택", "언어", "프레임워크", "도구"],
-            "회사": ["회사", "기업", "조직", "팀"],
-        }
-        for key, synonyms in keyword_mapping.items():
+        for key, synonyms in KEYWORD_SYNONYMS.items():
             if key in processed:
                 processed += f" {' '.join(synonyms)}"
         return processed
 
-    def _retrieve_relevant_documents(self, question: str, k: int = 10) -> List[Document]:
-        retriever = MultiQueryRetriever.from_llm(
-            retriever=self.vector_store.as_retriever(search_kwargs={"k": k}), llm=self.llm
+    def _retrieve_relevant_documents(
+        self,
+        question: str,
+        k: int = None,
+        timer: StageTimer = None,
+        question_type: str = None,
+        question_embedding: List[float] = None,
+    ) -> List[Document]:
+        """검색 계획 → 키워드 검색 → 질문 확장 → 한 번의 배치 임베딩 → 필터별 병렬 벡터 검색 → RRF 병합/점수 컷오프
+
+        질문 유형별 검색 계획(retrieval_plans)의 메타데이터 필터는 벡터 인덱스 안에서 적용된다.
+        k 는 최대 개수이고, 유사도가 낮은 문서는 relevance_cutoff 로 걸러 실제 개수는 점수 분포에 따라 줄어든다.
+        벡터 검색된 문서는 metadata["relevance_score"] 에 코사인 유사도를 담는다.
+        기술명 위주 질문은 키워드 검색 결과만으로 답하고 임베딩 호출을 건너뛴다.
+        question_embedding 이 주어지면 원본 질문(첫 번째 검색어)은 다시 임베딩하지 않는다.
+        """
+        timer = timer or StageTimer()
+        self.sync_live_collection()
+        plan = retrieval_plan(question_type, question)
+        k = k or plan.k
+
+        lexical_docs, keyword_only = self._search_lexical(question, k, timer, question_type, plan)
+        if keyword_only:
+            return lexical_docs
+
+        with timer.stage("expansion"):
+            sub_queries = self.query_expander.expand(question)
+
+        with timer.stage("embedding"):
+            query_vectors = self._reuse_question_embedding(sub_queries, question, question_embedding)
+            if len(sub_queries) > len(query_vectors):
+                query_vectors += self.embeddings.embed_documents(sub_queries[len(query_vectors) :])
+
+        with timer.stage("search"):
+            searches = self._plan_searches(plan, query_vectors)
+            result_lists = list(
+                search_executor().map(
+                    lambda search: self.vector_store.similarity_search_by_vector_with_score(
+                        search[0], k=search[2], filter=search[1]
+                    ),
+                    searches,
+                )
+            )
+            if self._needs_unfiltered_search(plan, result_lists):
+                result_lists += list(
+                    search_executor().map(
+                        lambda vector: self.vector_store.similarity_search_by_vector_with_score(vector, k=k),
+                        query_vectors,
+                    )
+                )
+
+        with timer.stage("fusion"):
+            return self._fuse_search_results(result_lists, k, lexical_docs)
+
+    async def _aretrieve_relevant_documents(
+        self,
+        question: str,
+        k: int = None,
+        timer: StageTimer = None,
+        question_type: str = None,
+        question_embedding: List[float] = None,
+    ) -> List[Document]:
+        timer = timer or StageTimer()
+        # 사용 중 컬렉션 확인은 DB 캐시/VectorCollection 조회, 교체 시 저장소 생성까지 하므로 이벤트 루프 밖에서
+        await sync_to_async(self.sync_live_collection, thread_sensitive=False)()
+        plan = retrieval_plan(question_type, question)
+        k = k or plan.k
+
+        # 키워드 색인은 지식베이스가 바뀌면 DB 에서 다시 만들어지므로 스레드에서 실행
+        lexical_docs, keyword_only = await sync_to_async(self._search_lexical, thread_sensitive=False)(
+            question, k, timer, question_type, plan
+        )
+        if keyword_only:
+            return lexical_docs
+
+        with timer.stage("expansion"):
+            sub_queries = await self.query_expander.aexpand(question)
+
+        with timer.stage("embedding"):
+            query_vectors = self._reuse_question_embedding(sub_queries, question, question_embedding)
+            if len(sub_queries) > len(query_vectors):
+                query_vectors += await self.embeddings.aembed_documents(sub_queries[len(query_vectors) :])
+
+        with timer.stage("search"):
+            search = sync_to_async(self.vector_store.similarity_search_by_vector_with_score, thread_sensitive=False)
+            result_lists = list(
+                await asyncio.gather(
+                    *(
+                        search(vector, k=search_k, filter=where)
+                        for vector, where, search_k in self._plan_searches(plan, query_vectors)
+                    )
+                )
+            )
+            if self._needs_unfiltered_search(plan, result_lists):
+                result_lists += await asyncio.gather(*(search(vector, k=k) for vector in query_vectors))
+
+        with timer.stage("fusion"):
+            return self._fuse_search_results(result_lists, k, lexical_docs)
+
+    @staticmethod
+    def _reuse_question_embedding(
+        sub_queries: List[str], question: str, question_embedding: List[float] = None
+    ) -> List[List[float]]:
+        """첫 번째 검색어가 원본 질문이고 그 임베딩이 이미 있으면 [임베딩], 아니면 []"""
+        if question_embedding is not None and sub_queries and sub_queries[0] == question:
+            return [question_embedding]
+        return []
+
+    @staticmethod
+    def _plan_searches(plan: RetrievalPlan, query_vectors: List[List[float]]) -> List[tuple]:
+        """(질문 벡터, where, k) - 하위 검색어마다 계획의 필터별 검색을 한 번씩"""
+        return [(vector, where, search_k) for vector in query_vectors for _, where, search_k in plan.searches]
+
+    @staticmethod
+    def _needs_unfiltered_search(plan: RetrievalPlan, result_lists: List[List[Tuple[Document, float]]]) -> bool:
+        """필터 때문에 찾은 원본이 너무 적으면 (분류가 틀렸거나 메타데이터가 없는 문서) 전체 컬렉션에서도 찾는다"""
+        if all(where is None for _, where, _ in plan.searches):
+            return False
+        found = {
+            (doc.metadata.get("source_type"), doc.metadata.get("content_id"))
+            for results in result_lists
+            for doc, _ in results
+        }
+        return len(found) < settings.CHATBOT_RETRIEVAL_MIN_FILTERED_RESULTS
+
+    def _search_lexical(
+        self, question: str, k: int, timer: StageTimer, question_type: str = None, plan: RetrievalPlan = None
+    ) -> Tuple[List[Document], bool]:
+        """BM25 키워드 검색 결과 문서(검색 계획의 필터를 통과한 것만)와 벡터 검색을 건너뛸지 여부"""
+        if self.lexical_index is None:
+            return [], False
+
+        with timer.stage("lexical"):
+            hits = self.lexical_index.search(question, k)
+            if not hits:
+                return [], False
+            documents = self._get_documents_by_vector_ids([vector_id for vector_id, _ in hits])
+            if plan is not None:
+                documents = [doc for doc in documents if plan.allows(doc.metadata)]
+
+        # 질문 유형 분석이 기술 질문으로 보고, 질문의 영문 키워드가 모두 색인에 있으면 키워드 검색만으로 충분
+        keyword_only = (
+            question_type in settings.CHATBOT_LEXICAL_SHORTCUT_QUESTION_TYPES
+            and len(documents) >= settings.CHATBOT_LEXICAL_SHORTCUT_MIN_HITS
+            and self.lexical_index.knows_all(keyword_tokens(question))
         )
-        try:
-            documents = retriever.get_relevant_documents(question)
-            return documents
-        except Exception as e:
-            print(f"⚠️ MultiQuery 검색 실패, 기본 검색으로 대체: {e}")
-            return self.vector_store.similarity_search(question, k=k)
+        if keyword_only:
+            print(f"🔤 키워드 질문 - 임베딩/벡터 검색 생략 ({len(documents)}개 문서)")
+        return documents, keyword_only
+
+    def _get_documents_by_vector_ids(self, vector_ids: List[str]) -> List[Document]:
+        """벡터 저장소에서 id 로 문서 조회 (순서 유지, 아직 임베딩되지 않은 문서는 제외)"""
+        results = self.vector_store.get(ids=vector_ids, include=["metadatas", "documents"])
+        found = {
+            vector_id: Document(page_content=text or "", metadata=metadata or {})
+            for vector_id, text, metadata in zip(results["ids"], results["documents"], results["metadatas"])
+        }
+        return [found[vector_id] for vector_id in vector_ids if vector_id in found]
+
+    @staticmethod
+    def _fuse_search_results(
+        result_lists: List[List[Tuple[Document, float]]], k: int, lexical_results: List[Document] = None
+    ) -> List[Document]:
+        """하위 검색어별 (문서, 유사도) 결과(+ 키워드 검색 결과)를 Reciprocal Rank Fusion 으로 합치고 content_id 기준으로 중복 제거
+
+        키워드 검색 결과는 하위 검색어 여러 개의 벡터 결과와 균형을 맞추도록 CHATBOT_LEXICAL_WEIGHT 배로 반영한다.
+        같은 원본의 청크들은 결과 목록마다 가장 높은 순위 하나만 점수에 반영하고,
+        검색된 청크 본문은 원본별로 모아 matched_chunks 메타데이터로 넘긴다 (청크 순서대로).
+        벡터 검색된 원본은 (모든 검색/청크 중) 최고 유사도로 relevance_cutoff 를 통과해야 남는다.
+        키워드 검색에만 나온 원본은 유사도가 없으므로 컷오프 없이 RRF 순위로만 판단한다.
+        """
+        scores = defaultdict(float)
+        documents = {}
+        chunk_scores = defaultdict(lambda: defaultdict(float))
+        similarities = {}
+
+        weighted_lists = [(results, 1.0) for results in result_lists]
+        if lexical_results:
+            weighted_lists.append(([(doc, None) for doc in lexical_results], settings.CHATBOT_LEXICAL_WEIGHT))
+
+        for results, weight in weighted_lists:
+            seen = set()
+            for rank, (doc, similarity) in enumerate(results):
+                key = (doc.metadata.get("source_type"), doc.metadata.get("content_id"))
+                score = weight / (RRF_K + rank + 1)
+                if key not in seen:
+                    scores[key] += score
+                    seen.add(key)
+                if similarity is not None and similarity > similarities.get(key, float("-inf")):
+                    similarities[key] = similarity
+                documents.setdefault(key, doc)
+                if doc.metadata.get("chunk_text"):
+                    chunk_scores[key][(doc.metadata["chunk_index"], doc.metadata["chunk_text"])] += score
+
+        relevant = set(relevance_cutoff(similarities, k))
+        ranked_keys = [
+            key for key in sorted(scores, key=scores.get, reverse=True) if key in relevant or key not in similarities
+        ]
+        if len(similarities) > len(relevant):
+            print(f"✂️ 유사도 컷오프: 벡터 검색 원본 {len(similarities)}개 중 {len(relevant)}개 사용")
+
+        fused = []
+        for key in ranked_keys[:k]:
+            doc = documents[key]
+            metadata = dict(doc.metadata)
+            if key in similarities:
+                metadata["relevance_score"] = round(similarities[key], 4)
+            if chunk_scores[key]:
+                best_chunks = sorted(chunk_scores[key], key=chunk_scores[key].get, reverse=True)
+                passages = [text for _, text in sorted(best_chunks[: settings.CHATBOT_CHUNKS_PER_DOCUMENT])]
+                metadata["matched_chunks"] = json.dumps(passages, ensure_ascii=False)
+            fused.append(Document(page_content=doc.page_content, metadata=metadata))
+        return fused
+
+    def _record_relevance_scores(self, documents: List[Document]):
+        """검색된 원본의 유사도를 사용 중 컬렉션의 ChromaVector 통계에 누적 (retrieval_count, avg_relevance_score)
+
+        질문마다 UPDATE 하지 않고 relevance_stats 에 모아 두었다가 주기적으로 한 번에 반영한다.
+        """
+        similarities = {
+            (doc.metadata.get("source_type"), doc.metadata.get("content_id")): doc.metadata["relevance_score"]
+            for doc in documents
+            if doc.metadata.get("relevance_score") is not None
+        }
+        if similarities:
+            self.relevance_stats.record(self.collection_name, similarities)
 
     def _analyze_search_results(self, documents: List[Document], question: str) -> Dict[str, Any]:
-        company_contents = []
-        projects = []
-        blog_posts = []
+        """검색 결과 → 컨텍스트 카드 (검색 순위 유지)
 
-        for doc in documents:
-            source_type = doc.metadata.get("source_type")
-            content_id = doc.metadata.get("content_id")
-
-            if source_type == "company_content":
-                try:
-                    content = CompanyContent.objects.get(id=content_id)
-                    company_contents.append(content)
-                except CompanyContent.DoesNotExist:
-                    continue
-            elif source_type == "project":
-                try:
-                    project = Project.objects.get(id=content_id)
-                    projects.append(project)
-                except Project.DoesNotExist:
-                    continue
-            elif source_type == "blog_post":
-                try:
-                    blog = BlogPost.objects.get(id=content_id)
-                    blog_posts.append(blog)
-                except BlogPost.DoesNotExist:
-                    continue
-
-        if any(keyword in question.lower() for keyword in ["프로젝트", "포트폴리오", "개발", "진행"]):
-            highlight_projects = Project.objects.filter(is_portfolio_highlight=True).exclude(
-                id__in=[p.id for p in projects]
-            )[:3]
-            projects.extend(highlight_projects)
+        카드는 벡터 메타데이터에 함께 저장되어 있으므로 DB 조회가 필요 없다.
+        카드가 없는(이전 버전으로 인덱싱된) 문서만 모델별 in_bulk 로 조회한다 (프로젝트의 관련 블로그는 prefetch).
+        포트폴리오 대표 프로젝트는 검색 계획(project 유형)에서 is_highlight 필터 검색으로 함께 찾는다.
+        """
+        cards_by_type = {"company_content": [], "project": [], "blog_post": []}
+        for card in self._cards_from_documents(documents):
+            cards_by_type[card["source_type"]].append(card)
+
+        company_contents = cards_by_type["company_content"]
+        projects = cards_by_type["project"]
+        blog_posts = cards_by_type["blog_post"]
 
         context_text = self._build_context_text(company_contents, projects, blog_posts)
 
@@ -797,38 +1408,57 @@ A: 죄송합니다. 현재 저희가 보유한 자료에는 블록체인 관련
             "projects": projects,
             "blog_posts": blog_posts,
             "context_text": context_text,
-            "sources": [doc.metadata for doc in documents],
+            "sources": [{k: v for k, v in doc.metadata.items() if k not in CARD_ONLY_METADATA} for doc in documents],
             "summary": f"회사정보 {len(company_contents)}개, 프로젝트 {len(projects)}개, 블로그 {len(blog_posts)}개 검색됨",
         }
 
+    def _cards_from_documents(self, documents: List[Document]) -> List[Dict[str, Any]]:
+        missing_ids = defaultdict(list)
+        for doc in documents:
+            if "context_card" not in doc.metadata:
+                missing_ids[doc.metadata.get("source_type")].append(doc.metadata.get("content_id"))
+
+        hydrated = {}
+        querysets = {
+            "company_content": CompanyContent.objects.select_related("category"),
+            "project": Project.objects.prefetch_related(ACTIVE_BLOG_POSTS_PREFETCH),
+            "blog_post": BlogPost.objects.all(),
+        }
+        for source_type, ids in missing_ids.items():
+            if source_type in querysets:
+                for pk, obj in querysets[source_type].in_bulk(ids).items():
+                    hydrated[(source_type, str(pk))] = card_from_object(source_type, obj)
+
+        cards = []
+        for doc in documents:
+            source_type = doc.metadata.get("source_type")
+            if source_type not in querysets:
+                continue
+            if "context_card" in doc.metadata:
+                cards.append(card_from_metadata(doc.metadata))
+            elif (source_type, doc.metadata.get("content_id")) in hydrated:
+                cards.append(hydrated[(source_type, doc.metadata.get("content_id"))])
+        return cards
+
     def _build_context_text(self, company_contents, projects, blog_posts) -> str:
         context_parts = []
 
         if company_contents:
             context_parts.append("## 회사 정보")
             for content in company_contents[:3]:
-                context_parts.append(f"**{content.title}**")
-                context_parts.append(content.content[:500] + "...")
+                context_parts.append(content["card"])
                 context_parts.append("")
 
         if projects:
             context_parts.append("## 프로젝트 포트폴리오")
             for project in projects[:5]:
-                context_parts.append(f"**{project.name}** ({project.get_project_type_display()})")
-                context_parts.append(f"클라이언트: {project.client_name}")
-                context_parts.append(f"설명: {project.description[:300]}...")
-                context_parts.append(f"기술스택: {', '.join(project.technologies_used)}")
-                context_parts.append(f"기간: {project.duration_months}개월, 팀: {project.team_size}명")
-                if project.is_portfolio_highlight:
-                    context_parts.append("🌟 포트폴리오 대표 프로젝트")
+                context_parts.append(project["card"])
                 context_parts.append("")
 
         if blog_posts:
             context_parts.append("## 관련 블로그")
             for blog in blog_posts[:3]:
-                context_parts.append(f"**{blog.title}**")
-                context_parts.append(f"요약: {blog.content_summary[:200]}...")
-                context_parts.append(f"URL: {blog.url}")
+                context_parts.append(blog["card"])
                 context_parts.append("")
 
         return "\n".join(context_parts)
@@ -839,43 +1469,47 @@ A: 죄송합니다. 현재 저희가 보유한 자료에는 블록체인 관련
         for blog_post in context_info["blog_posts"]:
             related_blogs.append(
                 {
-                    "title": blog_post.title,
-                    "url": blog_post.url,
-                    "excerpt": blog_post.excerpt[:100] + "..." if blog_post.excerpt else "",
+                    "title": blog_post["title"],
+                    "url": blog_post["url"],
+                    "excerpt": blog_post["excerpt"],
                     "relevance": "검색 결과",
                 }
             )
 
+        # 프로젝트별 관련 블로그는 프로젝트 카드에 미리 저장되어 있다
+        searched_blog_ids = {b["id"] for b in context_info["blog_posts"]}
         for project in context_info["projects"]:
-            project_blogs = BlogPost.objects.filter(related_projects=project, is_active=True).exclude(
-                id__in=[b.id for b in context_info["blog_posts"]]
-            )
-            for blog in project_blogs[:2]:
+            project_blogs = [blog for blog in project["related_blogs"] if blog["id"] not in searched_blog_ids]
+            for blog in project_blogs[:RELATED_BLOGS_PER_PROJECT]:
                 related_blogs.append(
                     {
-                        "title": blog.title,
-                        "url": blog.url,
-                        "excerpt": blog.excerpt[:100] + "..." if blog.excerpt else "",
-                        "relevance": f"{project.name} 관련",
+                        "title": blog["title"],
+                        "url": blog["url"],
+                        "excerpt": blog["excerpt"],
+                        "relevance": f"{project['title']} 관련",
                     }
                 )
 
         return related_blogs[:5]
 
-    def _log_conversation(
-        self, user_question, processed_question, context_info, related_blogs, final_answer, response_time, session_id
+    def _get_retrieved_ids(self, context_info: Dict) -> Dict[str, List[str]]:
+        return {
+            "content_ids": [c["id"] for c in context_info["company_contents"]],
+            "project_ids": [p["id"] for p in context_info["projects"]],
+            "blog_ids": [b["id"] for b in context_info["blog_posts"]],
+        }
+
+    def _create_chat_log(
+        self, user_question, processed_question, retrieved_ids, related_blogs, final_answer, response_time, session_id
     ) -> ChatLog:
-        content_ids = [str(c.id) for c in context_info["company_contents"]]
-        project_ids = [str(p.id) for p in context_info["projects"]]
-        blog_ids = [str(b.id) for b in context_info["blog_posts"]]
         blog_links = [{"title": b["title"], "url": b["url"]} for b in related_blogs]
 
         chat_log = ChatLog.objects.create(
             user_question=user_question,
             processed_question=processed_question,
-            retrieved_content_ids=content_ids,
-            retrieved_projects=project_ids,
-            retrieved_blogs=blog_ids,
+            retrieved_content_ids=retrieved_ids["content_ids"],
+            retrieved_projects=retrieved_ids["project_ids"],
+            retrieved_blogs=retrieved_ids["blog_ids"],
             ai_response=final_answer,
             recommended_blog_links=blog_links,
             response_time_ms=int(response_time),
@@ -887,28 +1521,46 @@ A: 죄송합니다. 현재 저희가 보유한 자료에는 블록체인 관련
         """컨텐츠 해시 생성 (변경 감지용)"""
         return hashlib.sha256(content.encode()).hexdigest()
 
+    def reindex_stale_content(self) -> Dict[str, Any]:
+        """needs_update 로 표시된 (또는 아직 색인되지 않은) 문서만 배치로 다시 임베딩"""
+        return ContentIndexer(self, stale_only=True).run()
+
+    def remove_content(self, content_type: str, content_ids: List[str]):
+        """삭제/비활성화된 원본의 벡터와 ChromaVector 행 제거"""
+        vectors = ChromaVector.objects.filter(
+            collection_name=self.collection_name, content_type=content_type, content_id__in=content_ids
+        )
+        vector_ids = [
+            chunk_id
+            for vector_id, chunk_count in vectors.values_list("vector_id", "chunk_count")
+            for chunk_id in chunk_vector_ids(vector_id, chunk_count)
+        ]
+        if vector_ids:
+            self.vector_store.delete(ids=vector_ids)
+            self.vector_store.persist()
+            self.publish_vector_snapshot()
+        vectors.delete()
+        print(f"🗑️ 벡터 삭제: {content_type} {len(vector_ids)}개")
+
     def update_single_content(self, content_id: str, content_type: str):
         """특정 컨텐츠 하나만 업데이트"""
-        if content_type == "company_content":
-            content = CompanyContent.objects.get(id=content_id)
-            self._embed_company_content(content)
-        elif content_type == "project":
-            project = Project.objects.get(id=content_id)
-            self._embed_project(project)
-        elif content_type == "blog_post":
-            blog = BlogPost.objects.get(id=content_id)
-            self._embed_blog_post(blog)
+        return ContentIndexer(self, force=True).run(content_ids={content_type: [str(content_id)]})
 
     def add_custom_examples(self, question_type: str, examples: List[Dict]):
-        """동적으로 새로운 예시 추가"""
-        if question_type == "company":
-            self.company_examples.extend(examples)
-        elif question_type == "project":
-            self.project_examples.extend(examples)
-        elif question_type == "tech":
-            self.tech_examples.extend(examples)
-        elif question_type == "general":
-            self.general_examples.extend(examples)
+        """동적으로 새로운 예시 추가
+
+        서비스 인스턴스가 여러 스레드에서 공유되므로 리스트를 제자리에서 수정하지 않고
+        새 리스트로 교체한다 (읽는 쪽은 락 없이 항상 완전한 리스트를 보게 됨).
+        """
+        with self._examples_lock:
+            if question_type == "company":
+                self.company_examples = self.company_examples + examples
+            elif question_type == "project":
+                self.project_examples = self.project_examples + examples
+            elif question_type == "tech":
+                self.tech_examples = self.tech_examples + examples
+            elif question_type == "general":
+                self.general_examples = self.general_examples + examples
 
     def get_question_type_stats(self, days: int = 7) -> Dict[str, int]:
         """최근 N일간 질문 유형별 통계"""
@@ -928,6 +1580,72 @@ A: 죄송합니다. 현재 저희가 보유한 자료에는 블록체인 관련
         return stats
 
 
+# =================== 프로세스 단위 싱글톤 ===================
+
+_service = None
+_service_pid = None
+_service_lock = threading.Lock()
+_stats_flush_registered = False
+
+# 하위 검색어별 벡터 검색을 병렬로 실행하는 스레드 풀 - 스레드는 fork 를 넘어가지 않으므로 프로세스마다 처음 쓸 때 만든다
+_search_executor = None
+_search_executor_lock = threading.Lock()
+
+
+def search_executor() -> ThreadPoolExecutor:
+    """이 프로세스의 벡터 검색 스레드 풀 (gunicorn --preload 마스터에서 import 해도 만들지 않는다)"""
+    global _search_executor
+
+    if _search_executor is None:
+        with _search_executor_lock:
+            if _search_executor is None:
+                _search_executor = ThreadPoolExecutor(
+                    max_workers=settings.CHATBOT_SEARCH_CONCURRENCY, thread_name_prefix="vector-search"
+                )
+    return _search_executor
+
+
+def get_chatbot_service() -> CompanyChatbotService:
+    """프로세스당 하나의 챗봇 서비스를 반환
+
+    OpenAI 클라이언트/크로마 클라이언트/Few-shot 예시는 요청마다 만들지 않고 워커 프로세스에서 한 번만 생성한다.
+    생성한 프로세스의 pid를 함께 기억해 두므로 gunicorn --preload 로 fork 된 워커가
+    마스터 프로세스의 클라이언트(소켓, SQLite 연결)를 물려받아 쓰는 일은 없다.
+    """
+    global _service, _service_pid, _stats_flush_registered
+
+    pid = os.getpid()
+    if _service is None or _service_pid != pid:
+        with _service_lock:
+            if _service is None or _service_pid != pid:
+                _service = CompanyChatbotService()
+                _service_pid = pid
+                if not _stats_flush_registered:
+                    atexit.register(_flush_relevance_stats)
+                    _stats_flush_registered = True
+    return _service
+
+
+def _flush_relevance_stats():
+    """종료 시 이 프로세스가 만든 서비스의 남은 검색 통계를 반영 (fork 로 물려받은 부모의 값은 반영하지 않는다)"""
+    if _service is not None and _service_pid == os.getpid():
+        _service.relevance_stats.flush()
+
+
+def _reset_chatbot_service_after_fork():
+    """fork 직후 자식 프로세스에서 부모의 서비스/락/검색 스레드 풀 상태를 버린다"""
+    global _service, _service_pid, _service_lock, _search_executor, _search_executor_lock
+
+    _service = None
+    _service_pid = None
+    _service_lock = threading.Lock()
+    _search_executor = None
+    _search_executor_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_chatbot_service_after_fork)
+
+
 # =================== 사용 예시 ===================
 
 
@@ -0,0 +1,148 @@
+# 벡터 저장소 / ChromaVector / 원본 테이블 정합성 검사 - 고아 벡터 삭제, 누락/오래된 벡터 재임베딩
+
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from app.chat_bot.chunking import chunk_vector_ids
+from app.chat_bot.indexing import ContentIndexer
+from app.chat_bot.lexical_index import VECTOR_ID_PREFIXES
+from app.chat_bot.models import ContentChange
+from app.knowledge_document.models import ChromaVector
+
+# 벡터 저장소 삭제 / DB 삭제를 나눠 보낼 크기
+DELETE_BATCH_SIZE = 5000
+
+
+def _batched(values: List, size: int = DELETE_BATCH_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+_CONTENT_TYPES_BY_PREFIX = {prefix: content_type for content_type, prefix in VECTOR_ID_PREFIXES.items()}
+
+
+def _vector_key(vector_id: str) -> Optional[Tuple[str, str]]:
+    """벡터 id ("project_<id>#2" 등) → (원본 유형, 원본 id)"""
+    prefix, _, content_id = vector_id.split("#", 1)[0].partition("_")
+    content_type = _CONTENT_TYPES_BY_PREFIX.get(prefix)
+    return (content_type, content_id) if content_type and content_id else None
+
+
+def _busy_keys() -> Set[Tuple[str, str]]:
+    """아웃박스/색인 작업이 처리 중일 수 있는 원본 - 아웃박스에 변경이 남아 있거나 최근에 수정된 원본
+
+    아웃박스 변경 행은 벡터와 ChromaVector 행을 모두 쓴 뒤에 지워지므로, 비교 시점에 처리 중이던 원본은
+    변경 행이 남아 있거나 (방금 끝났다면) updated_at 이 유예 시간 안에 있다.
+    """
+    busy = {
+        (content_type, str(content_id))
+        for content_type, content_id in ContentChange.objects.values_list("content_type", "content_id")
+    }
+    recent = timezone.now() - timedelta(seconds=settings.CHATBOT_RECONCILE_GRACE_SECONDS)
+    for content_type, queryset in ContentIndexer.sources().items():
+        busy.update(
+            (content_type, str(content_id))
+            for content_id in queryset.filter(updated_at__gte=recent).values_list("id", flat=True)
+        )
+    return busy
+
+
+def reconcile_vectors(service, dry_run: bool = False) -> Dict[str, Any]:
+    """벡터 id 집합, ChromaVector 행, 살아있는 원본 id 집합을 집합 연산으로 비교
+
+    - dead_rows: 원본이 삭제/비활성화된 ChromaVector 행 → 행과 벡터 삭제
+    - orphan_vectors: 살아있는 행 어디에도 속하지 않는 벡터 (행 없는 벡터, 줄어든 청크 등) → 삭제
+    - missing_vectors: 행은 있는데 벡터가 (일부) 없는 원본 → needs_update 표시 후 재임베딩
+    - unindexed: 행이 없는 살아있는 원본 → 재임베딩
+    - stale: needs_update 로 표시되어 있던 행 → 재임베딩
+    ChromaVector 행은 사용 중인 컬렉션(service.collection_name)의 것만 본다.
+    원본 본문을 읽거나 문서를 만들지 않고 id 만 비교하므로 10만 개 규모에서도 몇 초 안에 끝난다.
+
+    아웃박스 처리/색인과 동시에 실행될 수 있으므로, 비교가 끝난 뒤 처리 중일 수 있는 원본(_busy_keys)의
+    고아 벡터/벡터 누락/미색인은 건드리지 않고 다음 검사로 넘긴다.
+    """
+    started = time.perf_counter()
+    service.sync_live_collection(force=True)
+    # 스냅샷 저장소는 쓰기 대상(primary)과 비교한다
+    vector_store = getattr(service.vector_store, "primary", service.vector_store)
+    rows = ChromaVector.objects.filter(collection_name=service.collection_name)
+
+    # 색인은 벡터 → 행 순서로 쓰고 원본은 행보다 먼저 생기므로, 벡터 → 행 → 원본 순서로 읽어야
+    # 읽는 도중 새로 색인된 원본이 "죽은 행" 으로 보이지 않는다
+    store_ids: Set[str] = set(vector_store.get(include=[])["ids"])
+    row_values = list(rows.values_list("pk", "content_type", "content_id", "vector_id", "chunk_count", "needs_update"))
+    live: Set[Tuple[str, str]] = {
+        (content_type, str(content_id))
+        for content_type, queryset in ContentIndexer.sources().items()
+        for content_id in queryset.values_list("id", flat=True)
+    }
+    busy = _busy_keys()
+
+    expected_ids: Set[str] = set()
+    indexed: Set[Tuple[str, str]] = set()
+    dead_row_ids, missing_keys, stale = [], [], 0
+    for pk, content_type, content_id, vector_id, chunk_count, needs_update in row_values:
+        key = (content_type, str(content_id))
+        if key not in live:
+            dead_row_ids.append(pk)
+            continue
+        indexed.add(key)
+        ids = chunk_vector_ids(vector_id, chunk_count)
+        expected_ids.update(ids)
+        if needs_update:
+            stale += 1
+        elif not store_ids.issuperset(ids) and key not in busy:
+            missing_keys.append(key)
+
+    orphan_ids, skipped_orphans = [], 0
+    for vector_id in sorted(store_ids - expected_ids):
+        if _vector_key(vector_id) in busy:
+            skipped_orphans += 1
+        else:
+            orphan_ids.append(vector_id)
+    unindexed = live - indexed - busy
+
+    report = {
+        "store_vectors": len(store_ids),
+        "rows": len(indexed) + len(dead_row_ids),
+        "live_documents": len(live),
+        "orphan_vectors": len(orphan_ids),
+        "dead_rows": len(dead_row_ids),
+        "missing_vectors": len(missing_keys),
+        "unindexed": len(unindexed),
+        "stale": stale,
+        "skipped_busy_vectors": skipped_orphans,
+        "reembedded": 0,
+        "dry_run": dry_run,
+    }
+
+    if not dry_run:
+        for batch in _batched(orphan_ids):
+            vector_store.delete(ids=batch)
+        for batch in _batched(dead_row_ids):
+            rows.filter(pk__in=batch).delete()
+
+        for content_type in {content_type for content_type, _ in missing_keys}:
+            content_ids = [content_id for key_type, content_id in missing_keys if key_type == content_type]
+            for batch in _batched(content_ids):
+                rows.filter(content_type=content_type, content_id__in=batch).update(needs_update=True)
+
+        if orphan_ids:
+            service.vector_store.persist()
+            service.publish_vector_snapshot()
+        if missing_keys or unindexed or stale:
+            report["reembedded"] = service.reindex_stale_content()["embedded"]
+
+    report["elapsed_seconds"] = time.perf_counter() - started
+    print(
+        f"🧹 벡터 정합성 검사{' (dry-run)' if dry_run else ''}: 벡터 {report['store_vectors']}개, "
+        f"고아 벡터 {report['orphan_vectors']}개, 죽은 행 {report['dead_rows']}개, "
+        f"벡터 누락 {report['missing_vectors']}개, 미색인 {report['unindexed']}개, 재임베딩 대기 {report['stale']}개, "
+        f"처리 중이라 건너뛴 벡터 {report['skipped_busy_vectors']}개 "
+        f"({report['elapsed_seconds']:.1f}s)"
+    )
+    return report
@@ -0,0 +1,31 @@
+# 검색 점수 컷오프 - 질문과 충분히 가까운 원본만 프롬프트에 넣고, 남길 개수(k)는 점수 분포에 맞춘다
+# 점수는 벡터 저장소가 돌려주는 코사인 유사도 (값이 클수록 유사)
+
+from typing import Dict, Hashable, List
+
+from django.conf import settings
+
+
+def relevance_cutoff(scores: Dict[Hashable, float], k: int) -> List[Hashable]:
+    """원본별 최고 유사도 → 남길 원본 키 목록 (유사도 높은 순, 최대 k 개)
+
+    1. CHATBOT_RETRIEVAL_MIN_SCORE 미만은 버린다 (질문과 무관한 문서)
+    2. 1위보다 CHATBOT_RETRIEVAL_RELATIVE_SCORE_GAP 비율 이상 낮은 문서는 버린다
+    3. 남은 점수 중 가장 크게 떨어지는 곳이 CHATBOT_RETRIEVAL_SCORE_DROP 이상이면 그 앞에서 자른다
+    2, 3 단계로는 CHATBOT_RETRIEVAL_MIN_K 개 미만으로 줄이지 않는다.
+    """
+    ranked = sorted(scores, key=scores.get, reverse=True)[:k]
+    ranked = [key for key in ranked if scores[key] >= settings.CHATBOT_RETRIEVAL_MIN_SCORE]
+    if not ranked:
+        return []
+
+    min_k = min(settings.CHATBOT_RETRIEVAL_MIN_K, len(ranked))
+    floor = scores[ranked[0]] * (1 - settings.CHATBOT_RETRIEVAL_RELATIVE_SCORE_GAP)
+    ranked = ranked[: max(min_k, sum(1 for key in ranked if scores[key] >= floor))]
+
+    drops = [(scores[ranked[i - 1]] - scores[ranked[i]], i) for i in range(max(min_k, 1), len(ranked))]
+    if drops:
+        drop, position = max(drops, key=lambda item: item[0])
+        if drop >= settings.CHATBOT_RETRIEVAL_SCORE_DROP:
+            ranked = ranked[:position]
+    return ranked
@@ -0,0 +1,109 @@
+# 질문 유형별 검색 계획 - 어떤 메타데이터 필터로 몇 개씩 찾을지
+# 필터는 크로마 where 문법으로 바꿔 벡터 인덱스 안에서 점수 계산 전에 적용한다.
+
+from typing import Any, Dict, List, Optional
+
+from app.chat_bot.lexical_index import keyword_tokens
+
+# searches 의 결과는 하위 검색어별 결과와 함께 RRF 로 병합되고 최종 k 개만 남는다.
+# match_technologies: 질문에 나온 영문 키워드(기술명)를 사용 기술로 가진 프로젝트만 찾는다.
+RETRIEVAL_PLANS = {
+    "company": {
+        "k": 6,
+        "searches": [{"filters": {"source_type": ["company_content"]}, "k": 6}],
+    },
+    "project": {
+        "k": 8,
+        "searches": [
+            {"filters": {"source_type": ["project", "blog_post"]}, "k": 8},
+            # 포트폴리오 대표 프로젝트는 질문과 가까운 것부터 함께 찾는다
+            {"filters": {"source_type": ["project"], "is_highlight": True}, "k": 3},
+        ],
+    },
+    "tech": {
+        "k": 8,
+        "searches": [
+            {"filters": {"source_type": ["project"], "match_technologies": True}, "k": 5},
+            {"filters": {"source_type": ["company_content", "blog_post"]}, "k": 5},
+        ],
+    },
+    "general": {
+        "k": 10,
+        "searches": [{"filters": {}, "k": 10}],
+    },
+}
+
+_LIST_FILTER_KEYS = ("source_type", "content_type", "project_type")
+
+
+def tech_flag(token: str) -> str:
+    """사용 기술 메타데이터 키 (크로마 메타데이터는 리스트를 담을 수 없어 기술마다 불리언 플래그로 저장)"""
+    return "tech_" + token.replace("+", "p").replace("#", "sharp")
+
+
+def technology_flags(technologies: List[str]) -> Dict[str, bool]:
+    """프로젝트 메타데이터에 넣을 사용 기술 플래그 - 질문과 같은 방식(keyword_tokens)으로 나눈다"""
+    return {tech_flag(token): True for technology in technologies or [] for token in keyword_tokens(technology)}
+
+
+def build_where(filters: Dict[str, Any]) -> Optional[dict]:
+    """source_type / content_type / project_type / is_highlight / technologies 필터 → 크로마 where"""
+    clauses = []
+    for key in _LIST_FILTER_KEYS:
+        values = filters.get(key)
+        if values:
+            clauses.append({key: {"$in": list(values)}} if len(values) > 1 else {key: values[0]})
+    if filters.get("is_highlight") is not None:
+        clauses.append({"is_highlight": filters["is_highlight"]})
+
+    flags = [tech_flag(token) for token in filters.get("technologies") or []]
+    if len(flags) > 1:
+        clauses.append({"$or": [{flag: True} for flag in flags]})
+    elif flags:
+        clauses.append({flags[0]: True})
+
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def matches(metadata: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """build_where 와 같은 조건을 파이썬에서 검사 (키워드 검색 결과 거르기용)"""
+    for key in _LIST_FILTER_KEYS:
+        if filters.get(key) and metadata.get(key) not in filters[key]:
+            return False
+    if filters.get("is_highlight") is not None and metadata.get("is_highlight") != filters["is_highlight"]:
+        return False
+    if filters.get("technologies") and not any(metadata.get(tech_flag(t)) for t in filters["technologies"]):
+        return False
+    return True
+
+
+class RetrievalPlan:
+    """질문 하나의 검색 계획 - searches 는 (필터, where, k) 목록"""
+
+    __slots__ = ("question_type", "k", "searches")
+
+    def __init__(self, question_type: str, k: int, searches: List[tuple]):
+        self.question_type = question_type
+        self.k = k
+        self.searches = searches
+
+    def allows(self, metadata: Dict[str, Any]) -> bool:
+        return any(matches(metadata, filters) for filters, _, _ in self.searches)
+
+    def __repr__(self):
+        return f"RetrievalPlan({self.question_type}, k={self.k}, searches={[where for _, where, _ in self.searches]})"
+
+
+def retrieval_plan(question_type: str, question: str) -> RetrievalPlan:
+    plan = RETRIEVAL_PLANS.get(question_type) or RETRIEVAL_PLANS["general"]
+    technologies = [token for token in keyword_tokens(question) if not token.isdigit()]
+
+    searches = []
+    for search in plan["searches"]:
+        filters = dict(search["filters"])
+        if filters.pop("match_technologies", False) and technologies:
+            filters["technologies"] = technologies
+        searches.append((filters, build_where(filters), search["k"]))
+    return RetrievalPlan(question_type, plan["k"], searches)
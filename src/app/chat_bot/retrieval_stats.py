@@ -0,0 +1,101 @@
+# 검색 통계 - 원본별 검색 횟수/평균 유사도를 프로세스 메모리에 모았다가 주기적으로 한 번에 DB 에 반영한다
+
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Hashable, List, Tuple
+
+from django.db import DatabaseError, connection
+from django.db.models import Case, F, FloatField, IntegerField, Q, Value, When
+from django.db.models.functions import Coalesce
+
+from app.knowledge_document.models import ChromaVector
+
+
+class RelevanceStatsBuffer:
+    """질문마다 UPDATE 하지 않도록 (컬렉션, 원본 유형, 원본 id) → [검색 횟수, 유사도 합] 으로 모아 둔다
+
+    record() 는 메모리에만 쌓고, flush_interval 이 지나면 백그라운드 스레드가 컬렉션별 UPDATE 한 번으로 반영한다.
+    (셀러리 작업/크론은 다른 프로세스라 이 메모리를 볼 수 없으므로 각 프로세스가 직접 비운다)
+    반영에 실패한 값은 버리지 않고 다음 반영 때 다시 시도한다.
+    """
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self._pending: Dict[Tuple[str, str, str], List[float]] = defaultdict(lambda: [0, 0.0])
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+
+    def record(self, collection_name: str, similarities: Dict[Hashable, float]):
+        """similarities: (원본 유형, 원본 id) → 이번 질문에서의 코사인 유사도"""
+        now = time.monotonic()
+        with self._lock:
+            for (content_type, content_id), score in similarities.items():
+                stats = self._pending[(collection_name, content_type, content_id)]
+                stats[0] += 1
+                stats[1] += score
+            due = now - self._flushed_at >= self.flush_interval
+            if due:
+                self._flushed_at = now
+
+        if due and not self._flush_lock.locked():
+            threading.Thread(target=self._flush_in_background, name="relevance-stats-flush", daemon=True).start()
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        finally:
+            connection.close()
+
+    def flush(self):
+        """모아 둔 통계를 DB 에 반영 (워커 종료 시에도 호출)"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, defaultdict(lambda: [0, 0.0])
+            if not pending:
+                return
+
+            by_collection = defaultdict(dict)
+            for (collection_name, content_type, content_id), stats in pending.items():
+                by_collection[collection_name][(content_type, content_id)] = stats
+
+            for collection_name, stats in by_collection.items():
+                try:
+                    self._apply(collection_name, stats)
+                except DatabaseError as e:
+                    print(f"⚠️ 검색 점수 기록 실패 (다음 반영 때 재시도): {e}")
+                    self._restore(collection_name, stats)
+
+    def _restore(self, collection_name: str, stats: Dict[Tuple[str, str], List[float]]):
+        with self._lock:
+            for (content_type, content_id), (count, total) in stats.items():
+                pending = self._pending[(collection_name, content_type, content_id)]
+                pending[0] += count
+                pending[1] += total
+
+    @staticmethod
+    def _apply(collection_name: str, stats: Dict[Tuple[str, str], List[float]]):
+        """원본별 새 평균을 Case/When 으로 계산해 UPDATE 한 번으로 반영
+
+        새 평균 = (기존 평균 * 기존 횟수 + 유사도 합) / (기존 횟수 + 이번 횟수)
+        UPDATE 의 SET 식은 모두 갱신 전 행 값으로 계산된다.
+        """
+        matches = [Q(content_type=content_type, content_id=content_id) for content_type, content_id in stats]
+        counts = Case(
+            *(When(match, then=Value(count)) for match, (count, _) in zip(matches, stats.values())),
+            output_field=IntegerField(),
+        )
+        totals = Case(
+            *(When(match, then=Value(total)) for match, (_, total) in zip(matches, stats.values())),
+            output_field=FloatField(),
+        )
+        condition = matches[0]
+        for match in matches[1:]:
+            condition |= match
+
+        ChromaVector.objects.filter(condition, collection_name=collection_name).update(
+            avg_relevance_score=(Coalesce(F("avg_relevance_score"), Value(0.0)) * F("retrieval_count") + totals)
+            / (F("retrieval_count") + counts),
+            retrieval_count=F("retrieval_count") + counts,
+        )
@@ -1,2 +1,74 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
+
+from app.chat_bot.answer_cache import bump_document_version, bump_kb_version
+from app.chat_bot.outbox import record_change
+from app.knowledge_document.models import BlogPost, CompanyContent, Project
+
+CONTENT_TYPES = {CompanyContent: "company_content", Project: "project", BlogPost: "blog_post"}
+
+
+@receiver(post_save, sender=CompanyContent)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=CompanyContent)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=BlogPost)
+def invalidate_answer_caches(sender, instance, **kwargs):
+    """지식베이스가 바뀌면 버전을 올려 이전 버전으로 캐시된 답변을 무효화"""
+    document_id = str(instance.pk)
+    transaction.on_commit(bump_kb_version)
+    transaction.on_commit(lambda: bump_document_version(document_id))
+
+
+def schedule_outbox_drain():
+    from app.chat_bot.tasks import schedule_outbox_drain
+
+    try:
+        schedule_outbox_drain()
+    except Exception as e:
+        print(f"⚠️ 아웃박스 처리 예약 실패: {e}")
+
+
+@receiver(post_save, sender=CompanyContent)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=CompanyContent)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=BlogPost)
+def record_content_change(sender, instance, **kwargs):
+    """원본 수정과 같은 트랜잭션에 변경을 기록하고 커밋 후 (debounce 된) 색인 작업을 예약
+
+    삭제/비활성화 여부는 처리 시점의 DB 상태로 판단하므로 저장과 삭제를 구분하지 않는다.
+    """
+    record_change(CONTENT_TYPES[sender], instance.pk)
+    transaction.on_commit(schedule_outbox_drain)
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(pre_delete, sender=BlogPost)
+def record_related_project_changes(sender, instance, **kwargs):
+    """프로젝트 카드에 저장된 관련 블로그 링크가 바뀌므로 연결된 프로젝트도 아웃박스에 기록 (카드는 색인 작업이 다시 만든다)
+
+    삭제 후에는 연결된 프로젝트를 알 수 없으므로 삭제 전에 조회한다.
+    """
+    for project_id in instance.related_projects.values_list("id", flat=True):
+        record_change("project", project_id)
+
+
+@receiver(m2m_changed, sender=BlogPost.related_projects.through)
+def invalidate_answer_caches_on_related_projects(sender, instance, action, pk_set, reverse, **kwargs):
+    if not action.startswith("post_"):
+        return
+
+    document_ids = [str(instance.pk)] + [str(pk) for pk in pk_set or []]
+    transaction.on_commit(bump_kb_version)
+    transaction.on_commit(lambda: [bump_document_version(document_id) for document_id in document_ids])
+
+    # 프로젝트 카드에 저장된 관련 블로그 목록은 색인 작업이 다시 만든다
+    project_ids = [instance.pk] if reverse else list(pk_set or [])
+    for project_id in project_ids:
+        record_change("project", project_id)
+    if project_ids:
+        transaction.on_commit(schedule_outbox_drain)
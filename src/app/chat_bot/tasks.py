@@ -1 +1,52 @@
 from celery import shared_task
+from django.conf import settings
+from django.core.cache import caches
+
+DRAIN_SCHEDULED_CACHE_KEY = "chat_bot:outbox_drain_scheduled"
+SNAPSHOT_EXPORT_SCHEDULED_CACHE_KEY = "chat_bot:snapshot_export_scheduled"
+
+
+def schedule_outbox_drain():
+    """아웃박스 처리 예약 - debounce 시간 안에 들어온 편집들은 한 번의 배치 작업으로 처리
+
+    워커들이 공유하는 캐시에 예약 표시를 add 로 남겨 이미 예약된 작업이 있으면 새로 보내지 않는다.
+    (브로커 전송이 실패해 작업이 유실되더라도 변경은 아웃박스에 남아 있어 다음 예약이나 크론에서 처리된다)
+    """
+    countdown = settings.CHATBOT_REINDEX_DEBOUNCE_SECONDS
+    if caches[settings.CHATBOT_CACHE_ALIAS].add(DRAIN_SCHEDULED_CACHE_KEY, True, timeout=countdown * 2 + 60):
+        drain_content_outbox.apply_async(countdown=countdown)
+
+
+@shared_task
+def drain_content_outbox():
+    from app.chat_bot.outbox import drain_changes
+    from app.chat_bot.rag_service import get_chatbot_service
+
+    # 실행 중에 들어온 편집은 다음 작업으로 예약되도록 먼저 표시를 지운다
+    caches[settings.CHATBOT_CACHE_ALIAS].delete(DRAIN_SCHEDULED_CACHE_KEY)
+    return drain_changes(get_chatbot_service())
+
+
+def schedule_snapshot_export():
+    """벡터 스냅샷 내보내기 예약 - debounce 시간 안의 쓰기들을 한 번의 내보내기로 모은다"""
+    countdown = settings.CHATBOT_VECTOR_SNAPSHOT_EXPORT_DEBOUNCE_SECONDS
+    if caches[settings.CHATBOT_CACHE_ALIAS].add(SNAPSHOT_EXPORT_SCHEDULED_CACHE_KEY, True, timeout=countdown * 2 + 60):
+        export_vector_snapshot.apply_async(countdown=countdown)
+
+
+@shared_task
+def export_vector_snapshot():
+    from app.chat_bot.rag_service import get_chatbot_service
+
+    caches[settings.CHATBOT_CACHE_ALIAS].delete(SNAPSHOT_EXPORT_SCHEDULED_CACHE_KEY)
+    service = get_chatbot_service()
+    service.sync_live_collection(force=True)
+    return service.publish_vector_snapshot(now=True)
+
+
+@shared_task
+def reconcile_vector_store():
+    from app.chat_bot.rag_service import get_chatbot_service
+    from app.chat_bot.reconcile import reconcile_vectors
+
+    return reconcile_vectors(get_chatbot_service())
@@ -0,0 +1,118 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from app.chat_bot.answer_cache import (
+    AnswerCache,
+    SemanticAnswerCache,
+    bump_document_version,
+    bump_kb_version,
+    get_document_versions,
+    get_kb_version,
+)
+from config.router import Router
+
+
+class AnswerCacheTest(TestCase):
+    def test_kb_version_bump_changes_exact_cache_key(self):
+        # given
+        cache = AnswerCache(max_size=10, ttl_seconds=60)
+        cache.set(AnswerCache.make_key("회사 소개해줘?", get_kb_version()), {"answer": "소개"})
+        self.assertEqual(cache.get(AnswerCache.make_key("회사  소개해줘", get_kb_version())), {"answer": "소개"})
+
+        # when
+        bump_kb_version()
+
+        # then
+        self.assertIsNone(cache.get(AnswerCache.make_key("회사 소개해줘", get_kb_version())))
+
+    def test_evicts_least_recently_used(self):
+        # given
+        cache = AnswerCache(max_size=2, ttl_seconds=60)
+        cache.set("a", {"answer": "a"})
+        cache.set("b", {"answer": "b"})
+        cache.get("a")
+
+        # when
+        cache.set("c", {"answer": "c"})
+
+        # then
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), {"answer": "a"})
+
+    def test_expired_entry_is_a_miss(self):
+        # given
+        cache = AnswerCache(max_size=10, ttl_seconds=60)
+        cache.set("a", {"answer": "a"})
+
+        # when
+        with mock.patch("app.chat_bot.answer_cache.time.monotonic", return_value=10**9):
+            result = cache.get("a")
+
+        # then
+        self.assertIsNone(result)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+
+class SemanticAnswerCacheTest(TestCase):
+    def test_paraphrased_question_hits(self):
+        # given
+        cache = SemanticAnswerCache(max_size=10, threshold=0.9, ttl_seconds=60)
+        cache.add([1.0, 0.0], {"answer": "파이썬"}, get_document_versions(["document-1"]), frozenset({"python"}))
+
+        # when
+        close = cache.lookup([1.0, 0.1], frozenset({"python"}))
+        far = cache.lookup([0.0, 1.0], frozenset({"python"}))
+
+        # then
+        self.assertEqual(close, {"answer": "파이썬"})
+        self.assertIsNone(far)
+
+    def test_document_version_bump_invalidates_semantic_entry(self):
+        # given
+        cache = SemanticAnswerCache(max_size=10, threshold=0.9, ttl_seconds=60)
+        cache.add([1.0, 0.0], {"answer": "파이썬"}, get_document_versions(["document-1"]), frozenset({"python"}))
+        self.assertEqual(cache.lookup([1.0, 0.0], frozenset({"python"})), {"answer": "파이썬"})
+
+        # when
+        bump_document_version("document-1")
+
+        # then
+        self.assertIsNone(cache.lookup([1.0, 0.0], frozenset({"python"})))
+
+    def test_edit_during_answer_generation_invalidates_entry(self):
+        # given - 검색 시점의 버전을 기록한 뒤 답변 생성 중에 문서가 수정됨
+        document_versions = get_document_versions(["document-1"])
+        bump_document_version("document-1")
+
+        # when
+        cache = SemanticAnswerCache(max_size=10, threshold=0.9, ttl_seconds=60)
+        cache.add([1.0, 0.0], {"answer": "이전 내용"}, document_versions, frozenset())
+
+        # then
+        self.assertIsNone(cache.lookup([1.0, 0.0]))
+
+    def test_semantic_hit_requires_same_keywords(self):
+        # given
+        cache = SemanticAnswerCache(max_size=10, threshold=0.9, ttl_seconds=60)
+        cache.add([1.0, 0.0], {"answer": "파이썬"}, {}, frozenset({"python"}))
+
+        # when
+        result = cache.lookup([1.0, 0.01], frozenset({"java"}))
+
+        # then
+        self.assertIsNone(result)
+
+
+class CacheTableRoutingTest(SimpleTestCase):
+    def test_cache_table_is_read_from_primary(self):
+        # given - 읽기 복제본이 있는 운영 설정
+        router = Router()
+        cache_entry = mock.Mock(_meta=mock.Mock(app_label="django_cache"))
+
+        # when
+        with mock.patch.object(Router, "databases", {"default": {}, "reader": {"NAME": "reader"}}):
+            database = router.db_for_read(cache_entry)
+
+        # then - 예약 표시(cache.add)를 쓰자마자 읽으므로 복제 지연이 없는 primary
+        self.assertEqual(database, "default")
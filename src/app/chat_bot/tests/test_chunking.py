@@ -0,0 +1,109 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+from langchain.schema import Document
+
+from app.chat_bot.chunking import chunk_document, chunk_vector_ids, split_into_chunks, split_sentences
+from app.chat_bot.indexing import ContentIndexer
+from app.chat_bot.tests.test_rag_service import STUB_SERVICE_SETTINGS, build_stub_service
+from app.knowledge_document.models import Category, ChromaVector, CompanyContent
+
+
+class ChunkDocumentTest(SimpleTestCase):
+    BODY = " ".join(f"{i}번째 문장입니다." for i in range(40))
+
+    def test_chunks_respect_size_and_overlap(self):
+        # when
+        chunks = split_into_chunks(self.BODY, chunk_size=100, chunk_overlap=30)
+
+        # then
+        self.assertGreater(len(chunks), 1)
+        for previous, chunk in zip(chunks, chunks[1:]):
+            self.assertLessEqual(len(chunk), 100)
+            # 이웃 청크는 경계의 문장을 함께 가진다
+            self.assertIn(split_sentences(previous)[-1], split_sentences(chunk))
+            self.assertIn(split_sentences(chunk)[0], split_sentences(previous))
+        self.assertIn("39번째 문장입니다.", chunks[-1])
+
+    def test_long_sentence_is_split(self):
+        chunks = split_into_chunks("가" * 250, chunk_size=100, chunk_overlap=20)
+        self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+
+    def test_short_body_is_not_chunked(self):
+        document = Document(page_content="제목: 짧은 글", metadata={"title": "짧은 글"})
+        self.assertEqual(chunk_document("blog_1", document, "짧은 글", 100, 20, render=str), [("blog_1", document)])
+
+    def test_chunk_documents_render_chunk_in_body_slot(self):
+        # given - 제목과 본문이 같은 문자열로 시작해도 본문 자리에만 청크가 들어가야 한다
+        document = Document(page_content=f"제목: {self.BODY}\n내용: {self.BODY}", metadata={"title": "제목"})
+
+        # when
+        documents = chunk_document(
+            "company_1", document, self.BODY, 100, 30, render=lambda chunk: f"제목: 고정\n내용: {chunk}"
+        )
+
+        # then
+        self.assertEqual(documents[0][0], "company_1")
+        self.assertEqual(documents[1][0], "company_1#1")
+        for index, (_, chunk_document_) in enumerate(documents):
+            metadata = chunk_document_.metadata
+            self.assertEqual(chunk_document_.page_content, f"제목: 고정\n내용: {metadata['chunk_text']}")
+            self.assertEqual((metadata["parent_id"], metadata["chunk_index"]), ("company_1", index))
+            self.assertEqual(metadata["chunk_count"], len(documents))
+
+
+@override_settings(**STUB_SERVICE_SETTINGS, CHATBOT_CHUNK_SIZE=100, CHATBOT_CHUNK_OVERLAP=30)
+class ChunkIndexingTest(TestCase):
+    def setUp(self) -> None:
+        # given
+        category = Category.objects.create(name="회사 소개", category_type="company_info")
+        self.content = CompanyContent.objects.create(
+            title="회사 연혁",
+            content_type="company_history",
+            category=category,
+            content=" ".join(f"{year}년에 {year - 2000}번째 서비스를 출시했습니다." for year in range(2001, 2021)),
+        )
+        self.service = build_stub_service()
+
+    def _vector_ids(self):
+        return set(self.service.vector_store.get(include=[])["ids"])
+
+    def test_long_content_is_indexed_per_chunk(self):
+        # when
+        ContentIndexer(self.service).run()
+
+        # then - 청크마다 벡터 하나, 원본을 가리키는 parent_id
+        row = ChromaVector.objects.get(content_id=self.content.id)
+        self.assertGreater(row.chunk_count, 1)
+        chunk_ids = chunk_vector_ids(row.vector_id, row.chunk_count)
+        self.assertEqual(self._vector_ids(), set(chunk_ids))
+        metadatas = self.service.vector_store.get(ids=chunk_ids, include=["metadatas"])["metadatas"]
+        self.assertEqual({metadata["parent_id"] for metadata in metadatas}, {row.vector_id})
+
+    def test_shorter_content_removes_leftover_chunks(self):
+        # given
+        ContentIndexer(self.service).run()
+
+        # when
+        self.content.content = "짧은 소개입니다."
+        self.content.save()
+        ContentIndexer(self.service).run()
+
+        # then
+        row = ChromaVector.objects.get(content_id=self.content.id)
+        self.assertEqual(row.chunk_count, 1)
+        self.assertEqual(self._vector_ids(), {row.vector_id})
+
+    def test_matched_chunks_reach_the_prompt(self):
+        # given
+        ContentIndexer(self.service).run()
+        row = ChromaVector.objects.get(content_id=self.content.id)
+        chunk_id = chunk_vector_ids(row.vector_id, row.chunk_count)[-1]
+        chunk = self.service.vector_store.get(ids=[chunk_id], include=["metadatas"])
+
+        # when
+        documents = self.service._get_documents_by_vector_ids([chunk_id])
+        fused = self.service._fuse_search_results([[(documents[0], 0.9)]], k=5)
+        context_info = self.service._analyze_search_results(fused, "2020년에는?")
+
+        # then - 앞부분이 아니라 검색된 청크 본문이 들어간다
+        self.assertIn(chunk["metadatas"][0]["chunk_text"], context_info["context_text"])
+        self.assertIn("2020년", context_info["context_text"])
@@ -0,0 +1,104 @@
+import json
+
+from django.test import TestCase, override_settings
+
+from app.chat_bot.context_cards import CARD_ONLY_METADATA, card_from_metadata, card_from_object, project_card_metadata
+from app.chat_bot.indexing import ContentIndexer
+from app.chat_bot.models import ContentChange
+from app.chat_bot.tests.test_rag_service import STUB_SERVICE_SETTINGS, build_stub_service
+from app.knowledge_document.models import BlogPost, ChromaVector, Project
+
+
+class ContextCardTest(TestCase):
+    def setUp(self) -> None:
+        # given
+        self.project = Project.objects.create(
+            name="쇼핑몰 구축",
+            project_type="e_commerce",
+            description="Django 로 만든 쇼핑몰",
+            technologies_used=["Django", "React"],
+            is_portfolio_highlight=True,
+        )
+        self.blog_post = BlogPost.objects.create(
+            title="쇼핑몰 회고", url="https://blog.example.com/shop", excerpt="쇼핑몰을 만들며 배운 것"
+        )
+        self.blog_post.related_projects.add(self.project)
+
+    def test_project_card_from_metadata_matches_card_from_object(self):
+        # given
+        metadata = {"source_type": "project", "content_id": str(self.project.id), "project_name": self.project.name}
+        metadata.update(project_card_metadata(self.project))
+
+        # when
+        card = card_from_metadata(metadata)
+
+        # then - 검색 시에는 메타데이터만으로 DB 객체로 만든 것과 같은 카드
+        self.assertEqual(card, card_from_object("project", self.project))
+        self.assertIn("🌟 포트폴리오 대표 프로젝트", card["card"])
+        self.assertEqual([blog["title"] for blog in card["related_blogs"]], ["쇼핑몰 회고"])
+
+    def test_matched_chunks_replace_card_with_passages(self):
+        # given
+        metadata = {
+            "source_type": "blog_post",
+            "content_id": str(self.blog_post.id),
+            "title": self.blog_post.title,
+            "url": self.blog_post.url,
+            "context_card": "앞부분 요약",
+            "matched_chunks": json.dumps(["결제 모듈 구현", "배포 자동화"], ensure_ascii=False),
+        }
+
+        # when
+        card = card_from_metadata(metadata)
+
+        # then
+        self.assertEqual(card["card"], "**쇼핑몰 회고**\n결제 모듈 구현\n...\n배포 자동화\nURL: https://blog.example.com/shop")
+        self.assertTrue({"context_card", "matched_chunks"} <= CARD_ONLY_METADATA)
+
+
+@override_settings(**STUB_SERVICE_SETTINGS)
+class ContextCardRefreshTest(TestCase):
+    def setUp(self) -> None:
+        # given
+        self.project = Project.objects.create(name="쇼핑몰 구축", project_type="e_commerce", description="쇼핑몰")
+        self.service = build_stub_service()
+        self.service.embed_all_content()
+
+    def _stored_related_blogs(self):
+        vector_id = ChromaVector.objects.get(content_id=self.project.id).vector_id
+        stored = self.service.vector_store.get(ids=[vector_id], include=["metadatas"])
+        return json.loads(stored["metadatas"][0]["related_blogs"])
+
+    def test_linking_blog_records_project_change(self):
+        # given
+        blog_post = BlogPost.objects.create(title="쇼핑몰 회고", url="https://blog.example.com/shop")
+        ContentChange.objects.all().delete()
+
+        # when
+        blog_post.related_projects.add(self.project)
+
+        # then - 카드의 관련 블로그가 바뀌므로 프로젝트도 다시 색인 대상
+        self.assertEqual(
+            list(ContentChange.objects.values_list("content_type", "content_id")), [("project", self.project.id)]
+        )
+
+    def test_indexer_refreshes_card_without_reembedding(self):
+        # given - 프로젝트 본문은 그대로, 관련 블로그만 추가
+        blog_post = BlogPost.objects.create(title="쇼핑몰 회고", url="https://blog.example.com/shop")
+        blog_post.related_projects.add(self.project)
+
+        # when
+        summary = ContentIndexer(self.service).run(content_types=["project"])
+
+        # then
+        self.assertEqual(summary["embedded"], 0)
+        self.assertEqual(summary["refreshed_cards"], 1)
+        self.assertEqual([blog["title"] for blog in self._stored_related_blogs()], ["쇼핑몰 회고"])
+
+    def test_unchanged_cards_are_not_rewritten(self):
+        # when
+        summary = ContentIndexer(self.service).run()
+
+        # then
+        self.assertEqual(summary["refreshed_cards"], 0)
+        self.assertEqual(summary["skipped"], summary["total"])
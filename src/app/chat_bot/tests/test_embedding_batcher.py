@@ -0,0 +1,74 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase
+
+from app.chat_bot.benchmarks import StubEmbeddings
+from app.chat_bot.embedding_batcher import MicroBatchedEmbeddings
+
+
+class MicroBatchedEmbeddingsTest(SimpleTestCase):
+    def setUp(self) -> None:
+        # given
+        self.embeddings = StubEmbeddings(dimension=8)
+        patcher = mock.patch.object(self.embeddings, "embed_documents", wraps=self.embeddings.embed_documents)
+        self.embed_documents = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _batcher(self, **kwargs):
+        options = {"window_ms": 200, "max_batch_size": 16, "max_latency_ms": 1000}
+        options.update(kwargs)
+        return MicroBatchedEmbeddings(self.embeddings, **options)
+
+    def test_requests_within_window_share_one_call(self):
+        # given
+        batcher = self._batcher()
+
+        # when - 요청 세 개가 창 안에 들어옴
+        futures = [batcher.submit([text]) for text in ["회사 소개", "React 프로젝트", "블로그"]]
+        results = [future.result(timeout=5) for future in futures]
+
+        # then - 결과는 요청별로 나뉘어 돌아간다
+        self.embed_documents.assert_called_once_with(["회사 소개", "React 프로젝트", "블로그"])
+        self.assertEqual(results[1], [self.embeddings.embed_query("React 프로젝트")])
+        stats = batcher.stats()
+        self.assertEqual((stats["requests"], stats["api_calls"], stats["batch_sizes"]), (3, 1, {3: 1}))
+        self.assertAlmostEqual(stats["api_call_reduction"], 2 / 3)
+
+    def test_max_batch_size_flushes_without_waiting(self):
+        # given
+        batcher = self._batcher(window_ms=5000, max_latency_ms=500, max_batch_size=2)
+
+        # when
+        futures = [batcher.submit(["a", "b"]), batcher.submit(["c"])]
+        first = futures[0].result(timeout=2)
+
+        # then - 가득 찬 배치는 바로 보내고, 다음 요청은 지연 상한까지만 기다린다
+        self.assertEqual(len(first), 2)
+        self.assertFalse(futures[1].done())
+        self.assertEqual(len(futures[1].result(timeout=2)), 1)
+        self.assertEqual(self.embed_documents.call_args_list, [mock.call(["a", "b"]), mock.call(["c"])])
+
+    def test_error_is_raised_to_every_request(self):
+        # given
+        batcher = self._batcher(window_ms=50)
+        self.embed_documents.side_effect = RuntimeError("OpenAI 오류")
+
+        # when
+        futures = [batcher.submit(["a"]), batcher.submit(["b"])]
+
+        # then
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result(timeout=5)
+
+    def test_async_and_empty_requests(self):
+        # given
+        batcher = self._batcher(window_ms=1)
+
+        # when
+        vector = async_to_sync(batcher.aembed_query)("회사 소개")
+
+        # then
+        self.assertEqual(vector, self.embeddings.embed_query("회사 소개"))
+        self.assertEqual(batcher.embed_documents([]), [])
@@ -0,0 +1,88 @@
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase
+
+from app.chat_bot.benchmarks import StubEmbeddings
+from app.chat_bot.embedding_cache import CachedEmbeddings
+
+
+class CachedEmbeddingsTest(SimpleTestCase):
+    def setUp(self) -> None:
+        # given
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.store_path = Path(self.directory.name) / "embeddings.sqlite3"
+        self.embeddings = StubEmbeddings(dimension=8)
+        patcher = mock.patch.object(self.embeddings, "embed_documents", wraps=self.embeddings.embed_documents)
+        self.embed_documents = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _cache(self, max_memory_bytes=1024 * 1024):
+        return CachedEmbeddings(self.embeddings, self.store_path, max_memory_bytes, model_name="stub")
+
+    def test_repeated_question_makes_no_api_call(self):
+        # given
+        cache = self._cache()
+        first = cache.embed_query("회사 소개해줘")
+
+        # when - 공백만 다른 질문
+        second = cache.embed_query(" 회사  소개해줘\n")
+
+        # then
+        self.assertEqual(first, second)
+        self.assertEqual(self.embed_documents.call_count, 1)
+        self.assertEqual(cache.stats()["memory_hits"], 1)
+        self.assertEqual(cache.stats()["hit_ratio"], 0.5)
+
+    def test_batch_embeds_only_missing_texts_once(self):
+        # given
+        cache = self._cache()
+        cache.embed_query("React")
+
+        # when
+        vectors = cache.embed_documents(["React", "Vue", "Vue"])
+
+        # then
+        self.embed_documents.assert_called_with(["Vue"])
+        self.assertEqual(vectors[1], vectors[2])
+        self.assertEqual(cache.stats()["api_calls"], 2)
+
+    def test_other_worker_reads_persistent_store(self):
+        # given - 다른 워커가 임베딩해 둔 질문
+        self._cache().embed_query("회사 소개")
+        self.embed_documents.reset_mock()
+
+        # when
+        cache = self._cache()
+        cache.embed_query("회사 소개")
+
+        # then
+        self.embed_documents.assert_not_called()
+        self.assertEqual(cache.stats()["store_hits"], 1)
+
+    def test_memory_tier_respects_byte_budget(self):
+        # given - 벡터 하나 정도만 들어가는 예산
+        cache = CachedEmbeddings(self.embeddings, None, max_memory_bytes=200, model_name="stub")
+
+        # when
+        cache.embed_documents(["a", "b", "c"])
+
+        # then
+        self.assertLessEqual(cache.stats()["memory_bytes"], 200)
+        self.assertLess(cache.stats()["size"], 3)
+
+    def test_async_embedding_uses_same_cache(self):
+        # given
+        cache = self._cache()
+        cache.embed_query("회사 소개")
+
+        # when
+        with mock.patch.object(self.embeddings, "aembed_documents") as aembed_documents:
+            vector = async_to_sync(cache.aembed_query)("회사 소개")
+
+        # then
+        aembed_documents.assert_not_called()
+        self.assertEqual(vector, cache.embed_query("회사 소개"))
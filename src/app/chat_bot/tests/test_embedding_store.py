@@ -0,0 +1,104 @@
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from app.chat_bot.embedding_store import ContentEmbeddingStore
+from app.chat_bot.indexing import ContentIndexer
+from app.chat_bot.tests.test_rag_service import STUB_SERVICE_SETTINGS, build_stub_service
+from app.chat_bot.vector_stores import NumpyVectorStore
+from app.knowledge_document.models import Project
+
+MODEL = "text-embedding-3-small"
+
+
+def vectors(*keys):
+    return {key: np.full(4, index, dtype=np.float32) for index, key in enumerate(keys, start=1)}
+
+
+class ContentEmbeddingStoreTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.root = Path(self.directory.name)
+
+    def test_other_process_reads_appended_vectors(self):
+        # given - 같은 경로를 쓰는 두 워커
+        writer, reader = ContentEmbeddingStore(self.root), ContentEmbeddingStore(self.root)
+        writer.put_many(MODEL, vectors("a", "b"))
+        reader.get_many(MODEL, ["a"])
+
+        # when
+        writer.put_many(MODEL, vectors("a", "b", "c"))
+
+        # then - 이미 있는 키는 다시 쓰지 않고 새 키만 이어 붙인다
+        found = reader.get_many(MODEL, ["a", "c", "missing"])
+        self.assertEqual(sorted(found), ["a", "c"])
+        np.testing.assert_array_equal(found["c"], np.full(4, 3, dtype=np.float32))
+        self.assertEqual(reader.stats()[MODEL], {"vectors": 3, "dimension": 4, "bytes": 48})
+
+    def test_models_are_stored_separately(self):
+        # given
+        store = ContentEmbeddingStore(self.root)
+        store.put_many(MODEL, vectors("a"))
+
+        # when / then
+        self.assertEqual(store.get_many("text-embedding-3-large", ["a"]), {})
+        with self.assertRaises(ValueError):
+            store.put_many(MODEL, {"b": np.zeros(8, dtype=np.float32)})
+
+    def test_interrupted_write_is_truncated(self):
+        # given - 벡터만 쓰고 키를 쓰기 전에 중단됨
+        store = ContentEmbeddingStore(self.root)
+        store.put_many(MODEL, vectors("a"))
+        with open(self.root / MODEL / "vectors.f32", "ab") as vectors_file:
+            vectors_file.write(np.ones(4, dtype=np.float32).tobytes())
+
+        # when
+        other = ContentEmbeddingStore(self.root)
+        other.put_many(MODEL, {"b": np.full(4, 7, dtype=np.float32)})
+
+        # then
+        np.testing.assert_array_equal(other.get_many(MODEL, ["b"])["b"], np.full(4, 7, dtype=np.float32))
+        self.assertEqual((self.root / MODEL / "vectors.f32").stat().st_size, 2 * 4 * 4)
+
+    def test_export_and_import_between_environments(self):
+        # given
+        source = ContentEmbeddingStore(self.root / "source")
+        source.put_many(MODEL, vectors("a", "b"))
+        target = ContentEmbeddingStore(self.root / "target")
+        target.put_many(MODEL, vectors("a"))
+        path = self.root / "embeddings.npz"
+
+        # when
+        exported = source.export(MODEL, path)
+        imported = target.import_(path)
+
+        # then
+        self.assertEqual((exported, imported), (2, 1))
+        np.testing.assert_array_equal(target.get_many(MODEL, ["b"])["b"], np.full(4, 2, dtype=np.float32))
+
+
+@override_settings(**STUB_SERVICE_SETTINGS)
+class IndexerEmbeddingReuseTest(TestCase):
+    def test_rebuilt_vector_store_reuses_stored_embeddings(self):
+        # given - 색인 후 벡터 저장소를 지움
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        for i in range(3):
+            Project.objects.create(name=f"프로젝트 {i}", project_type="web_development", description=f"설명 {i}")
+        service = build_stub_service()
+        service.content_embedding_store = ContentEmbeddingStore(directory.name)
+        ContentIndexer(service).run()
+        rebuilt = NumpyVectorStore(service.embeddings)
+
+        # when
+        with mock.patch.object(service.embeddings, "embed_documents") as embed_documents:
+            summary = ContentIndexer(service, force=True, vector_store=rebuilt).run()
+
+        # then
+        embed_documents.assert_not_called()
+        self.assertEqual((summary["embedded"], summary["reused_embeddings"], summary["api_embeddings"]), (3, 3, 0))
+        self.assertEqual(rebuilt.count(), 3)
@@ -0,0 +1,104 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from app.chat_bot.indexing import ContentIndexer
+from app.chat_bot.tests.test_rag_service import STUB_SERVICE_SETTINGS, build_stub_service
+from app.knowledge_document.models import ChromaVector, Project
+
+
+@override_settings(**STUB_SERVICE_SETTINGS)
+class ContentIndexerTest(TestCase):
+    def setUp(self) -> None:
+        # given
+        self.projects = [
+            Project.objects.create(name=f"프로젝트 {i}", project_type="web_development", description=f"설명 {i}")
+            for i in range(5)
+        ]
+        self.service = build_stub_service()
+        embeddings = self.service.vector_store.embeddings
+        patcher = mock.patch.object(embeddings, "embed_documents", wraps=embeddings.embed_documents)
+        self.embed_documents = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _run(self, **kwargs):
+        return ContentIndexer(self.service, **kwargs).run()
+
+    def test_embeds_in_batches_with_bulk_upsert(self):
+        # when
+        summary = self._run(batch_size=2, concurrency=2)
+
+        # then
+        self.assertEqual(self.embed_documents.call_count, 3)
+        self.assertEqual((summary["embedded"], summary["skipped"], summary["failed"]), (5, 0, 0))
+        self.assertEqual(ChromaVector.objects.count(), 5)
+        self.assertEqual(self.service.vector_store.count(), 5)
+        self.assertGreater(summary["documents_per_second"], 0)
+
+    def test_unchanged_content_is_skipped(self):
+        # given
+        self._run()
+        self.embed_documents.reset_mock()
+        self.projects[0].description = "수정된 설명"
+        self.projects[0].save()
+
+        # when
+        summary = self._run()
+
+        # then - 해시가 바뀐 문서만 다시 임베딩
+        self.assertEqual((summary["embedded"], summary["skipped"]), (1, 4))
+        self.assertEqual(len(self.embed_documents.call_args.args[0]), 1)
+        vector = ChromaVector.objects.get(content_id=self.projects[0].id)
+        self.assertEqual(vector.source_content_hash, ContentIndexer(self.service).collect()["items"][0].content_hash)
+
+    def test_force_reembeds_everything(self):
+        # given
+        self._run()
+
+        # when
+        summary = self._run(force=True)
+
+        # then
+        self.assertEqual((summary["embedded"], summary["skipped"]), (5, 0))
+        self.assertEqual(ChromaVector.objects.count(), 5)
+
+    def test_failed_batch_does_not_stop_others(self):
+        # given
+        calls = []
+
+        def embed_documents(texts):
+            calls.append(texts)
+            if len(calls) == 1:
+                raise RuntimeError("OpenAI 오류")
+            return [[1.0] * 16 for _ in texts]
+
+        self.embed_documents.side_effect = embed_documents
+
+        # when
+        summary = self._run(batch_size=2, concurrency=1)
+
+        # then - 실패한 문서는 행이 없으므로 다음 실행에서 다시 대상이 된다
+        self.assertEqual((summary["embedded"], summary["failed"]), (3, 2))
+        self.assertEqual(ChromaVector.objects.count(), 3)
+
+    def test_edit_during_embedding_is_marked_stale(self):
+        # given - 대상을 고른 뒤(임베딩하는 동안) 문서가 수정됨
+        project = self.projects[0]
+        collect = ContentIndexer.collect
+
+        def collect_then_edit(indexer, *args, **kwargs):
+            collected = collect(indexer, *args, **kwargs)
+            Project.objects.filter(id=project.id).update(
+                description="임베딩 중 수정", updated_at=timezone.now() + timedelta(seconds=1)
+            )
+            return collected
+
+        # when
+        with mock.patch.object(ContentIndexer, "collect", autospec=True, side_effect=collect_then_edit):
+            self._run()
+
+        # then - 이전 내용으로 저장된 벡터는 다시 임베딩 대상
+        self.assertTrue(ChromaVector.objects.get(content_id=project.id).needs_update)
+        self.assertFalse(ChromaVector.objects.get(content_id=self.projects[1].id).needs_update)
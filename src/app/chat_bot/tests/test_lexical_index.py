@@ -0,0 +1,119 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from app.chat_bot.lexical_index import BM25Index, KnowledgeLexicalIndex, keyword_tokens, tokenize
+from app.chat_bot.tests.test_rag_service import STUB_SERVICE_SETTINGS, build_stub_service
+from app.knowledge_document.models import Project
+
+
+class TokenizeTest(SimpleTestCase):
+    def test_korean_is_split_into_bigrams(self):
+        self.assertEqual(tokenize("쇼핑몰을 Django로"), ["쇼핑", "핑몰", "몰을", "django", "로"])
+
+    def test_keyword_tokens_keep_technology_names(self):
+        self.assertEqual(keyword_tokens("C++ 와 C# 그리고 Vue.js 3 경험"), ["c++", "c#", "vue", "js", "3"])
+
+
+class BM25IndexTest(SimpleTestCase):
+    def test_upsert_replaces_document(self):
+        # given
+        index = BM25Index()
+        index.upsert("project_1", [("Django 백엔드", 1.0)])
+        index.upsert("project_2", [("React 프론트엔드", 1.0)])
+
+        # when
+        index.upsert("project_1", [("Kotlin 안드로이드", 1.0)])
+
+        # then
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.search("django"), [])
+        self.assertEqual([key for key, _ in index.search("kotlin")], ["project_1"])
+
+    def test_remove(self):
+        index = BM25Index()
+        index.upsert("blog_1", [("python 튜토리얼", 1.0)])
+        index.remove("blog_1")
+        self.assertEqual(len(index), 0)
+        self.assertFalse(index.knows_all(["python"]))
+
+    def test_compact_keeps_search_results(self):
+        # given
+        index = BM25Index()
+        for i in range(10):
+            index.upsert(f"doc_{i}", [(f"문서 {i} python", 1.0)])
+        expected = index.search("python", k=10)
+
+        # when - 죽은 슬롯이 살아있는 슬롯보다 많아지도록 반복 수정
+        for _ in range(10):
+            for i in range(10):
+                index.upsert(f"doc_{i}", [(f"문서 {i} python", 1.0)])
+
+        # then
+        self.assertLess(len(index._keys), 110)
+        self.assertEqual(sorted(index.search("python", k=10)), sorted(expected))
+
+
+class KnowledgeLexicalIndexTest(TestCase):
+    def setUp(self) -> None:
+        # given
+        self.shop = Project.objects.create(
+            name="쇼핑몰 구축", project_type="e_commerce", description="결제 연동", technologies_used=["Django"]
+        )
+        self.booking = Project.objects.create(
+            name="예약 앱", project_type="mobile_app", description="병원 예약", technologies_used=["Flutter"]
+        )
+        self.index = KnowledgeLexicalIndex(sync_interval=0)
+        self.index.rebuild()
+
+    def _keys(self, query):
+        return [key for key, _ in self.index.search(query)]
+
+    def test_matches_korean_word_with_particle(self):
+        self.assertEqual(self._keys("쇼핑몰을 만든 적 있나요"), [f"project_{self.shop.id}"])
+        self.assertEqual(self._keys("flutter"), [f"project_{self.booking.id}"])
+
+    def test_catch_up_reindexes_changed_and_removed_documents(self):
+        # given
+        self.booking.technologies_used = ["Flutter", "Firebase"]
+        self.booking.save()
+        self.shop.delete()
+
+        # when
+        self.index.catch_up()
+
+        # then
+        self.assertEqual(self._keys("firebase"), [f"project_{self.booking.id}"])
+        self.assertEqual(self._keys("django"), [])
+        self.assertEqual(len(self.index), 1)
+
+
+@override_settings(**STUB_SERVICE_SETTINGS, CHATBOT_LEXICAL_SHORTCUT_MIN_HITS=2)
+class LexicalShortcutTest(TestCase):
+    def setUp(self) -> None:
+        # given
+        for name in ["쇼핑몰 구축", "사내 그룹웨어"]:
+            Project.objects.create(
+                name=name, project_type="web_development", description=name, technologies_used=["Django"]
+            )
+        self.service = build_stub_service()
+        self.service.embed_all_content()
+
+    def test_keyword_question_skips_embedding(self):
+        # when
+        with mock.patch.object(self.service.embeddings, "embed_documents") as embed_documents:
+            documents = self.service._retrieve_relevant_documents("Django 프로젝트", question_type="tech")
+
+        # then
+        embed_documents.assert_not_called()
+        self.assertEqual(len(documents), 2)
+
+    def test_unknown_keyword_falls_back_to_vector_search(self):
+        # when
+        with mock.patch.object(
+            self.service.embeddings, "embed_documents", wraps=self.service.embeddings.embed_documents
+        ) as embed_documents:
+            self.service._retrieve_relevant_documents("Django 와 Kotlin 프로젝트", question_type="tech")
+
+        # then - 색인에 없는 키워드가 있으면 벡터 검색도 한다
+        embed_documents.assert_called_once()
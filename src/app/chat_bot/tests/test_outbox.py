@@ -0,0 +1,101 @@
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from app.chat_bot.models import ContentChange
+from app.chat_bot.outbox import claim_changes, drain_changes, outbox_stats
+
+
+class OutboxDrainTest(TestCase):
+    def setUp(self) -> None:
+        # given
+        self.service = mock.Mock()
+        ContentChange.objects.bulk_create(
+            [ContentChange(content_type="project", content_id=uuid.uuid4()) for i in range(3)]
+        )
+
+    def test_failed_batch_is_released_for_retry(self):
+        # when
+        with mock.patch("app.chat_bot.outbox._process", return_value={"embedded": 0, "failed": 1, "removed": 0}):
+            result = drain_changes(self.service)
+
+        # then
+        self.assertEqual(result["processed"], 0)
+        self.assertEqual(ContentChange.objects.filter(claim_token__isnull=True).count(), 3)
+
+    def test_exception_releases_batch(self):
+        # when
+        with mock.patch("app.chat_bot.outbox._process", side_effect=RuntimeError("임베딩 실패")):
+            with self.assertRaises(RuntimeError):
+                drain_changes(self.service)
+
+        # then
+        self.assertEqual(ContentChange.objects.filter(claim_token__isnull=True).count(), 3)
+
+    def test_retry_after_failure_deletes_changes(self):
+        # given
+        with mock.patch("app.chat_bot.outbox._process", return_value={"embedded": 0, "failed": 1, "removed": 0}):
+            drain_changes(self.service)
+
+        # when
+        with mock.patch("app.chat_bot.outbox._process", return_value={"embedded": 3, "failed": 0, "removed": 0}):
+            result = drain_changes(self.service)
+
+        # then
+        self.assertEqual(result["processed"], 3)
+        self.assertFalse(ContentChange.objects.exists())
+
+
+class ClaimChangesTest(TestCase):
+    def setUp(self) -> None:
+        # given
+        ContentChange.objects.bulk_create(
+            [ContentChange(content_type="project", content_id=uuid.uuid4()) for i in range(3)]
+        )
+
+    def test_claimed_changes_are_not_claimed_again(self):
+        # given
+        token, changes = claim_changes(batch_size=2)
+
+        # when
+        next_token, next_changes = claim_changes(batch_size=10)
+
+        # then
+        self.assertEqual(len(changes), 2)
+        self.assertEqual(len(next_changes), 1)
+        self.assertNotEqual(token, next_token)
+        self.assertEqual(claim_changes(batch_size=10), (None, []))
+
+    @override_settings(CHATBOT_OUTBOX_CLAIM_TIMEOUT_SECONDS=60)
+    def test_expired_claim_is_taken_over(self):
+        # given - 처리하던 워커가 중단됨
+        token, _ = claim_changes(batch_size=10)
+        ContentChange.objects.update(claimed_at=ContentChange.objects.first().created_at - timedelta(minutes=5))
+
+        # when
+        next_token, changes = claim_changes(batch_size=10)
+
+        # then
+        self.assertEqual(len(changes), 3)
+        self.assertEqual(ContentChange.objects.filter(claim_token=next_token).count(), 3)
+
+
+class OutboxStatsTest(TestCase):
+    def test_reports_pending_lag_and_last_drain(self):
+        # given
+        ContentChange.objects.create(content_type="blog_post", content_id=uuid.uuid4())
+        ContentChange.objects.update(created_at=ContentChange.objects.get().created_at - timedelta(seconds=30))
+
+        # when
+        with mock.patch("app.chat_bot.outbox._process", return_value={"embedded": 1, "failed": 0, "removed": 0}):
+            drain_changes(mock.Mock(), batch_size=10)
+        ContentChange.objects.create(content_type="blog_post", content_id=uuid.uuid4())
+        stats = outbox_stats()
+
+        # then
+        self.assertEqual(stats["pending"], 1)
+        self.assertLess(stats["oldest_pending_age_seconds"], 30)
+        self.assertEqual(stats["last_drain"]["processed"], 1)
+        self.assertGreaterEqual(stats["last_drain"]["max_lag_seconds"], 30)
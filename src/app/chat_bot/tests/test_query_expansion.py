@@ -0,0 +1,70 @@
+from unittest import mock
+
+from django.test import TransactionTestCase
+
+from app.chat_bot.models import QueryExpansion
+from app.chat_bot.query_expansion import QueryExpander
+from app.knowledge_document.models import Category
+
+
+# cached 모드는 LLM 확장을 실행자 스레드의 DB 연결로 저장하므로 테스트 트랜잭션으로 감싸지 않는다
+class QueryExpanderTest(TransactionTestCase):
+    def setUp(self) -> None:
+        # given
+        Category.objects.create(name="프론트엔드", category_type="technology", common_keywords=["React", "Vue"])
+        self.llm = mock.Mock(model_name="gpt-4o")
+        self.llm.invoke.return_value = mock.Mock(content="1. 리액트 포트폴리오\n- React 개발 사례\n\n")
+
+    def _expander(self, mode: str) -> QueryExpander:
+        return QueryExpander(llm=self.llm, mode=mode, llm_timeout_seconds=1.0, max_queries=4)
+
+    def test_local_mode_uses_synonyms_and_category_keywords(self):
+        # when
+        queries = self._expander("local").expand("React 프로젝트 보여주세요")
+
+        # then
+        self.assertEqual(
+            queries,
+            [
+                "React 프로젝트 보여주세요",
+                "프로젝트 프로젝트 포트폴리오 개발 작업 업무",
+                "프론트엔드 React Vue",
+            ],
+        )
+        self.llm.invoke.assert_not_called()
+
+    def test_llm_mode_parses_numbered_and_bulleted_lines(self):
+        # when
+        queries = self._expander("llm").expand("React 프로젝트")
+
+        # then
+        self.assertEqual(queries, ["React 프로젝트", "리액트 포트폴리오", "React 개발 사례"])
+
+    def test_cached_mode_stores_and_reuses_llm_expansion(self):
+        # given
+        expander = self._expander("cached")
+        expander.expand("React 프로젝트?")
+
+        # when - 정규화하면 같은 질문
+        queries = expander.expand("react  프로젝트")
+
+        # then
+        self.assertEqual(self.llm.invoke.call_count, 1)
+        self.assertEqual(QueryExpansion.objects.get().sub_queries, ["리액트 포트폴리오", "React 개발 사례"])
+        self.assertEqual(queries, ["react  프로젝트", "리액트 포트폴리오", "React 개발 사례"])
+
+    def test_cached_mode_falls_back_to_local_when_llm_fails(self):
+        # given
+        self.llm.invoke.side_effect = RuntimeError("OpenAI 오류")
+
+        # when
+        queries = self._expander("cached").expand("React 프로젝트")
+
+        # then
+        self.assertEqual(queries[0], "React 프로젝트")
+        self.assertIn("프론트엔드 React Vue", queries)
+        self.assertFalse(QueryExpansion.objects.exists())
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            self._expander("rewrite")
@@ -0,0 +1,298 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from langchain.schema import Document
+
+from app.chat_bot import rag_service
+from app.chat_bot.benchmarks import StubChatModel, StubEmbeddings
+from app.chat_bot.metrics import StageTimer
+from app.chat_bot.vector_stores import NumpyVectorStore
+from app.knowledge_document.models import BlogPost, Category, ChatLog, CompanyContent, Project
+
+# OpenAI/로컬 파일 없이 서비스 전체 경로를 실행 (임베딩 캐시/배칭/문서 임베딩 저장소는 끈다)
+STUB_SERVICE_SETTINGS = {
+    "CHATBOT_EMBEDDING_CACHE_ENABLED": False,
+    "CHATBOT_EMBEDDING_BATCH_ENABLED": False,
+    "CHATBOT_CONTENT_EMBEDDING_STORE_ENABLED": False,
+    "CHATBOT_QUERY_EXPANSION_MODE": "local",
+}
+
+
+def build_stub_service() -> rag_service.CompanyChatbotService:
+    """스텁 LLM/임베딩과 인메모리 NumPy 저장소를 쓰는 챗봇 서비스"""
+    embeddings = StubEmbeddings(dimension=16)
+    return rag_service.CompanyChatbotService(
+        llm=StubChatModel(latency_seconds=0.0), embeddings=embeddings, vector_store=NumpyVectorStore(embeddings)
+    )
+
+
+class ChatbotServiceSingletonTest(SimpleTestCase):
+    def setUp(self) -> None:
+        # given - 생성자는 OpenAI/크로마 클라이언트를 만들므로 가짜 서비스로 대체
+        rag_service._reset_chatbot_service_after_fork()
+        patcher = mock.patch.object(rag_service, "CompanyChatbotService", side_effect=lambda: mock.Mock())
+        self.service_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(rag_service._reset_chatbot_service_after_fork)
+
+    def test_reuses_service_within_process(self):
+        # when
+        first = rag_service.get_chatbot_service()
+        second = rag_service.get_chatbot_service()
+
+        # then
+        self.assertIs(first, second)
+        self.assertEqual(self.service_class.call_count, 1)
+
+    def test_forked_worker_creates_its_own_service(self):
+        # given - --preload 마스터에서 만든 서비스
+        parent = rag_service.get_chatbot_service()
+
+        # when - fork 된 워커는 부모와 pid 가 다르다
+        with mock.patch.object(rag_service.os, "getpid", return_value=rag_service.os.getpid() + 1):
+            child = rag_service.get_chatbot_service()
+
+        # then
+        self.assertIsNot(parent, child)
+
+    def test_fork_hook_drops_service_and_search_executor(self):
+        # given
+        service = rag_service.get_chatbot_service()
+        executor = rag_service.search_executor()
+
+        # when
+        rag_service._reset_chatbot_service_after_fork()
+
+        # then - 부모의 스레드 풀은 자식에 스레드가 없으므로 새로 만든다
+        self.assertIsNot(rag_service.get_chatbot_service(), service)
+        self.assertIsNot(rag_service.search_executor(), executor)
+        executor.shutdown()
+
+    def test_stats_flush_is_registered_once(self):
+        # given
+        with mock.patch.object(rag_service, "_stats_flush_registered", False), mock.patch.object(
+            rag_service.atexit, "register"
+        ) as register:
+            # when - 서비스가 다시 만들어져도
+            rag_service.get_chatbot_service()
+            rag_service._reset_chatbot_service_after_fork()
+            rag_service.get_chatbot_service()
+
+        # then
+        register.assert_called_once_with(rag_service._flush_relevance_stats)
+
+    def test_flush_skips_service_inherited_from_parent(self):
+        # given
+        service = rag_service.get_chatbot_service()
+
+        # when - 부모가 만든 서비스를 물려받은 채 종료
+        with mock.patch.object(rag_service.os, "getpid", return_value=rag_service.os.getpid() + 1):
+            rag_service._flush_relevance_stats()
+        rag_service._flush_relevance_stats()
+
+        # then - 부모 몫의 통계는 자식에서 반영하지 않는다
+        service.relevance_stats.flush.assert_called_once_with()
+
+
+# 비동기 경로는 다른 스레드의 DB 연결도 쓰므로 테스트 트랜잭션으로 감싸지 않는다
+@override_settings(**STUB_SERVICE_SETTINGS)
+class AsyncProcessQuestionTest(TransactionTestCase):
+    def setUp(self) -> None:
+        # given - 커밋 후 아웃박스 처리 예약은 브로커로 보내지 않는다
+        patcher = mock.patch("app.chat_bot.tasks.drain_content_outbox.apply_async")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        Project.objects.create(
+            name="쇼핑몰 구축",
+            project_type="e_commerce",
+            description="Django 로 만든 쇼핑몰",
+            technologies_used=["Django", "React"],
+        )
+        self.service = build_stub_service()
+        self.service.embed_all_content()
+
+    def test_answers_with_retrieved_context(self):
+        # when
+        result = async_to_sync(self.service.aprocess_question)("Django 프로젝트가 있나요?", "session-1")
+
+        # then
+        self.assertEqual(result["answer"], StubChatModel().answer)
+        self.assertFalse(result["cached"])
+        self.assertIn("search", result["timings"])
+        chat_log = ChatLog.objects.get(id=result["chat_log_id"])
+        self.assertEqual(len(chat_log.retrieved_projects), 1)
+
+    def test_repeated_question_is_served_from_cache(self):
+        # given
+        async_to_sync(self.service.aprocess_question)("Django 프로젝트가 있나요?")
+
+        # when
+        result = async_to_sync(self.service.aprocess_question)("Django 프로젝트가 있나요?")
+
+        # then
+        self.assertTrue(result["cached"])
+        self.assertEqual(ChatLog.objects.count(), 2)
+
+
+def project_document(content_id: str, chunk_index: int = 0) -> Document:
+    return Document(
+        page_content=f"프로젝트 {content_id}",
+        metadata={"source_type": "project", "content_id": content_id, "chunk_index": chunk_index},
+    )
+
+
+# 벡터 검색은 실행자 스레드의 DB 연결도 쓰므로 테스트 트랜잭션으로 감싸지 않는다
+@override_settings(**STUB_SERVICE_SETTINGS)
+class RetrieveRelevantDocumentsTest(TransactionTestCase):
+    def setUp(self) -> None:
+        # given
+        patcher = mock.patch("app.chat_bot.tasks.drain_content_outbox.apply_async")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for name, technology in [("쇼핑몰 구축", "Django"), ("예약 앱", "Flutter"), ("사내 메신저", "React")]:
+            Project.objects.create(
+                name=name,
+                project_type="e_commerce",
+                description=f"{technology} 로 만든 {name}",
+                technologies_used=[technology],
+            )
+        self.service = build_stub_service()
+        self.service.embed_all_content()
+
+    def test_sub_queries_are_embedded_once_and_searched_separately(self):
+        # given
+        sub_queries = ["어떤 프로젝트를 했나요?", "포트폴리오 사례", "개발 작업"]
+        timer = StageTimer()
+
+        # when
+        with mock.patch.object(self.service.query_expander, "expand", return_value=sub_queries), mock.patch.object(
+            self.service.embeddings, "embed_documents", wraps=self.service.embeddings.embed_documents
+        ) as embed_documents, mock.patch.object(
+            self.service.vector_store,
+            "similarity_search_by_vector_with_score",
+            wraps=self.service.vector_store.similarity_search_by_vector_with_score,
+        ) as search:
+            documents = self.service._retrieve_relevant_documents("어떤 프로젝트를 했나요?", timer=timer)
+
+        # then - 하위 검색어 임베딩은 한 번에, 벡터 검색은 하위 검색어마다
+        embed_documents.assert_called_once_with(sub_queries)
+        self.assertEqual(search.call_count, len(sub_queries))
+        keys = [(doc.metadata["source_type"], doc.metadata["content_id"]) for doc in documents]
+        self.assertEqual(len(keys), len(set(keys)))
+        self.assertTrue({"expansion", "embedding", "search", "fusion"} <= set(timer.timings))
+
+    def test_reuses_question_embedding_for_original_question(self):
+        # given
+        question = "어떤 프로젝트를 했나요?"
+        question_embedding = self.service.embeddings.embed_query(question)
+
+        # when
+        with mock.patch.object(
+            self.service.query_expander, "expand", return_value=[question, "포트폴리오 사례"]
+        ), mock.patch.object(
+            self.service.embeddings, "embed_documents", wraps=self.service.embeddings.embed_documents
+        ) as embed_documents:
+            self.service._retrieve_relevant_documents(question, question_embedding=question_embedding)
+
+        # then
+        embed_documents.assert_called_once_with(["포트폴리오 사례"])
+
+
+class FuseSearchResultsTest(SimpleTestCase):
+    def test_merges_sub_query_results_by_reciprocal_rank(self):
+        # given - 두 하위 검색어 모두 상위에 나온 문서가 가장 앞
+        result_lists = [
+            [(project_document("1"), 0.9), (project_document("2"), 0.85)],
+            [(project_document("3"), 0.88), (project_document("1", chunk_index=1), 0.86)],
+        ]
+
+        # when
+        fused = rag_service.CompanyChatbotService._fuse_search_results(result_lists, k=10)
+
+        # then - 같은 content_id 는 하나로, 유사도는 가장 높은 값
+        self.assertEqual([doc.metadata["content_id"] for doc in fused], ["1", "3", "2"])
+        self.assertEqual(fused[0].metadata["relevance_score"], 0.9)
+
+    def test_same_document_chunks_count_once_per_result_list(self):
+        # given - 한 검색 결과에 같은 원본의 청크가 여러 개
+        result_lists = [
+            [(project_document("1"), 0.9), (project_document("1", chunk_index=1), 0.89), (project_document("2"), 0.88)],
+            [(project_document("2"), 0.9), (project_document("1"), 0.89)],
+        ]
+
+        # when
+        fused = rag_service.CompanyChatbotService._fuse_search_results(result_lists, k=10)
+
+        # then - 청크 수만큼 점수가 더해지지 않는다
+        self.assertEqual(len(fused), 2)
+        self.assertEqual(fused[0].metadata["content_id"], "1")
+
+
+def legacy_document(source_type: str, obj) -> Document:
+    """컨텍스트 카드 없이 인덱싱된 문서"""
+    return Document(page_content="", metadata={"source_type": source_type, "content_id": str(obj.id)})
+
+
+@override_settings(**STUB_SERVICE_SETTINGS)
+class HydrateSearchResultsTest(TestCase):
+    def setUp(self) -> None:
+        # given
+        category = Category.objects.create(name="회사 소개", category_type="company_info")
+        self.contents = [
+            CompanyContent.objects.create(
+                title=f"소개 {i}", content_type="company_basic", category=category, content="내용"
+            )
+            for i in range(2)
+        ]
+        self.projects = [
+            Project.objects.create(name=f"프로젝트 {i}", project_type="e_commerce", description="설명") for i in range(3)
+        ]
+        self.blog_posts = [
+            BlogPost.objects.create(title=f"블로그 {i}", url=f"https://blog.example.com/{i}") for i in range(2)
+        ]
+        self.blog_posts[0].related_projects.set(self.projects)
+        self.service = build_stub_service()
+
+    def _documents(self, projects):
+        return (
+            [legacy_document("project", project) for project in projects]
+            + [legacy_document("blog_post", blog_post) for blog_post in self.blog_posts]
+            + [legacy_document("company_content", content) for content in self.contents]
+        )
+
+    def test_query_count_does_not_grow_with_results(self):
+        # given
+        with self.assertNumQueries(4):
+            self.service._analyze_search_results(self._documents(self.projects[:1]), "질문")
+
+        # when / then - 모델별 in_bulk 3번 + 프로젝트 관련 블로그 prefetch 1번, 결과 수와 무관
+        with self.assertNumQueries(4):
+            context_info = self.service._analyze_search_results(self._documents(self.projects), "질문")
+
+        self.assertEqual(len(context_info["projects"]), 3)
+        self.assertEqual(context_info["projects"][0]["related_blogs"][0]["title"], "블로그 0")
+
+    def test_preserves_retrieval_order(self):
+        # given
+        projects = list(reversed(self.projects))
+
+        # when
+        context_info = self.service._analyze_search_results(self._documents(projects), "질문")
+
+        # then
+        self.assertEqual([card["id"] for card in context_info["projects"]], [str(p.id) for p in projects])
+
+    def test_documents_with_cards_need_no_queries(self):
+        # given
+        document = Document(
+            page_content="",
+            metadata={"source_type": "project", "content_id": "1", "project_name": "쇼핑몰", "context_card": "카드"},
+        )
+
+        # when
+        with self.assertNumQueries(0):
+            context_info = self.service._analyze_search_results([document], "질문")
+
+        # then
+        self.assertEqual(context_info["projects"][0]["card"], "카드")
@@ -0,0 +1,78 @@
+import uuid
+
+from django.test import TestCase, override_settings
+
+from app.chat_bot.models import ContentChange
+from app.chat_bot.reconcile import reconcile_vectors
+from app.chat_bot.tests.test_rag_service import STUB_SERVICE_SETTINGS, build_stub_service
+from app.knowledge_document.models import ChromaVector, Project
+
+DRIFT_KEYS = ["orphan_vectors", "dead_rows", "missing_vectors", "unindexed", "stale"]
+
+
+@override_settings(**STUB_SERVICE_SETTINGS, CHATBOT_RECONCILE_GRACE_SECONDS=0)
+class ReconcileVectorsTest(TestCase):
+    def setUp(self) -> None:
+        # given - 색인된 프로젝트 세 개
+        self.projects = [
+            Project.objects.create(name=f"프로젝트 {i}", project_type="web_development", description=f"설명 {i}")
+            for i in range(3)
+        ]
+        self.service = build_stub_service()
+        self.service.embed_all_content()
+
+        # 원본/벡터 저장소/ChromaVector 가 어긋난 상태
+        self.deleted = self.projects[0]
+        self.deleted.delete()
+        self.missing = ChromaVector.objects.get(content_id=self.projects[1].id)
+        self.service.vector_store.delete(ids=[self.missing.vector_id])
+        self.orphan_id = f"project_{uuid.uuid4()}"
+        self.service.vector_store.add_embeddings(
+            texts=["고아"], embeddings=[[1.0] * 16], metadatas=[{}], ids=[self.orphan_id]
+        )
+        self.unindexed = Project.objects.create(name="새 프로젝트", project_type="web_development", description="설명")
+        # 아웃박스 처리가 끝난 상태에서의 검사
+        ContentChange.objects.all().delete()
+
+    def _drift(self, report):
+        return {key: report[key] for key in DRIFT_KEYS}
+
+    def _vector_ids(self):
+        return set(self.service.vector_store.get(include=[])["ids"])
+
+    def test_dry_run_reports_drift_without_changes(self):
+        # when
+        report = reconcile_vectors(self.service, dry_run=True)
+
+        # then - 삭제된 원본의 벡터도 고아 벡터로 센다
+        self.assertEqual(
+            self._drift(report),
+            {"orphan_vectors": 2, "dead_rows": 1, "missing_vectors": 1, "unindexed": 1, "stale": 0},
+        )
+        self.assertIn(self.orphan_id, self._vector_ids())
+        self.assertEqual(ChromaVector.objects.count(), 3)
+
+    def test_repairs_drift(self):
+        # when
+        report = reconcile_vectors(self.service)
+
+        # then
+        self.assertEqual(report["reembedded"], 2)
+        self.assertEqual(self._vector_ids(), set(ChromaVector.objects.values_list("vector_id", flat=True)))
+        self.assertEqual(
+            set(ChromaVector.objects.values_list("content_id", flat=True)),
+            {self.projects[1].id, self.projects[2].id, self.unindexed.id},
+        )
+        self.assertEqual(set(self._drift(reconcile_vectors(self.service)).values()), {0})
+
+    def test_content_in_outbox_is_left_to_indexer(self):
+        # given - 아직 아웃박스에서 처리 중인 원본
+        ContentChange.objects.create(content_type="project", content_id=self.unindexed.id)
+        ContentChange.objects.create(content_type="project", content_id=self.orphan_id.partition("_")[2])
+
+        # when
+        report = reconcile_vectors(self.service, dry_run=True)
+
+        # then
+        self.assertEqual((report["unindexed"], report["orphan_vectors"]), (0, 1))
+        self.assertEqual(report["skipped_busy_vectors"], 1)
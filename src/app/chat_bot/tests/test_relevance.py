@@ -0,0 +1,29 @@
+from django.test import SimpleTestCase, override_settings
+
+from app.chat_bot.relevance import relevance_cutoff
+
+
+@override_settings(
+    CHATBOT_RETRIEVAL_MIN_SCORE=0.25,
+    CHATBOT_RETRIEVAL_RELATIVE_SCORE_GAP=0.3,
+    CHATBOT_RETRIEVAL_SCORE_DROP=0.08,
+    CHATBOT_RETRIEVAL_MIN_K=2,
+)
+class RelevanceCutoffTest(SimpleTestCase):
+    def test_drops_scores_below_minimum(self):
+        self.assertEqual(relevance_cutoff({"a": 0.5, "b": 0.2}, k=5), ["a"])
+
+    def test_cuts_at_largest_drop(self):
+        scores = {"a": 0.80, "b": 0.78, "c": 0.76, "d": 0.60, "e": 0.59}
+        self.assertEqual(relevance_cutoff(scores, k=5), ["a", "b", "c"])
+
+    def test_keeps_min_k(self):
+        scores = {"a": 0.90, "b": 0.50, "c": 0.48}
+        self.assertEqual(relevance_cutoff(scores, k=5), ["a", "b"])
+
+    def test_limits_to_k(self):
+        scores = {key: 0.7 for key in "abcde"}
+        self.assertEqual(len(relevance_cutoff(scores, k=3)), 3)
+
+    def test_nothing_close_enough(self):
+        self.assertEqual(relevance_cutoff({"a": 0.2, "b": 0.1}, k=5), [])
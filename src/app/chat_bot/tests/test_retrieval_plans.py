@@ -0,0 +1,82 @@
+from django.test import SimpleTestCase, override_settings
+
+from app.chat_bot.rag_service import CompanyChatbotService
+from app.chat_bot.retrieval_plans import RETRIEVAL_PLANS, build_where, retrieval_plan
+from app.chat_bot.tests.test_rag_service import project_document
+
+
+class RetrievalPlanTest(SimpleTestCase):
+    def test_build_where(self):
+        self.assertIsNone(build_where({}))
+        self.assertEqual(build_where({"source_type": ["project"]}), {"source_type": "project"})
+        self.assertEqual(
+            build_where({"source_type": ["project", "blog_post"], "is_highlight": True}),
+            {"$and": [{"source_type": {"$in": ["project", "blog_post"]}}, {"is_highlight": True}]},
+        )
+        self.assertEqual(
+            build_where({"technologies": ["python", "c++"]}),
+            {"$or": [{"tech_python": True}, {"tech_cpp": True}]},
+        )
+
+    def test_tech_plan_matches_question_technologies(self):
+        # when
+        plan = retrieval_plan("tech", "Django 와 React 로 만든 프로젝트 2개")
+
+        # then
+        filters, where, k = plan.searches[0]
+        self.assertEqual(filters["technologies"], ["django", "react"])
+        self.assertTrue(plan.allows({"source_type": "project", "tech_react": True}))
+        self.assertFalse(plan.allows({"source_type": "project", "tech_java": True}))
+
+    def test_unknown_question_type_uses_general_plan(self):
+        plan = retrieval_plan("unknown", "안녕하세요")
+        self.assertEqual(plan.k, RETRIEVAL_PLANS["general"]["k"])
+        self.assertIsNone(plan.searches[0][1])
+
+
+@override_settings(CHATBOT_RETRIEVAL_MIN_FILTERED_RESULTS=3)
+class PlannedSearchTest(SimpleTestCase):
+    def test_each_query_vector_runs_every_filtered_search(self):
+        # given
+        plan = retrieval_plan("project", "대표 프로젝트 보여주세요")
+
+        # when
+        searches = CompanyChatbotService._plan_searches(plan, [[1.0, 0.0], [0.0, 1.0]])
+
+        # then - 하위 검색어마다 계획의 where/k 로 한 번씩
+        self.assertEqual(len(searches), 2 * len(plan.searches))
+        self.assertEqual([(where, k) for _, where, k in searches[:2]], [(where, k) for _, where, k in plan.searches])
+        self.assertEqual(searches[1][1], {"$and": [{"source_type": "project"}, {"is_highlight": True}]})
+
+    def test_too_few_filtered_results_falls_back_to_unfiltered_search(self):
+        # given - 두 검색에서 같은 원본의 청크를 찾아도 원본은 2개
+        plan = retrieval_plan("company", "회사 소개해줘")
+        result_lists = [[(project_document("1"), 0.9), (project_document("1", chunk_index=1), 0.8)]]
+        result_lists.append([(project_document("2"), 0.7)])
+
+        # when
+        needs_fallback = CompanyChatbotService._needs_unfiltered_search(plan, result_lists)
+
+        # then
+        self.assertTrue(needs_fallback)
+
+    def test_enough_filtered_results_skip_fallback(self):
+        # given
+        plan = retrieval_plan("company", "회사 소개해줘")
+        result_lists = [[(project_document(content_id), 0.9) for content_id in "123"]]
+
+        # when
+        needs_fallback = CompanyChatbotService._needs_unfiltered_search(plan, result_lists)
+
+        # then
+        self.assertFalse(needs_fallback)
+
+    def test_general_plan_never_falls_back(self):
+        # given - 필터 없는 검색은 이미 전체 컬렉션 대상
+        plan = retrieval_plan("general", "안녕하세요")
+
+        # when
+        needs_fallback = CompanyChatbotService._needs_unfiltered_search(plan, [[]])
+
+        # then
+        self.assertFalse(needs_fallback)
@@ -0,0 +1,89 @@
+import uuid
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+
+from app.chat_bot.retrieval_stats import RelevanceStatsBuffer
+from app.chat_bot.tests.test_rag_service import STUB_SERVICE_SETTINGS, build_stub_service, project_document
+from app.knowledge_document.models import ChromaVector
+
+
+class RelevanceStatsBufferTest(TestCase):
+    def setUp(self) -> None:
+        # given - 이미 두 번 검색된 원본과 처음 검색되는 원본
+        self.searched = ChromaVector.objects.create(
+            content_type="project", content_id=uuid.uuid4(), vector_id="v-1", retrieval_count=2, avg_relevance_score=0.5
+        )
+        self.fresh = ChromaVector.objects.create(content_type="project", content_id=uuid.uuid4(), vector_id="v-2")
+        self.buffer = RelevanceStatsBuffer(flush_interval=3600)
+
+    def _key(self, vector: ChromaVector):
+        return "project", str(vector.content_id)
+
+    def test_flush_updates_counts_and_running_average(self):
+        # given
+        self.buffer.record("company_knowledge", {self._key(self.searched): 0.8, self._key(self.fresh): 0.6})
+        self.buffer.record("company_knowledge", {self._key(self.fresh): 0.4})
+
+        # when
+        with self.assertNumQueries(1):
+            self.buffer.flush()
+
+        # then - (0.5 * 2 + 0.8) / 3, (0.6 + 0.4) / 2
+        self.searched.refresh_from_db()
+        self.fresh.refresh_from_db()
+        self.assertEqual(self.searched.retrieval_count, 3)
+        self.assertAlmostEqual(self.searched.avg_relevance_score, 0.6)
+        self.assertEqual(self.fresh.retrieval_count, 2)
+        self.assertAlmostEqual(self.fresh.avg_relevance_score, 0.5)
+
+    def test_record_does_not_touch_database_before_interval(self):
+        # when
+        with self.assertNumQueries(0):
+            self.buffer.record("company_knowledge", {self._key(self.fresh): 0.6})
+
+        # then
+        self.fresh.refresh_from_db()
+        self.assertEqual(self.fresh.retrieval_count, 0)
+
+    def test_other_collections_are_not_updated(self):
+        # given - 같은 원본이라도 새로 빌드 중인 컬렉션의 검색 결과
+        self.buffer.record("company_knowledge_v2", {self._key(self.fresh): 0.6})
+
+        # when
+        self.buffer.flush()
+
+        # then
+        self.fresh.refresh_from_db()
+        self.assertEqual(self.fresh.retrieval_count, 0)
+
+    def test_failed_flush_is_retried(self):
+        # given
+        self.buffer.record("company_knowledge", {self._key(self.fresh): 0.6})
+        with mock.patch.object(RelevanceStatsBuffer, "_apply", side_effect=DatabaseError("database is locked")):
+            self.buffer.flush()
+
+        # when
+        self.buffer.flush()
+
+        # then
+        self.fresh.refresh_from_db()
+        self.assertEqual(self.fresh.retrieval_count, 1)
+        self.assertAlmostEqual(self.fresh.avg_relevance_score, 0.6)
+
+
+@override_settings(**STUB_SERVICE_SETTINGS)
+class RecordRelevanceScoresTest(TestCase):
+    def test_records_vector_search_scores_only(self):
+        # given - 키워드 검색으로만 찾은 문서에는 유사도가 없다
+        service = build_stub_service()
+        vector_hit, lexical_hit = project_document("1"), project_document("2")
+        vector_hit.metadata["relevance_score"] = 0.7
+
+        # when
+        with mock.patch.object(service.relevance_stats, "record") as record:
+            service._record_relevance_scores([vector_hit, lexical_hit])
+
+        # then
+        record.assert_called_once_with(service.collection_name, {("project", "1"): 0.7})
@@ -0,0 +1,135 @@
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from app.chat_bot import tasks
+from app.chat_bot.models import ContentChange
+from app.chat_bot.tests.test_rag_service import STUB_SERVICE_SETTINGS, build_stub_service
+from app.knowledge_document.models import Category, ChromaVector, CompanyContent, Project
+
+
+class SnapshotExportScheduleTest(TestCase):
+    def setUp(self) -> None:
+        # given
+        caches[settings.CHATBOT_CACHE_ALIAS].delete(tasks.SNAPSHOT_EXPORT_SCHEDULED_CACHE_KEY)
+        patcher = mock.patch.object(tasks.export_vector_snapshot, "apply_async")
+        self.apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_writes_within_debounce_share_one_export(self):
+        # when
+        for _ in range(3):
+            tasks.schedule_snapshot_export()
+
+        # then
+        self.apply_async.assert_called_once_with(countdown=settings.CHATBOT_VECTOR_SNAPSHOT_EXPORT_DEBOUNCE_SECONDS)
+
+    def test_export_clears_schedule_before_running(self):
+        # given
+        tasks.schedule_snapshot_export()
+        service = mock.Mock()
+
+        # when
+        with mock.patch("app.chat_bot.rag_service.get_chatbot_service", return_value=service):
+            tasks.export_vector_snapshot()
+        tasks.schedule_snapshot_export()
+
+        # then - 내보내는 동안 들어온 쓰기는 다음 내보내기로 예약된다
+        self.assertEqual(self.apply_async.call_count, 2)
+        service.sync_live_collection.assert_called_once_with(force=True)
+        service.publish_vector_snapshot.assert_called_once_with(now=True)
+
+
+class OutboxDrainScheduleTest(TestCase):
+    def setUp(self) -> None:
+        # given
+        caches[settings.CHATBOT_CACHE_ALIAS].delete(tasks.DRAIN_SCHEDULED_CACHE_KEY)
+        patcher = mock.patch.object(tasks.drain_content_outbox, "apply_async")
+        self.apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_of_edits_schedules_one_drain(self):
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(name="쇼핑몰", project_type="e_commerce", description="설명")
+        for description in ["수정 1", "수정 2"]:
+            with self.captureOnCommitCallbacks(execute=True):
+                project.description = description
+                project.save()
+
+        # then - 변경은 모두 아웃박스에 남고, 처리 작업은 한 번만 예약
+        self.assertEqual(ContentChange.objects.filter(content_id=project.id).count(), 3)
+        self.apply_async.assert_called_once_with(countdown=settings.CHATBOT_REINDEX_DEBOUNCE_SECONDS)
+
+    def test_edit_during_drain_schedules_next_drain(self):
+        # given
+        tasks.schedule_outbox_drain()
+
+        # when
+        with mock.patch("app.chat_bot.outbox.drain_changes"), mock.patch(
+            "app.chat_bot.rag_service.get_chatbot_service"
+        ):
+            tasks.drain_content_outbox()
+        tasks.schedule_outbox_drain()
+
+        # then
+        self.assertEqual(self.apply_async.call_count, 2)
+
+    def test_edit_is_not_recorded_when_transaction_rolls_back(self):
+        # when
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            Project.objects.create(name="쇼핑몰", project_type="e_commerce", description="설명")
+            raise RuntimeError("저장 실패")
+
+        # then
+        self.assertFalse(ContentChange.objects.exists())
+        self.apply_async.assert_not_called()
+
+
+@override_settings(**STUB_SERVICE_SETTINGS)
+class DrainContentOutboxTest(TestCase):
+    def setUp(self) -> None:
+        # given - 처리 작업은 브로커 대신 직접 실행
+        patcher = mock.patch.object(tasks.drain_content_outbox, "apply_async")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = build_stub_service()
+        patcher = mock.patch("app.chat_bot.rag_service.get_chatbot_service", return_value=self.service)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        category = Category.objects.create(name="회사 소개", category_type="company_info")
+        self.content = CompanyContent.objects.create(
+            title="회사 소개", content_type="company_basic", category=category, content="소개"
+        )
+        self.project = Project.objects.create(name="쇼핑몰", project_type="e_commerce", description="설명")
+
+    def _vector_ids(self):
+        return sorted(self.service.vector_store.get(include=[])["ids"])
+
+    def test_drain_embeds_changed_content(self):
+        # when
+        result = tasks.drain_content_outbox()
+
+        # then
+        self.assertEqual((result["processed"], result["embedded"]), (2, 2))
+        self.assertEqual(ChromaVector.objects.count(), 2)
+        self.assertFalse(ContentChange.objects.exists())
+
+    def test_delete_and_deactivation_remove_vectors(self):
+        # given
+        tasks.drain_content_outbox()
+        self.project.delete()
+        self.content.is_active = False
+        self.content.save()
+
+        # when
+        result = tasks.drain_content_outbox()
+
+        # then
+        self.assertEqual(result["removed"], 2)
+        self.assertEqual(self._vector_ids(), [])
+        self.assertFalse(ChromaVector.objects.exists())
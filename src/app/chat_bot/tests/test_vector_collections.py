@@ -0,0 +1,114 @@
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from app.chat_bot import vector_collections
+from app.chat_bot.benchmarks import StubEmbeddings
+from app.chat_bot.models import VectorCollection
+from app.chat_bot.tests.test_rag_service import STUB_SERVICE_SETTINGS, build_stub_service
+from app.chat_bot.vector_stores import NumpyVectorStore
+from app.knowledge_document.models import ChromaVector, Project
+
+
+@override_settings(**STUB_SERVICE_SETTINGS)
+class VectorCollectionSwapTest(TestCase):
+    def setUp(self) -> None:
+        # given - 컬렉션별 인메모리 저장소 (OpenAI/크로마 없이)
+        self.stores = {}
+        self.embeddings = StubEmbeddings(dimension=16)
+        for target, replacement in [
+            ("build_vector_store", self._store),
+            ("OpenAIEmbeddings", lambda model: self.embeddings),
+            ("drop_vector_store", self.stores.pop),
+        ]:
+            patcher = mock.patch.object(vector_collections, target, side_effect=replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.projects = [
+            Project.objects.create(name=f"프로젝트 {i}", project_type="web_development", description=f"설명 {i}")
+            for i in range(3)
+        ]
+        self.service = build_stub_service()
+        self.service.embed_all_content()
+
+    def _store(self, embeddings, collection_name=None):
+        return self.stores.setdefault(collection_name, NumpyVectorStore(embeddings))
+
+    def _ids(self, collection):
+        return set(self.stores[collection.name].get(include=[])["ids"])
+
+    def test_build_does_not_touch_live_collection(self):
+        # when
+        collection, problems = vector_collections.build_collection(self.service)
+
+        # then
+        self.assertEqual(problems, [])
+        self.assertEqual((collection.status, collection.document_count), ("ready", 3))
+        self.assertEqual(vector_collections.live_collection()[0], settings.CHATBOT_VECTOR_STORE_COLLECTION)
+        self.assertTrue(VectorCollection.objects.get(name=settings.CHATBOT_VECTOR_STORE_COLLECTION).is_live)
+
+    def test_activate_swaps_live_pointer(self):
+        # given
+        collection, _ = vector_collections.build_collection(self.service)
+
+        # when
+        vector_collections.activate_collection(collection)
+
+        # then
+        self.assertEqual(vector_collections.live_collection(), (collection.name, collection.embedding_model))
+        self.assertEqual(list(VectorCollection.objects.filter(is_live=True)), [collection])
+
+    def test_failed_collection_cannot_be_activated(self):
+        # given
+        collection = VectorCollection.objects.create(name="broken", embedding_model="stub", status="failed")
+
+        # when / then
+        with self.assertRaises(ValueError):
+            vector_collections.activate_collection(collection)
+
+    def test_activate_catches_up_changes_made_after_build(self):
+        # given - 빌드 후 교체 전에 수정/삭제된 원본
+        collection, _ = vector_collections.build_collection(self.service)
+        edited, deleted = self.projects[0], self.projects[1]
+        edited.description = "교체 전 수정"
+        edited.save()
+        deleted_vector_id = ChromaVector.objects.get(collection_name=collection.name, content_id=deleted.id).vector_id
+        deleted.delete()
+
+        # when
+        vector_collections.activate_collection(collection, self.service)
+
+        # then
+        rows = ChromaVector.objects.filter(collection_name=collection.name)
+        self.assertEqual(set(rows.values_list("content_id", flat=True)), {edited.id, self.projects[2].id})
+        self.assertNotIn(deleted_vector_id, self._ids(collection))
+        stored = self.stores[collection.name].get(ids=[rows.get(content_id=edited.id).vector_id], include=["documents"])
+        self.assertIn("교체 전 수정", stored["documents"][0])
+
+    def test_rollback_restores_previous_collection(self):
+        # given
+        collection, _ = vector_collections.build_collection(self.service)
+        vector_collections.activate_collection(collection)
+
+        # when
+        previous = vector_collections.rollback_collection()
+
+        # then
+        self.assertEqual(previous.name, settings.CHATBOT_VECTOR_STORE_COLLECTION)
+        self.assertEqual(vector_collections.live_collection()[0], settings.CHATBOT_VECTOR_STORE_COLLECTION)
+
+    def test_cleanup_keeps_recent_ready_collections(self):
+        # given
+        first, _ = vector_collections.build_collection(self.service)
+        failed = VectorCollection.objects.create(name="broken", embedding_model="stub", status="failed")
+        self.stores[failed.name] = NumpyVectorStore(self.embeddings)
+
+        # when
+        dropped = vector_collections.cleanup_collections(keep=1)
+
+        # then
+        self.assertEqual(dropped, ["broken"])
+        self.assertTrue(VectorCollection.objects.filter(pk=first.pk).exists())
+        self.assertNotIn("broken", self.stores)
@@ -0,0 +1,320 @@
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from app.chat_bot.vector_stores import IVFVectorStore, NumpyVectorStore, SnapshotVectorStore
+
+
+class NumpyVectorStoreTest(SimpleTestCase):
+    # 임베딩은 add_embeddings 로 직접 넣으므로 임베딩 함수가 필요 없다
+    EMBEDDINGS = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _add(self, store, ids):
+        store.add_embeddings(
+            texts=[f"{vector_id} 본문" for vector_id in ids],
+            embeddings=[self.EMBEDDINGS[int(vector_id[-1])] for vector_id in ids],
+            metadatas=[{"source_type": "project", "content_id": vector_id} for vector_id in ids],
+            ids=ids,
+        )
+
+    def test_persist_load_round_trip(self):
+        # given
+        store = NumpyVectorStore(None, persist_path=self.path)
+        self._add(store, ["project_0", "project_1", "project_2"])
+        store.delete(ids=["project_2"])
+
+        # when
+        store.persist()
+        loaded = NumpyVectorStore(None, persist_path=self.path)
+
+        # then
+        self.assertEqual(sorted(loaded.get(include=[])["ids"]), ["project_0", "project_1"])
+        document, score = loaded.similarity_search_by_vector_with_score([0.0, 1.0, 0.0], k=1)[0]
+        self.assertEqual(document.metadata["content_id"], "project_1")
+        self.assertEqual(document.page_content, "project_1 본문")
+        self.assertAlmostEqual(score, 1.0, places=5)
+
+    def test_concurrent_writers_are_merged(self):
+        # given - 같은 경로를 쓰는 두 프로세스
+        first = NumpyVectorStore(None, persist_path=self.path)
+        second = NumpyVectorStore(None, persist_path=self.path)
+        self._add(first, ["project_0"])
+        self._add(second, ["project_1"])
+
+        # when
+        first.persist()
+        second.persist()
+
+        # then
+        loaded = NumpyVectorStore(None, persist_path=self.path)
+        self.assertEqual(sorted(loaded.get(include=[])["ids"]), ["project_0", "project_1"])
+
+
+class NumpyVectorStoreSearchTest(SimpleTestCase):
+    def setUp(self) -> None:
+        # given - 임베딩은 add_embeddings 로 직접 넣는다
+        self.store = NumpyVectorStore(None)
+        self.store.add_embeddings(
+            texts=["쇼핑몰", "예약 앱", "회사 소개", "기술 블로그"],
+            embeddings=[[1.0, 0.0], [0.9, 0.1], [0.0, 1.0], [0.6, 0.8]],
+            metadatas=[
+                {"source_type": "project", "content_id": "1", "is_highlight": True, "team_size": 5},
+                {"source_type": "project", "content_id": "2", "is_highlight": False, "team_size": 2},
+                {"source_type": "company_content", "content_id": "3"},
+                {"source_type": "blog_post", "content_id": "4"},
+            ],
+            ids=["project_1", "project_2", "company_3", "blog_4"],
+        )
+
+    def _search(self, k=4, filter=None):
+        results = self.store.similarity_search_by_vector_with_score([1.0, 0.0], k=k, filter=filter)
+        return [document.metadata["content_id"] for document, _ in results]
+
+    def test_top_k_by_cosine_similarity(self):
+        # when
+        results = self.store.similarity_search_by_vector_with_score([2.0, 0.0], k=2)
+
+        # then - 저장/질문 벡터 모두 정규화되어 점수는 코사인 유사도
+        self.assertEqual([document.metadata["content_id"] for document, _ in results], ["1", "2"])
+        self.assertAlmostEqual(results[0][1], 1.0, places=5)
+        self.assertAlmostEqual(results[1][1], 0.9 / (0.9**2 + 0.1**2) ** 0.5, places=5)
+
+    def test_metadata_filters(self):
+        self.assertEqual(self._search(filter={"source_type": {"$in": ["company_content", "blog_post"]}}), ["4", "3"])
+        self.assertEqual(self._search(filter={"$and": [{"source_type": "project"}, {"is_highlight": False}]}), ["2"])
+        self.assertEqual(self._search(filter={"$or": [{"team_size": {"$gte": 5}}, {"content_id": "3"}]}), ["1", "3"])
+        self.assertEqual(self._search(filter={"source_type": "faq"}), [])
+
+    def test_unknown_filter_operator(self):
+        with self.assertRaises(ValueError):
+            self._search(filter={"team_size": {"$regex": "5"}})
+
+    def test_deleted_rows_are_not_returned(self):
+        # when
+        self.store.delete(ids=["project_1"])
+
+        # then
+        self.assertEqual(self._search(k=2), ["2", "4"])
+        self.assertEqual(self.store.count(), 3)
+
+
+class SnapshotVectorStoreTest(SimpleTestCase):
+    def setUp(self) -> None:
+        # given - 색인 워커가 쓰는 원본 저장소
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.root = Path(self.directory.name)
+        self.primary = NumpyVectorStore(None)
+        self._add(self.primary, "project_1", [1.0, 0.0])
+
+    @staticmethod
+    def _add(store, vector_id, embedding):
+        store.add_embeddings(
+            texts=[f"{vector_id} 본문"], embeddings=[embedding], metadatas=[{"content_id": vector_id}], ids=[vector_id]
+        )
+
+    def _ids(self, store):
+        return sorted(store.get(include=[])["ids"])
+
+    def test_boot_exports_and_memory_maps_snapshot(self):
+        # when
+        store = SnapshotVectorStore(None, primary=self.primary, root=self.root, check_interval=0)
+
+        # then
+        self.assertTrue((self.root / store.version / "vectors.f32").exists())
+        self.assertIsInstance(store._state.matrix, np.memmap)
+        document, score = store.similarity_search_by_vector_with_score([1.0, 0.0], k=1)[0]
+        self.assertEqual(document.metadata["content_id"], "project_1")
+        self.assertAlmostEqual(score, 1.0, places=5)
+
+    def test_writes_go_to_primary_and_local_overlay(self):
+        # given
+        store = SnapshotVectorStore(None, primary=self.primary, root=self.root, check_interval=0)
+
+        # when
+        self._add(store, "project_2", [0.0, 1.0])
+        store.delete(ids=["project_1"])
+
+        # then - 새 스냅샷을 내보내기 전에도 이 프로세스에서는 바로 보인다
+        self.assertEqual(self._ids(self.primary), ["project_2"])
+        self.assertEqual(self._ids(store), ["project_2"])
+
+    def test_other_worker_picks_up_exported_version(self):
+        # given - 같은 스냅샷을 연 두 워커
+        writer = SnapshotVectorStore(None, primary=self.primary, root=self.root, check_interval=0)
+        reader = SnapshotVectorStore(None, primary=NumpyVectorStore(None), root=self.root, check_interval=0)
+        self._add(writer, "project_2", [0.0, 1.0])
+        self.assertEqual(self._ids(reader), ["project_1"])
+
+        # when
+        version = writer.export()
+
+        # then - 버전 포인터가 바뀌면 다음 조회에서 교체
+        self.assertEqual(self._ids(reader), ["project_1", "project_2"])
+        self.assertEqual(reader.version, version)
+
+
+class QuantizedVectorStoreTest(SimpleTestCase):
+    def setUp(self) -> None:
+        # given - 서로 다른 방향의 임의 벡터
+        self.vectors = np.random.default_rng(0).normal(size=(200, 32)).astype(np.float32)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _store(self, dtype, persist_path=None, vectors=None):
+        vectors = self.vectors if vectors is None else vectors
+        store = NumpyVectorStore(None, persist_path=persist_path, dtype=dtype, rescore_factor=4)
+        store.add_embeddings(
+            texts=[str(i) for i in range(len(vectors))],
+            embeddings=vectors.tolist(),
+            metadatas=[{"row": i} for i in range(len(vectors))],
+            ids=[f"doc_{i}" for i in range(len(vectors))],
+        )
+        return store
+
+    @staticmethod
+    def _search(store, query, k=10):
+        return store.similarity_search_by_vector_with_score(query.tolist(), k=k)
+
+    def test_int8_rescores_with_full_precision(self):
+        # given
+        exact = self._store("float32")
+        quantized = self._store("int8", persist_path=Path(self.directory.name))
+        quantized.persist()
+        query = self.vectors[7] + 0.1
+
+        # when
+        expected = self._search(exact, query)
+        results = self._search(quantized, query)
+
+        # then - 재채점하므로 순서와 점수가 전체 정밀도 검색과 같다
+        self.assertEqual([doc.id for doc, _ in results], [doc.id for doc, _ in expected])
+        for (_, score), (_, expected_score) in zip(results, expected):
+            self.assertAlmostEqual(score, expected_score, places=5)
+        self.assertIsInstance(quantized._state.full, np.memmap)
+        self.assertLess(quantized.memory_bytes(), exact.memory_bytes() / 3)
+
+    def test_float16_keeps_top_results(self):
+        # given
+        exact = self._store("float32")
+        half = self._store("float16")
+
+        # when
+        query = self.vectors[3]
+        results = self._search(half, query, k=5)
+
+        # then
+        self.assertEqual(half._state.matrix.dtype, np.float16)
+        self.assertEqual([doc.id for doc, _ in results], [doc.id for doc, _ in self._search(exact, query, k=5)])
+
+    def test_append_does_not_requantize_existing_rows(self):
+        # given
+        store = self._store("int8", vectors=self.vectors[:100])
+        before = store._state.matrix[:100].copy(), store._state.scale[:100].copy()
+
+        # when - 값의 범위가 다른 새 문서 추가
+        store.add_embeddings(
+            texts=["new"], embeddings=[(self.vectors[100] * 1000).tolist()], metadatas=[{}], ids=["doc_new"]
+        )
+
+        # then - 행별 스케일이라 기존 행의 양자화 값은 그대로
+        np.testing.assert_array_equal(store._state.matrix[:100], before[0])
+        np.testing.assert_array_equal(store._state.scale[:100], before[1])
+        self.assertEqual(
+            store.similarity_search_by_vector_with_score(self.vectors[100].tolist(), k=1)[0][0].id, "doc_new"
+        )
+
+    def test_unknown_dtype(self):
+        with self.assertRaises(ValueError):
+            NumpyVectorStore(None, dtype="bfloat16")
+
+
+class IVFVectorStoreTest(SimpleTestCase):
+    def setUp(self) -> None:
+        # given - 군집이 있는 임베딩 (실제 문서 임베딩처럼 주제별로 모여 있다)
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(20, 32))
+        self.vectors = (centers[rng.integers(0, 20, 2000)] + 0.3 * rng.normal(size=(2000, 32))).astype(np.float32)
+        self.queries = (centers[rng.integers(0, 20, 20)] + 0.3 * rng.normal(size=(20, 32))).astype(np.float32)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _fill(self, store, vectors=None):
+        vectors = self.vectors if vectors is None else vectors
+        store.add_embeddings(
+            texts=[str(i) for i in range(len(vectors))],
+            embeddings=vectors.tolist(),
+            metadatas=[{"row": i} for i in range(len(vectors))],
+            ids=[f"doc_{i}" for i in range(len(vectors))],
+        )
+        return store
+
+    def _ivf(self, **kwargs):
+        options = {"nlist": 32, "nprobe": 4, "min_train_size": 100, "kmeans_iterations": 10}
+        options.update(kwargs)
+        return IVFVectorStore(None, **options)
+
+    @staticmethod
+    def _ids(store, query, k=10):
+        return [doc.id for doc, _ in store.similarity_search_by_vector_with_score(query.tolist(), k=k)]
+
+    def test_recall_against_brute_force(self):
+        # given
+        exact = self._fill(NumpyVectorStore(None))
+        ivf = self._fill(self._ivf())
+        ivf.train()
+
+        # when
+        hits = sum(len(set(self._ids(ivf, query)) & set(self._ids(exact, query))) for query in self.queries)
+
+        # then
+        self.assertIsNotNone(ivf._state.ann)
+        self.assertGreaterEqual(hits / (10 * len(self.queries)), 0.9)
+
+    def test_small_index_is_searched_exactly(self):
+        # given
+        store = self._fill(self._ivf(min_train_size=5000))
+
+        # then
+        self.assertIsNone(store._state.ann)
+        self.assertEqual(
+            self._ids(store, self.queries[0]), self._ids(self._fill(NumpyVectorStore(None)), self.queries[0])
+        )
+
+    def test_incremental_insert_is_assigned_without_retraining(self):
+        # given
+        store = self._fill(self._ivf())
+        centroids = store._state.ann.centroids
+
+        # when
+        store.add_embeddings(texts=["new"], embeddings=[self.queries[0].tolist()], metadatas=[{}], ids=["doc_new"])
+
+        # then
+        self.assertIs(store._state.ann.centroids, centroids)
+        self.assertEqual(len(store._state.ann.assignments), len(self.vectors) + 1)
+        self.assertEqual(self._ids(store, self.queries[0], k=1), ["doc_new"])
+
+    def test_persisted_index_is_loaded_without_retraining(self):
+        # given
+        path = Path(self.directory.name)
+        store = self._fill(self._ivf(persist_path=path))
+        store.persist()
+
+        # when
+        with mock.patch.object(IVFVectorStore, "_train") as train:
+            loaded = IVFVectorStore(None, persist_path=path, nlist=32, nprobe=4, min_train_size=100)
+
+        # then
+        train.assert_not_called()
+        np.testing.assert_array_equal(loaded._state.ann.centroids, store._state.ann.centroids)
+        self.assertEqual(self._ids(loaded, self.queries[0]), self._ids(store, self.queries[0]))
@@ -0,0 +1,125 @@
+import json
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from app.chat_bot.v1.views import ChatBotViewSet
+
+DONE_PAYLOAD = {
+    "answer": "안녕하세요",
+    "related_blogs": [],
+    "response_time_ms": 120.0,
+    "time_to_first_token_ms": 40.0,
+    "chat_log_id": "log-1",
+    "cached": False,
+    "timings": {"search": 10.0},
+    "hydration_query_count": 1,
+}
+
+
+def parse_sse(body: str):
+    """이벤트 스트림 → [(이벤트, 데이터)]"""
+    events = []
+    for block in body.strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        events.append((event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))))
+    return events
+
+
+class SendMessageStreamAPITest(APITestCase):
+    PATH = "/v1/chat_bot/send_message_stream/"
+
+    def setUp(self) -> None:
+        # given
+        self.service = mock.Mock()
+        self.service.stream_question.return_value = iter(
+            [("token", "안녕"), ("token", "하세요"), ("done", DONE_PAYLOAD)]
+        )
+        patcher = mock.patch("app.chat_bot.v1.views.get_chatbot_service", return_value=self.service)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_success_response(self):
+        # when
+        response = self.client.post(self.PATH, data={"message": "안녕?"}, format="json")
+
+        # then
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["X-Accel-Buffering"], "no")
+
+        events = parse_sse(b"".join(response.streaming_content).decode())
+        self.assertEqual(events[:2], [("token", {"text": "안녕"}), ("token", {"text": "하세요"})])
+        event, data = events[2]
+        self.assertEqual(event, "done")
+        self.assertEqual(data["question"], "안녕?")
+        self.assertEqual(data["timeToFirstTokenMs"], 40.0)
+        self.assertNotIn("answer", data)
+
+    def test_failure_response_empty_message(self):
+        # when
+        response = self.client.post(self.PATH, data={}, format="json")
+
+        # then
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.service.stream_question.assert_not_called()
+
+
+class ToSSETest(SimpleTestCase):
+    def test_error_during_generation_ends_with_error_event(self):
+        # given
+        def events():
+            yield "token", "안녕"
+            raise RuntimeError("OpenAI 연결 끊김")
+
+        # when
+        chunks = list(ChatBotViewSet._to_sse(events(), "안녕?"))
+
+        # then - 이미 보낸 토큰 뒤에 오류 이벤트로 스트림을 닫는다
+        self.assertEqual(
+            parse_sse("".join(chunks)),
+            [("token", {"text": "안녕"}), ("error", {"error": "답변 생성 중 오류가 발생했습니다."})],
+        )
+
+
+class SendMessageAsyncAPITest(TestCase):
+    PATH = "/v1/chat_bot/send_message_async/"
+
+    def setUp(self) -> None:
+        # given
+        self.service = mock.Mock()
+        self.service.aprocess_question = mock.AsyncMock(return_value={**DONE_PAYLOAD, "cached": True})
+        patcher = mock.patch("app.chat_bot.v1.views.get_chatbot_service", return_value=self.service)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_success_response(self):
+        # when
+        response = await self.async_client.post(
+            self.PATH, data={"message": "안녕?", "sessionId": "session-1"}, content_type="application/json"
+        )
+
+        # then
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.service.aprocess_question.assert_awaited_once_with("안녕?", "session-1")
+        data = json.loads(response.content)
+        self.assertEqual(data["answer"], "안녕하세요")
+        self.assertTrue(data["cached"])
+        self.assertEqual(data["hydrationQueryCount"], 1)
+
+    async def test_failure_response_empty_message(self):
+        # when
+        response = await self.async_client.post(self.PATH, data={}, content_type="application/json")
+
+        # then
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.service.aprocess_question.assert_not_awaited()
+
+    async def test_failure_response_method_not_allowed(self):
+        # when
+        response = await self.async_client.get(self.PATH)
+
+        # then
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
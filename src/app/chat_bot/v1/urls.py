@@ -1,11 +1,12 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from app.chat_bot.v1.views import ChatBotViewSet
+from app.chat_bot.v1.views import ChatBotViewSet, send_message_async
 
 router = DefaultRouter()
 router.register("chat_bot", ChatBotViewSet, basename="chat_bot")
 
 urlpatterns = [
+    path("chat_bot/send_message_async/", send_message_async, name="chat_bot-send-message-async"),
     path("", include(router.urls)),
 ]
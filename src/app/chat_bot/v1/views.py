@@ -1,11 +1,15 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from djangorestframework_camel_case.util import camelize, underscoreize
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from app.chat_bot.models import ChatMessage, ChatSession
-from app.chat_bot.rag_service import CompanyChatbotService
-# from app.chat_bot.rag_service import get_rag_service
+from app.chat_bot.rag_service import get_chatbot_service
 from app.chat_bot.v1.serializers import ChatSessionSerializer, SendMessageSerializer
 
 
@@ -19,7 +23,7 @@ class ChatBotViewSet(viewsets.ViewSet):
             return Response({"error": "질문을 입력해주세요."}, status=status.HTTP_400_BAD_REQUEST)
 
         # 챗봇 서비스 실행
-        chatbot = CompanyChatbotService()
+        chatbot = get_chatbot_service()
         result = chatbot.process_question(user_question, session_id)
 
         return Response(
@@ -29,5 +33,92 @@ class ChatBotViewSet(viewsets.ViewSet):
                 "related_blogs": result["related_blogs"],
                 "response_time_ms": result["response_time_ms"],
                 "chat_log_id": result["chat_log_id"],
+                "cached": result["cached"],
+                "timings": result["timings"],
+                "hydration_query_count": result["hydration_query_count"],
             }
         )
+
+    @action(detail=False, methods=["post"])
+    def send_message_stream(self, request):
+        """send_message 의 Server-Sent Events 버전 - 답변 토큰을 생성되는 대로 전송"""
+        user_question = request.data.get("message")
+        session_id = request.data.get("session_id")
+
+        if not user_question:
+            return Response({"error": "질문을 입력해주세요."}, status=status.HTTP_400_BAD_REQUEST)
+
+        chatbot = get_chatbot_service()
+        events = chatbot.stream_question(user_question, session_id)
+
+        response = StreamingHttpResponse(self._to_sse(events, user_question), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # nginx 프록시 버퍼링 비활성화
+        return response
+
+    @staticmethod
+    def _to_sse(events, user_question):
+        try:
+            for event, payload in events:
+                if event == "token":
+                    data = {"text": payload}
+                else:
+                    data = {
+                        "question": user_question,
+                        "related_blogs": payload["related_blogs"],
+                        "response_time_ms": payload["response_time_ms"],
+                        "time_to_first_token_ms": payload["time_to_first_token_ms"],
+                        "chat_log_id": payload["chat_log_id"],
+                        "cached": payload["cached"],
+                        "timings": payload["timings"],
+                        "hydration_query_count": payload["hydration_query_count"],
+                    }
+                yield f"event: {event}\ndata: {json.dumps(camelize(data), ensure_ascii=False)}\n\n"
+        except Exception as e:
+            print(f"⚠️ 스트리밍 답변 생성 실패: {e}")
+            yield f"event: error\ndata: {json.dumps({'error': '답변 생성 중 오류가 발생했습니다.'}, ensure_ascii=False)}\n\n"
+
+
+async def send_message_async(request):
+    """send_message 의 비동기 버전 (ASGI 전용)
+
+    DRF ViewSet 은 async 핸들러를 지원하지 않으므로 Django async 뷰로 구현한다.
+    OpenAI 응답을 기다리는 동안 이벤트 루프가 다른 대화를 처리할 수 있다.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST 요청만 지원합니다."}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    try:
+        data = underscoreize(json.loads(request.body or b"{}"))
+    except ValueError:
+        return JsonResponse({"error": "잘못된 요청 형식입니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+    user_question = data.get("message")
+    session_id = data.get("session_id")
+
+    if not user_question:
+        return JsonResponse({"error": "질문을 입력해주세요."}, status=status.HTTP_400_BAD_REQUEST)
+
+    # 첫 요청에서는 서비스 생성(ORM 조회, 클라이언트 초기화)을 하므로 이벤트 루프 밖에서
+    chatbot = await sync_to_async(get_chatbot_service, thread_sensitive=False)()
+    result = await chatbot.aprocess_question(user_question, session_id)
+
+    return JsonResponse(
+        camelize(
+            {
+                "question": user_question,
+                "answer": result["answer"],
+                "related_blogs": result["related_blogs"],
+                "response_time_ms": result["response_time_ms"],
+                "chat_log_id": result["chat_log_id"],
+                "cached": result["cached"],
+                "timings": result["timings"],
+                "hydration_query_count": result["hydration_query_count"],
+            }
+        ),
+        json_dumps_params={"ensure_ascii": False},
+    )
+
+
+# Django 4.2 의 csrf_exempt 데코레이터는 async 뷰를 동기 함수로 감싸버리므로 속성만 지정
+send_message_async.csrf_exempt = True
@@ -0,0 +1,217 @@
+# 벡터 컬렉션 블루/그린 빌드 - 새 컬렉션을 백그라운드로 채우고 검증 후 사용 중 포인터(is_live)를 한 번에 교체
+
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from langchain.embeddings import OpenAIEmbeddings
+
+from app.chat_bot.answer_cache import bump_kb_version
+from app.chat_bot.chunking import chunk_vector_ids
+from app.chat_bot.indexing import ContentIndexer
+from app.chat_bot.models import VectorCollection
+from app.chat_bot.vector_stores import SnapshotVectorStore, build_vector_store, drop_vector_store
+from app.knowledge_document.models import ChromaVector
+
+LIVE_COLLECTION_CACHE_KEY = "chat_bot:live_collection"
+
+
+def _cache():
+    return caches[settings.CHATBOT_CACHE_ALIAS]
+
+
+def live_collection() -> Tuple[str, str]:
+    """사용 중인 (컬렉션명, 임베딩 모델) - 워커들은 공유 캐시로 교체를 확인한다
+
+    아직 빌드 기록이 없으면 기존 설정의 컬렉션(CHATBOT_VECTOR_STORE_COLLECTION)을 쓴다.
+    """
+    cached = _cache().get(LIVE_COLLECTION_CACHE_KEY)
+    if cached:
+        return tuple(cached)
+
+    default = (settings.CHATBOT_VECTOR_STORE_COLLECTION, settings.CHATBOT_EMBEDDING_MODEL)
+    try:
+        live = VectorCollection.objects.filter(is_live=True).values_list("name", "embedding_model").first()
+    except DatabaseError:
+        # 마이그레이션 전 등 - 캐시에 남기지 않고 기본 컬렉션 사용
+        return default
+    live = tuple(live) if live else default
+    _cache().set(LIVE_COLLECTION_CACHE_KEY, live, timeout=None)
+    return live
+
+
+def register_default_collection():
+    """빌드 기록이 없을 때 기존 컬렉션을 사용 중 컬렉션으로 등록 (첫 교체 후 롤백할 수 있도록)"""
+    if VectorCollection.objects.filter(is_live=True).exists():
+        return
+    name = settings.CHATBOT_VECTOR_STORE_COLLECTION
+    rows = ChromaVector.objects.filter(collection_name=name)
+    VectorCollection.objects.get_or_create(
+        name=name,
+        defaults={
+            "embedding_model": settings.CHATBOT_EMBEDDING_MODEL,
+            "status": "ready",
+            "is_live": True,
+            "document_count": rows.count(),
+            "activated_at": timezone.now(),
+        },
+    )
+
+
+# =================== 빌드 / 검증 ===================
+
+
+def validate_collection(collection: VectorCollection, vector_store, summary: Dict[str, Any]) -> List[str]:
+    """새 컬렉션 검증 - 문제 목록 (비어 있으면 통과)
+
+    - 임베딩 실패 없음
+    - 색인 대상 원본이 모두 ChromaVector 행을 가짐
+    - 행이 가리키는 벡터 id 집합과 저장소의 id 집합이 일치
+    - 표본 벡터로 검색하면 자기 자신의 원본이 1위 (CHATBOT_VECTOR_COLLECTION_MIN_SELF_MATCH 비율 이상)
+    """
+    problems = []
+    if summary["failed"]:
+        problems.append(f"임베딩 실패 {summary['failed']}개")
+
+    rows = ChromaVector.objects.filter(collection_name=collection.name)
+    live_count = sum(queryset.count() for queryset in ContentIndexer.sources().values())
+    if rows.count() != live_count:
+        problems.append(f"색인된 원본 {rows.count()}개 / 전체 {live_count}개")
+
+    expected_ids = {
+        chunk_id
+        for vector_id, chunk_count in rows.values_list("vector_id", "chunk_count")
+        for chunk_id in chunk_vector_ids(vector_id, chunk_count)
+    }
+    store_ids = set(vector_store.get(include=[])["ids"])
+    if store_ids != expected_ids:
+        problems.append(f"벡터 불일치 (누락 {len(expected_ids - store_ids)}개, 초과 {len(store_ids - expected_ids)}개)")
+
+    sample_ids = random.sample(sorted(store_ids), min(len(store_ids), 20))
+    if sample_ids:
+        sample = vector_store.get(ids=sample_ids, include=["embeddings", "metadatas"])
+        matched = 0
+        for embedding, metadata in zip(sample["embeddings"], sample["metadatas"]):
+            found = vector_store.similarity_search_by_vector(list(embedding), k=1)
+            matched += bool(found) and found[0].metadata.get("content_id") == metadata.get("content_id")
+        ratio = matched / len(sample_ids)
+        if ratio < settings.CHATBOT_VECTOR_COLLECTION_MIN_SELF_MATCH:
+            problems.append(f"표본 자기 검색 일치율 {ratio:.0%}")
+
+    collection.document_count = rows.count()
+    collection.vector_count = len(store_ids)
+    return problems
+
+
+def build_collection(service, embedding_model: str = None) -> Tuple[VectorCollection, List[str]]:
+    """새 컬렉션에 전체 컨텐츠를 임베딩하고 검증 (사용 중인 컬렉션은 건드리지 않음)"""
+    register_default_collection()
+    embedding_model = embedding_model or settings.CHATBOT_EMBEDDING_MODEL
+    name = f"{settings.CHATBOT_VECTOR_STORE_COLLECTION}_{timezone.now():%Y%m%d%H%M%S}"
+    collection = VectorCollection.objects.create(name=name, embedding_model=embedding_model)
+    print(f"🏗️ 새 벡터 컬렉션 빌드 시작: {name} ({embedding_model})")
+
+    try:
+        vector_store = build_vector_store(OpenAIEmbeddings(model=embedding_model), collection_name=name)
+        summary = ContentIndexer(service, force=True, vector_store=vector_store, collection_name=name).run()
+        vector_store.persist()
+        if isinstance(vector_store, SnapshotVectorStore):
+            # 교체 후 워커들이 바로 읽을 수 있도록 새 컬렉션의 스냅샷을 내보낸다
+            vector_store.export()
+        problems = validate_collection(collection, vector_store, summary)
+    except Exception:
+        collection.status = "failed"
+        collection.save(update_fields=["status"])
+        raise
+
+    collection.status = "failed" if problems else "ready"
+    collection.save(update_fields=["status", "document_count", "vector_count"])
+    print(f"{'⚠️ 검증 실패' if problems else '✅ 검증 통과'}: {name} {', '.join(problems)}")
+    return collection, problems
+
+
+# =================== 교체 / 롤백 / 정리 ===================
+
+
+def catch_up_collection(service, collection: VectorCollection) -> Dict[str, Any]:
+    """교체 전에 빌드 이후(롤백이면 사용하지 않던 동안) 바뀐 원본을 컬렉션에 반영
+
+    - 빌드 중 수정되어 needs_update 로 표시된 문서(_mark_changed_since_collect)와 해시가 바뀐 문서는 다시 임베딩
+    - 그 사이 삭제/비활성화된 원본의 행과 벡터는 삭제
+    """
+    vector_store = build_vector_store(
+        OpenAIEmbeddings(model=collection.embedding_model), collection_name=collection.name
+    )
+    summary = ContentIndexer(service, vector_store=vector_store, collection_name=collection.name).run()
+
+    rows = ChromaVector.objects.filter(collection_name=collection.name)
+    dead_rows = []
+    for content_type, queryset in ContentIndexer.sources().items():
+        dead_rows += rows.filter(content_type=content_type).exclude(content_id__in=queryset.values("id"))
+    if dead_rows:
+        vector_store.delete(
+            ids=[vector_id for row in dead_rows for vector_id in chunk_vector_ids(row.vector_id, row.chunk_count)]
+        )
+        vector_store.persist()
+        rows.filter(pk__in=[row.pk for row in dead_rows]).delete()
+
+    changed = summary["embedded"] or summary["refreshed_cards"] or dead_rows
+    if isinstance(vector_store, SnapshotVectorStore) and changed:
+        vector_store.export()
+    summary["removed"] = len(dead_rows)
+    print(f"🔁 교체 전 컬렉션 따라잡기: {collection.name} 임베딩 {summary['embedded']}개, 삭제 {len(dead_rows)}개")
+    return summary
+
+
+def activate_collection(collection: VectorCollection, service=None):
+    """사용 중 포인터를 한 트랜잭션에서 교체 (부분 유니크 제약으로 사용 중 컬렉션은 항상 하나)
+
+    service 가 주어지면 교체 전에 catch_up_collection 으로 그동안 바뀐 원본을 먼저 반영한다.
+    """
+    if collection.status != "ready":
+        raise ValueError(f"검증을 통과한 컬렉션만 사용할 수 있습니다: {collection.name} ({collection.status})")
+    if service is not None:
+        catch_up_collection(service, collection)
+
+    with transaction.atomic():
+        # 동시에 교체하는 다른 프로세스와 순서를 맞추도록 현재 사용 중인 행을 잠근다
+        list(VectorCollection.objects.select_for_update().filter(is_live=True))
+        VectorCollection.objects.filter(is_live=True).update(is_live=False)
+        VectorCollection.objects.filter(pk=collection.pk).update(is_live=True, activated_at=timezone.now())
+
+    _cache().set(LIVE_COLLECTION_CACHE_KEY, (collection.name, collection.embedding_model), timeout=None)
+    # 이전 컬렉션 기준으로 캐시된 답변 무효화
+    bump_kb_version()
+    print(f"🔀 사용 중 벡터 컬렉션 교체: {collection.name}")
+
+
+def rollback_collection(service=None) -> Optional[VectorCollection]:
+    """직전에 사용하던 컬렉션으로 되돌림"""
+    previous = (
+        VectorCollection.objects.filter(is_live=False, status="ready", activated_at__isnull=False)
+        .order_by("-activated_at")
+        .first()
+    )
+    if previous is not None:
+        activate_collection(previous, service)
+    return previous
+
+
+def cleanup_collections(keep: int = None) -> List[str]:
+    """사용 중이 아닌 컬렉션 정리 - 롤백용으로 최근 keep 개의 검증 완료 컬렉션은 남긴다"""
+    keep = settings.CHATBOT_VECTOR_COLLECTION_KEEP if keep is None else keep
+    candidates = VectorCollection.objects.filter(is_live=False, status__in=["ready", "failed"]).order_by("-created_at")
+    kept, dropped = 0, []
+    for collection in candidates:
+        if collection.status == "ready" and kept < keep:
+            kept += 1
+            continue
+        drop_vector_store(collection.name)
+        ChromaVector.objects.filter(collection_name=collection.name).delete()
+        collection.delete()
+        dropped.append(collection.name)
+        print(f"🗑️ 벡터 컬렉션 삭제: {collection.name}")
+    return dropped
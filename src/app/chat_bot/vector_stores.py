@@ -0,0 +1,1080 @@
+# 벡터 저장소 백엔드 - CompanyChatbotService 가 사용하는 공통 인터페이스
+# (add_documents / similarity_search / as_retriever + get / add_embeddings / update_metadatas / count / persist)
+
+import fcntl
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from langchain.vectorstores import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+CHROMA_MAX_BATCH_SIZE = 5000
+STORAGE_DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+SCORE_CHUNK_ROWS = 8192
+VERSION_POINTER = "CURRENT"
+
+
+class ChromaVectorStore(Chroma):
+    """기존 크로마 저장소 + 공통 인터페이스 메서드"""
+
+    def add_embeddings(
+        self, texts: List[str], embeddings: List[List[float]], metadatas: List[dict], ids: List[str]
+    ) -> List[str]:
+        """이미 계산된 임베딩을 그대로 upsert (임베딩 API 호출 없음)"""
+        for start in range(0, len(ids), CHROMA_MAX_BATCH_SIZE):
+            end = start + CHROMA_MAX_BATCH_SIZE
+            self._collection.upsert(
+                ids=ids[start:end],
+                embeddings=embeddings[start:end],
+                metadatas=metadatas[start:end],
+                documents=texts[start:end],
+            )
+        return ids
+
+    def update_metadatas(self, ids: List[str], metadatas: List[dict]):
+        self._collection.update(ids=ids, metadatas=metadatas)
+
+    def count(self) -> int:
+        return self._collection.count()
+
+    def persist(self):
+        # 크로마는 쓰기 시점에 자동으로 저장된다
+        pass
+
+    def similarity_search_by_vector_with_score(
+        self, embedding: List[float], k: int = 4, filter: Optional[dict] = None
+    ) -> List[Tuple[Document, float]]:
+        """(문서, 코사인 유사도) - NumpyVectorStore 와 같은 점수 척도
+
+        크로마는 거리를 돌려주므로 유사도로 바꾼다. 기본 거리(제곱 L2)는 정규화된 임베딩에서 2 - 2·cos 이다.
+        """
+        space = (self._collection.metadata or {}).get("hnsw:space", "l2")
+        results = self.similarity_search_by_vector_with_relevance_scores(embedding, k=k, filter=filter)
+        if space == "l2":
+            return [(doc, 1.0 - distance / 2) for doc, distance in results]
+        return [(doc, 1.0 - distance) for doc, distance in results]
+
+
+class _IndexState:
+    """검색 중인 스레드가 보는 인덱스 스냅샷
+
+    쓰기는 항상 새 _IndexState 를 만들어 교체하므로 읽는 쪽은 락 없이 일관된 상태를 본다.
+    행렬/리스트는 여유 용량을 두고 뒤에 덧붙이기만 하며, 삭제는 valid 마스크로 표시한다.
+    양자화 저장 시 matrix 는 float16/int8 이고 full 에 원본 float32 (디스크 mmap 일 수 있음), scale 에 int8 행별 스케일을 둔다.
+    """
+
+    def __init__(self, matrix, valid, size, ids, documents, metadatas, full=None, scale=None):
+        self.matrix = matrix
+        self.full = matrix if full is None else full
+        self.scale = scale
+        self.ann = None  # 근사 검색용 보조 인덱스 (IVFVectorStore)
+        self.valid = valid
+        self.size = size
+        self.ids = ids
+        self.documents = documents
+        self.metadatas = metadatas
+        self.columns: Dict[str, np.ndarray] = {}
+
+    def column(self, key: str) -> np.ndarray:
+        """메타데이터 키 하나를 object 배열로 (상태별로 한 번만 생성)"""
+        if key not in self.columns:
+            values = np.empty(self.size, dtype=object)
+            values[:] = [metadata.get(key) for metadata in self.metadatas[: self.size]]
+            self.columns[key] = values
+        return self.columns[key]
+
+
+@contextmanager
+def _directory_lock(root: Path, exclusive: bool = True):
+    """버전 디렉터리 파일 락 - 새 버전 쓰기는 배타, 읽기는 공유 (읽는 중인 버전이 정리되지 않도록)"""
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / ".lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _read_version(root: Path) -> Optional[str]:
+    try:
+        return (root / VERSION_POINTER).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _publish_version(root: Path, write: Callable[[Path, str], None], keep: int) -> str:
+    """새 버전 디렉터리를 임시 이름으로 다 쓴 뒤 디렉터리 → CURRENT 포인터 순서로 교체
+
+    읽는 쪽은 포인터가 가리키는 디렉터리 안의 파일만 읽으므로 서로 다른 버전의 파일을 섞어 읽지 않는다.
+    """
+    version = str(time.time_ns())
+    root.mkdir(parents=True, exist_ok=True)
+    tmp_dir = root / f".{version}.tmp"
+    tmp_dir.mkdir()
+    write(tmp_dir, version)
+
+    os.replace(tmp_dir, root / version)
+    pointer_tmp = root / f".{VERSION_POINTER}.{version}.tmp"
+    pointer_tmp.write_text(version)
+    os.replace(pointer_tmp, root / VERSION_POINTER)
+
+    # 이미 mmap 으로 열린 이전 버전은 삭제되어도 닫힐 때까지 유효하다
+    versions = sorted(
+        (path for path in root.iterdir() if path.is_dir() and path.name.isdigit()), key=lambda path: int(path.name)
+    )
+    for old in versions[:-keep]:
+        shutil.rmtree(old, ignore_errors=True)
+    return version
+
+
+def _elementwise(values: np.ndarray, predicate) -> np.ndarray:
+    return np.fromiter((predicate(value) for value in values), dtype=bool, count=len(values))
+
+
+class NumpyVectorStore(VectorStore):
+    """정규화된 float32 임베딩을 연속된 NumPy 행렬 하나에 보관하는 인프로세스 벡터 저장소
+
+    top-k 검색은 행렬-벡터 곱 한 번과 argpartition 으로 처리한다.
+    메타데이터 필터는 크로마의 where 문법(키: 값, $eq/$ne/$in/$nin/$gt/$gte/$lt/$lte, $and/$or)을 지원하며
+    점수 계산 전에 후보 행을 줄이는 데 사용된다.
+
+    dtype 을 float16/int8 로 주면 검색용 행렬만 양자화해 메모리에 두고, 원본 float32 는 persist 후 디스크 mmap 으로 연다.
+    int8 은 행별 스케일로 스칼라 양자화하며 (새 행만 양자화하고 기존 행은 다시 양자화하지 않는다), 근사 점수 상위 k * rescore_factor 개를 원본 벡터로 다시 채점한다.
+
+    persist_path 아래에는 <version>/ 디렉터리(vectors.npy, records.json)와 CURRENT 포인터를 둔다.
+    여러 프로세스(웹 워커, 색인 워커)가 같은 경로를 쓰므로 persist() 는 파일 락 안에서 최신 버전에
+    이 프로세스의 저장 전 변경(_pending)만 다시 적용해 저장하고, 검색 시 sync_interval 마다 새 버전을 받아온다.
+    """
+
+    def __init__(
+        self,
+        embedding_function: Embeddings,
+        persist_path: Optional[Path] = None,
+        dtype: str = "float32",
+        rescore_factor: int = None,
+    ):
+        if dtype not in STORAGE_DTYPES:
+            raise ValueError(f"지원하지 않는 저장 dtype 입니다: {dtype}")
+        self._embedding = embedding_function
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.dtype = dtype
+        self.rescore_factor = rescore_factor or settings.CHATBOT_VECTOR_RESCORE_FACTOR
+
+        self.sync_interval = settings.CHATBOT_VECTOR_STORE_SYNC_INTERVAL
+
+        self._write_lock = threading.RLock()
+        self._id_to_row: Dict[str, int] = {}
+        self._deleted = 0
+        self._state = _IndexState(np.zeros((0, 0), dtype=np.float32), np.zeros(0, dtype=bool), 0, [], [], [])
+        # 마지막으로 읽거나 쓴 디스크 버전과 그 이후 이 프로세스의 변경 (id → True: 추가/수정, False: 삭제)
+        self._disk_version: Optional[str] = None
+        self._pending: Dict[str, bool] = {}
+        self._synced_at = 0.0
+
+        # vectors.npy 는 버전 디렉터리 도입 전 형식
+        if self.persist_path and (_read_version(self.persist_path) or (self.persist_path / "vectors.npy").exists()):
+            self.load()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    # =================== 쓰기 ===================
+
+    def add_texts(
+        self, texts: Iterable[str], metadatas: Optional[List[dict]] = None, ids: Optional[List[str]] = None, **kwargs
+    ) -> List[str]:
+        texts = list(texts)
+        embeddings = self._embedding.embed_documents(texts)
+        return self.add_embeddings(texts, embeddings, metadatas or [{} for _ in texts], ids)
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[dict],
+        ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        ids = list(ids) if ids else [str(uuid.uuid4()) for _ in texts]
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+
+        with self._write_lock:
+            state = self._state
+            valid = self._tombstone(state, [vector_id for vector_id in ids if vector_id in self._id_to_row])
+
+            matrix, full, valid = self._ensure_capacity(state, valid, len(ids), vectors.shape[1])
+            start, end = state.size, state.size + len(ids)
+            full[start:end] = vectors
+            valid[start:end] = True
+            matrix, scale = self._store_rows(matrix, full, state.scale, start, end)
+
+            # 리스트는 검색 중인 스냅샷과 공유하지 않도록 새로 만든다
+            new_ids = state.ids + ids
+            new_documents = state.documents + list(texts)
+            new_metadatas = state.metadatas + [dict(metadata or {}) for metadata in metadatas]
+            for offset, vector_id in enumerate(ids):
+                self._id_to_row[vector_id] = start + offset
+
+            self._swap_state(
+                _IndexState(matrix, valid, end, new_ids, new_documents, new_metadatas, full=full, scale=scale),
+                previous=state,
+                start=start,
+            )
+            self._record_pending(ids, True)
+            self._compact_if_needed()
+        return ids
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs) -> Optional[bool]:
+        if not ids:
+            return False
+        with self._write_lock:
+            state = self._state
+            present = [vector_id for vector_id in ids if vector_id in self._id_to_row]
+            if present:
+                new_state = _IndexState(
+                    state.matrix,
+                    self._tombstone(state, present),
+                    state.size,
+                    state.ids,
+                    state.documents,
+                    state.metadatas,
+                    full=state.full,
+                    scale=state.scale,
+                )
+                # 메타데이터는 그대로이므로 필터용 컬럼도 공유
+                new_state.columns = state.columns
+                self._swap_state(new_state, previous=state, start=state.size)
+            # 이 프로세스에 없는 id 도 다른 프로세스가 저장한 버전에는 있을 수 있다
+            self._record_pending(ids, False)
+            self._compact_if_needed()
+        return True
+
+    def update_metadatas(self, ids: List[str], metadatas: List[dict]):
+        with self._write_lock:
+            state = self._state
+            new_metadatas = list(state.metadatas)
+            for vector_id, metadata in zip(ids, metadatas):
+                if vector_id in self._id_to_row:
+                    new_metadatas[self._id_to_row[vector_id]] = dict(metadata)
+            self._record_pending([vector_id for vector_id in ids if vector_id in self._id_to_row], True)
+            self._swap_state(
+                _IndexState(
+                    state.matrix,
+                    state.valid,
+                    state.size,
+                    state.ids,
+                    state.documents,
+                    new_metadatas,
+                    full=state.full,
+                    scale=state.scale,
+                ),
+                previous=state,
+                start=state.size,
+            )
+
+    def _record_pending(self, ids: List[str], alive: bool):
+        if self.persist_path is not None:
+            self._pending.update(dict.fromkeys(ids, alive))
+
+    def _swap_state(
+        self,
+        state: _IndexState,
+        previous: Optional[_IndexState] = None,
+        start: int = 0,
+        carried_rows: Optional[np.ndarray] = None,
+    ):
+        """새 상태를 보조 인덱스까지 만든 뒤 교체
+
+        state 의 [0, start) 행은 previous 의 carried_rows 행(없으면 같은 번호의 행)과 같고 [start, size) 가 새 행이다.
+        """
+        self._index_rows(state, previous, start, carried_rows)
+        self._state = state
+
+    def _index_rows(
+        self,
+        state: _IndexState,
+        previous: Optional[_IndexState],
+        start: int,
+        carried_rows: Optional[np.ndarray],
+    ):
+        """하위 클래스가 근사 검색용 보조 인덱스를 갱신하는 지점 (기본은 전수 검색이라 할 일 없음)"""
+
+    def _tombstone(self, state: _IndexState, ids: List[str]) -> np.ndarray:
+        """ids 행을 지운 valid 사본 - 검색 중인 스냅샷의 valid 는 건드리지 않는다 (copy-on-write)"""
+        if not ids:
+            return state.valid
+        valid = state.valid.copy()
+        for vector_id in ids:
+            valid[self._id_to_row.pop(vector_id)] = False
+            self._deleted += 1
+        return valid
+
+    def _ensure_capacity(
+        self, state: _IndexState, valid: np.ndarray, extra: int, dimension: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(검색용 행렬, 원본 float32 행렬, valid) - 용량이 모자라면 두 배로 늘린 새 배열
+
+        용량이 충분하면 기존 배열의 size 이후 행에만 쓰므로 검색 중인 스냅샷(행 범위 [0, size))에는 보이지 않는다.
+        """
+        matrix, full = state.matrix, state.full
+        if state.size + extra <= len(matrix) and (state.size == 0 or matrix.shape[1] == dimension):
+            return matrix, full, valid
+
+        capacity = max(1024, 2 * (state.size + extra))
+        new_full = np.zeros((capacity, dimension), dtype=np.float32)
+        new_valid = np.zeros(capacity, dtype=bool)
+        new_matrix = new_full
+        if self.dtype != "float32":
+            new_matrix = np.zeros((capacity, dimension), dtype=STORAGE_DTYPES[self.dtype])
+
+        if state.size:
+            new_full[: state.size] = full[: state.size]
+            new_valid[: state.size] = valid[: state.size]
+            if new_matrix is not new_full:
+                new_matrix[: state.size] = matrix[: state.size]
+        return new_matrix, new_full, new_valid
+
+    def _store_rows(
+        self, matrix: np.ndarray, full: np.ndarray, scale: Optional[np.ndarray], start: int, end: int
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """full[start:end] 을 검색용 행렬에 저장 dtype 으로 기록"""
+        if self.dtype == "float32":
+            return matrix, None
+        if self.dtype == "float16":
+            matrix[start:end] = full[start:end].astype(np.float16)
+            return matrix, None
+
+        # int8 - 행별 스케일이라 새 행만 양자화한다 (용량이 늘어 행렬이 새 배열이면 스케일도 새 배열로)
+        if scale is None or len(scale) != len(matrix):
+            grown = np.ones(len(matrix), dtype=np.float32)
+            if scale is not None:
+                grown[:start] = scale[:start]
+            scale = grown
+        scale[start:end] = self._int8_scale(full[start:end])
+        matrix[start:end] = self._quantize_int8(full[start:end], scale[start:end])
+        return matrix, scale
+
+    @staticmethod
+    def _int8_scale(vectors: np.ndarray) -> np.ndarray:
+        """행마다 최대 절댓값이 127 이 되도록 하는 스케일"""
+        return np.maximum(np.abs(vectors).max(axis=1), 1e-12).astype(np.float32) / 127
+
+    @staticmethod
+    def _quantize_int8(vectors: np.ndarray, scale: np.ndarray) -> np.ndarray:
+        return np.clip(np.rint(vectors / scale[:, None]), -127, 127).astype(np.int8)
+
+    def _quantized_state(self, full: np.ndarray, size: int, **records) -> _IndexState:
+        """원본 float32 행렬(메모리 또는 mmap)로부터 저장 dtype 의 검색 상태 생성"""
+        valid = np.zeros(len(full), dtype=bool)
+        valid[:size] = True
+        if self.dtype == "float32":
+            return _IndexState(full, valid, size, **records)
+        if self.dtype == "float16":
+            return _IndexState(np.array(full, dtype=np.float16), valid, size, full=full, **records)
+        scale = np.ones(len(full), dtype=np.float32)
+        matrix = np.zeros(full.shape, dtype=np.int8)
+        if size:
+            scale[:size] = self._int8_scale(full[:size])
+            matrix[:size] = self._quantize_int8(full[:size], scale[:size])
+        return _IndexState(matrix, valid, size, full=full, scale=scale, **records)
+
+    def memory_bytes(self) -> int:
+        """프로세스 메모리에 올라가는 벡터 크기 (mmap 된 원본은 페이지 캐시로 공유되므로 제외)"""
+        state = self._state
+        arrays = [state.matrix] if state.full is state.matrix else [state.matrix, state.full]
+        return sum(array.nbytes for array in arrays if not isinstance(array, np.memmap))
+
+    def _compact_if_needed(self):
+        """삭제된 행이 1/4 을 넘으면 살아있는 행만 모아 새 행렬로 교체"""
+        state = self._state
+        if not self._deleted or self._deleted * 4 < state.size:
+            return
+
+        rows = np.flatnonzero(state.valid[: state.size])
+        full = np.zeros((max(1024, 2 * len(rows)), state.full.shape[1]), dtype=np.float32)
+        full[: len(rows)] = state.full[rows]
+
+        ids = [state.ids[row] for row in rows]
+        self._id_to_row = {vector_id: row for row, vector_id in enumerate(ids)}
+        self._deleted = 0
+        self._swap_state(
+            self._quantized_state(
+                full,
+                len(rows),
+                ids=ids,
+                documents=[state.documents[row] for row in rows],
+                metadatas=[state.metadatas[row] for row in rows],
+            ),
+            previous=state,
+            start=len(rows),
+            carried_rows=rows,
+        )
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    # =================== 검색 ===================
+
+    def similarity_search(self, query: str, k: int = 4, filter: Optional[dict] = None, **kwargs) -> List[Document]:
+        return self.similarity_search_by_vector(self._embedding.embed_query(query), k=k, filter=filter)
+
+    def similarity_search_by_vector(
+        self, embedding: List[float], k: int = 4, filter: Optional[dict] = None, **kwargs
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k=k, filter=filter)]
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, filter: Optional[dict] = None, **kwargs
+    ) -> List[Tuple[Document, float]]:
+        """(문서, 코사인 유사도) - 값이 클수록 유사"""
+        return self.similarity_search_by_vector_with_score(self._embedding.embed_query(query), k=k, filter=filter)
+
+    def _similarity_search_with_relevance_scores(
+        self, query: str, k: int = 4, **kwargs
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score(query, k=k, **kwargs)
+
+    def similarity_search_by_vector_with_score(
+        self, embedding: List[float], k: int = 4, filter: Optional[dict] = None
+    ) -> List[Tuple[Document, float]]:
+        self._maybe_sync()
+        state = self._state
+        if state.size == 0:
+            return []
+
+        query = self._normalize(np.asarray(embedding, dtype=np.float32))
+        mask = state.valid[: state.size]
+        if filter:
+            mask = mask & self._filter_mask(state, filter)
+
+        return self._search_rows(state, np.flatnonzero(mask), query, k)
+
+    def _search_rows(
+        self, state: _IndexState, rows: np.ndarray, query: np.ndarray, k: int
+    ) -> List[Tuple[Document, float]]:
+        """후보 행(rows) 중 상위 k 개"""
+        if len(rows) == 0:
+            return []
+
+        scores = self._score(state, None if len(rows) == state.size else rows, query)
+        if self.dtype != "int8":
+            top = self._top_k(scores, k)
+            return [(self._document(state, int(rows[i])), float(scores[i])) for i in top]
+
+        # int8 근사 점수로 후보를 넉넉히 고른 뒤 원본 float32 로 다시 채점
+        candidates = np.sort(rows[self._top_k(scores, k * self.rescore_factor)])
+        exact = state.full[candidates] @ query
+        top = self._top_k(exact, k)
+        return [(self._document(state, int(candidates[i])), float(exact[i])) for i in top]
+
+    def _score(self, state: _IndexState, rows: Optional[np.ndarray], query: np.ndarray) -> np.ndarray:
+        """저장 dtype 에 맞춰 (rows 또는 전체 행의) 내적 점수 계산"""
+        if self.dtype == "float32":
+            return state.matrix[: state.size] @ query if rows is None else state.matrix[rows] @ query
+
+        # float16/int8 은 BLAS 를 쓰도록 청크 단위로 float32 변환 후 곱한다 (int8 은 점수에 행별 스케일을 곱함)
+        count = state.size if rows is None else len(rows)
+        scores = np.empty(count, dtype=np.float32)
+        for start in range(0, count, SCORE_CHUNK_ROWS):
+            end = min(start + SCORE_CHUNK_ROWS, count)
+            chunk_rows = slice(start, end) if rows is None else rows[start:end]
+            scores[start:end] = state.matrix[chunk_rows].astype(np.float32) @ query
+            if self.dtype == "int8":
+                scores[start:end] *= state.scale[chunk_rows]
+        return scores
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        k = min(k, len(scores))
+        if k == len(scores):
+            return np.argsort(-scores)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top])]
+
+    @staticmethod
+    def _document(state: _IndexState, row: int) -> Document:
+        return Document(page_content=state.documents[row], metadata=dict(state.metadatas[row]), id=state.ids[row])
+
+    def _filter_mask(self, state: _IndexState, where: dict) -> np.ndarray:
+        masks = []
+        for key, condition in where.items():
+            if key == "$and":
+                masks.append(np.logical_and.reduce([self._filter_mask(state, clause) for clause in condition]))
+            elif key == "$or":
+                masks.append(np.logical_or.reduce([self._filter_mask(state, clause) for clause in condition]))
+            else:
+                masks.append(self._condition_mask(state.column(key), condition))
+        return np.logical_and.reduce(masks) if masks else np.ones(state.size, dtype=bool)
+
+    @staticmethod
+    def _condition_mask(values: np.ndarray, condition: Any) -> np.ndarray:
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        masks = []
+        for operator, operand in condition.items():
+            if operator == "$eq":
+                masks.append(_elementwise(values, lambda value: value == operand))
+            elif operator == "$ne":
+                masks.append(_elementwise(values, lambda value: value != operand))
+            elif operator == "$in":
+                operand_set = set(operand)
+                masks.append(_elementwise(values, lambda value: value in operand_set))
+            elif operator == "$nin":
+                operand_set = set(operand)
+                masks.append(_elementwise(values, lambda value: value not in operand_set))
+            elif operator in ("$gt", "$gte", "$lt", "$lte"):
+                compare = {
+                    "$gt": lambda value: value > operand,
+                    "$gte": lambda value: value >= operand,
+                    "$lt": lambda value: value < operand,
+                    "$lte": lambda value: value <= operand,
+                }[operator]
+                masks.append(_elementwise(values, lambda value: value is not None and compare(value)))
+            else:
+                raise ValueError(f"지원하지 않는 필터 연산자입니다: {operator}")
+        return np.logical_and.reduce(masks)
+
+    # =================== 조회 (크로마 get 과 같은 형식) ===================
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[dict] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Optional[List[str]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        self._maybe_sync()
+        state = self._state
+        if ids is not None:
+            rows = [self._id_to_row[vector_id] for vector_id in ids if vector_id in self._id_to_row]
+            rows = [row for row in rows if row < state.size]
+        else:
+            mask = state.valid[: state.size]
+            if where:
+                mask = mask & self._filter_mask(state, where)
+            rows = np.flatnonzero(mask).tolist()
+
+        rows = rows[offset or 0 :]
+        if limit is not None:
+            rows = rows[:limit]
+
+        include = ["metadatas", "documents"] if include is None else include
+        result = {"ids": [state.ids[row] for row in rows]}
+        if "metadatas" in include:
+            result["metadatas"] = [dict(state.metadatas[row]) for row in rows]
+        if "documents" in include:
+            result["documents"] = [state.documents[row] for row in rows]
+        if "embeddings" in include:
+            result["embeddings"] = np.asarray(state.full[rows])
+        return result
+
+    def count(self) -> int:
+        return len(self._id_to_row)
+
+    # =================== 저장/로딩 ===================
+
+    def persist(self):
+        """다른 프로세스가 그 사이 저장한 버전에 이 프로세스의 변경을 합쳐 새 버전으로 저장
+
+        파일 락 안에서 최신 버전을 읽고 저장 전 변경(_pending)을 다시 적용한 뒤 쓰므로
+        마지막에 저장한 프로세스가 다른 프로세스의 변경을 덮어쓰지 않는다.
+        """
+        if self.persist_path is None:
+            return
+
+        with self._write_lock, _directory_lock(self.persist_path):
+            latest = _read_version(self.persist_path)
+            if latest != self._disk_version:
+                self._merge_version(latest)
+
+            state = self._state
+            rows = np.flatnonzero(state.valid[: state.size])
+            version = _publish_version(
+                self.persist_path,
+                lambda directory, _: self._write_version(directory, state, rows),
+                settings.CHATBOT_VECTOR_SNAPSHOT_KEEP,
+            )
+            self._disk_version = version
+            self._pending = {}
+
+            if self.dtype != "float32":
+                # 메모리에 있던 원본 float32 를 방금 저장한 파일의 mmap 으로 교체
+                self._load_version(version)
+
+    def load(self):
+        """가장 최근에 저장된 버전 읽기 (이 프로세스의 저장 전 변경은 버린다)"""
+        with self._write_lock, _directory_lock(self.persist_path, exclusive=False):
+            self._load_version(_read_version(self.persist_path))
+            self._pending = {}
+
+    def _maybe_sync(self):
+        """다른 프로세스(색인 워커 등)가 저장한 새 버전이 있으면 sync_interval 마다 확인해 합친다"""
+        if self.persist_path is None:
+            return
+        now = time.monotonic()
+        if now - self._synced_at < self.sync_interval:
+            return
+        self._synced_at = now
+
+        if _read_version(self.persist_path) in (None, self._disk_version):
+            return
+        with self._write_lock, _directory_lock(self.persist_path, exclusive=False):
+            latest = _read_version(self.persist_path)
+            if latest != self._disk_version:
+                self._merge_version(latest)
+
+    def _merge_version(self, version: Optional[str]):
+        """version 을 읽은 뒤 이 프로세스의 저장 전 변경을 다시 적용 (_write_lock 안에서 호출)"""
+        state, pending = self._state, self._pending
+        upserts = [vector_id for vector_id, alive in pending.items() if alive and vector_id in self._id_to_row]
+        deletes = [vector_id for vector_id, alive in pending.items() if not alive]
+        rows = [self._id_to_row[vector_id] for vector_id in upserts]
+        texts = [state.documents[row] for row in rows]
+        metadatas = [state.metadatas[row] for row in rows]
+        vectors = np.asarray(state.full[rows], dtype=np.float32)
+
+        self._load_version(version)
+        if upserts:
+            self.add_embeddings(texts, vectors, metadatas, upserts)
+        if deletes:
+            self.delete(ids=deletes)
+        self._pending = pending
+        if upserts or deletes:
+            print(f"🔀 벡터 저장소 병합: 버전 {version} + 저장 전 변경 {len(upserts) + len(deletes)}개")
+
+    def _version_directory(self, version: Optional[str]) -> Path:
+        # 포인터가 없으면 버전 디렉터리 도입 전 형식 (persist_path 바로 아래 파일)
+        return self.persist_path / version if version else self.persist_path
+
+    def _write_version(self, directory: Path, state: _IndexState, rows: np.ndarray):
+        np.save(directory / "vectors.npy", state.full[rows])
+        with open(directory / "records.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "ids": [state.ids[row] for row in rows],
+                    "documents": [state.documents[row] for row in rows],
+                    "metadatas": [state.metadatas[row] for row in rows],
+                },
+                f,
+                ensure_ascii=False,
+            )
+
+    def _load_version(self, version: Optional[str]):
+        directory = self._version_directory(version)
+        if not (directory / "vectors.npy").exists():
+            full = np.zeros((0, 0), dtype=np.float32)
+            records = {"ids": [], "documents": [], "metadatas": []}
+        else:
+            if self.dtype == "float32":
+                full = np.ascontiguousarray(np.load(directory / "vectors.npy"), dtype=np.float32)
+            else:
+                full = np.load(directory / "vectors.npy", mmap_mode="r")
+            with open(directory / "records.json", encoding="utf-8") as f:
+                records = json.load(f)
+
+        with self._write_lock:
+            self._swap_state(
+                self._quantized_state(
+                    full, len(full), ids=records["ids"], documents=records["documents"], metadatas=records["metadatas"]
+                )
+            )
+            self._id_to_row = {vector_id: row for row, vector_id in enumerate(records["ids"])}
+            self._deleted = 0
+            self._disk_version = version
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs,
+    ) -> "NumpyVectorStore":
+        store = cls(embedding_function=embedding, persist_path=kwargs.get("persist_path"))
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
+
+
+class _InvertedLists:
+    """IVF 보조 인덱스 - 행별 클러스터 번호와 클러스터별 행 목록(검색 시 한 번만 생성)"""
+
+    def __init__(self, centroids: np.ndarray, assignments: np.ndarray, trained_on: int):
+        self.centroids = centroids
+        self.assignments = assignments
+        self.trained_on = trained_on
+        self._lists = None
+
+    def lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(클러스터 순으로 정렬된 행 번호, 클러스터별 시작 위치)"""
+        if self._lists is None:
+            order = np.argsort(self.assignments, kind="stable")
+            offsets = np.searchsorted(self.assignments[order], np.arange(len(self.centroids) + 1))
+            self._lists = (order, offsets)
+        return self._lists
+
+
+class IVFVectorStore(NumpyVectorStore):
+    """k-means 조대 양자화기(coarse quantizer)를 쓰는 IVF-flat 근사 검색 저장소
+
+    - 학습: 살아있는 행(최대 train_sample_size 개 샘플)으로 구면 k-means 를 돌려 nlist 개 중심을 만든다.
+    - 검색: 쿼리와 가까운 nprobe 개 클러스터의 행만 채점한다 (dtype/int8 재채점은 NumpyVectorStore 와 동일).
+    - 추가: 새 행은 가장 가까운 중심에 배정만 하고, 행 수가 학습 시점의 retrain_factor 배가 되면 다시 학습한다.
+    - min_train_size 보다 작을 때는 학습하지 않고 전수 검색한다.
+    """
+
+    def __init__(
+        self,
+        embedding_function: Embeddings,
+        persist_path: Optional[Path] = None,
+        dtype: str = "float32",
+        rescore_factor: int = None,
+        nlist: int = None,
+        nprobe: int = None,
+        kmeans_iterations: int = None,
+        min_train_size: int = None,
+        train_sample_size: int = None,
+        retrain_factor: float = 2.0,
+    ):
+        self.nlist = settings.CHATBOT_VECTOR_IVF_NLIST if nlist is None else nlist
+        self.nprobe = nprobe or settings.CHATBOT_VECTOR_IVF_NPROBE
+        self.kmeans_iterations = kmeans_iterations or settings.CHATBOT_VECTOR_IVF_KMEANS_ITERATIONS
+        self.min_train_size = settings.CHATBOT_VECTOR_IVF_MIN_TRAIN_SIZE if min_train_size is None else min_train_size
+        self.train_sample_size = train_sample_size or settings.CHATBOT_VECTOR_IVF_TRAIN_SAMPLE_SIZE
+        self.retrain_factor = retrain_factor
+        self._loaded_ann: Optional[_InvertedLists] = None
+        super().__init__(
+            embedding_function=embedding_function, persist_path=persist_path, dtype=dtype, rescore_factor=rescore_factor
+        )
+
+    # =================== 학습/배정 ===================
+
+    def _index_rows(
+        self,
+        state: _IndexState,
+        previous: Optional[_IndexState],
+        start: int,
+        carried_rows: Optional[np.ndarray],
+    ):
+        ann = previous.ann if previous is not None else None
+
+        if previous is None:
+            # 디스크에서 읽은 인덱스가 같은 행 수면 그대로 사용
+            loaded, self._loaded_ann = self._loaded_ann, None
+            if loaded is not None and len(loaded.assignments) == state.size:
+                state.ann = loaded
+                return
+
+        if ann is None or state.size >= self.retrain_factor * ann.trained_on:
+            state.ann = self._train(state)
+            return
+
+        if carried_rows is None and start == state.size == previous.size:
+            state.ann = ann
+            return
+
+        carried = ann.assignments[:start] if carried_rows is None else ann.assignments[carried_rows]
+        added = self._assign(ann.centroids, state.full[start : state.size])
+        state.ann = _InvertedLists(ann.centroids, np.concatenate([carried, added]), ann.trained_on)
+
+    def _train(self, state: _IndexState) -> Optional[_InvertedLists]:
+        rows = np.flatnonzero(state.valid[: state.size])
+        if len(rows) < max(self.min_train_size, 1):
+            return None
+
+        rng = np.random.default_rng(0)
+        if len(rows) > self.train_sample_size:
+            rows = np.sort(rng.choice(rows, self.train_sample_size, replace=False))
+        vectors = np.asarray(state.full[rows], dtype=np.float32)
+        nlist = min(self.nlist or max(16, int(4 * np.sqrt(state.size))), len(vectors))
+
+        centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+        for _ in range(self.kmeans_iterations):
+            assignments = self._assign(centroids, vectors)
+            order = np.argsort(assignments, kind="stable")
+            clusters, starts = np.unique(assignments[order], return_index=True)
+            sums = np.add.reduceat(vectors[order], starts, axis=0)
+
+            # 빈 클러스터는 임의의 점으로 다시 시작
+            centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+            centroids[clusters] = self._normalize(sums)
+
+        print(f"🧭 IVF 학습 완료: {state.size}개 중 {len(vectors)}개 샘플, nlist={nlist}")
+        return _InvertedLists(centroids, self._assign(centroids, state.full[: state.size]), state.size)
+
+    @staticmethod
+    def _assign(centroids: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), SCORE_CHUNK_ROWS):
+            chunk = np.asarray(vectors[start : start + SCORE_CHUNK_ROWS], dtype=np.float32)
+            assignments[start : start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+        return assignments
+
+    def train(self):
+        """현재 행 전체로 다시 학습 (대량 적재 후 수동 호출용)"""
+        with self._write_lock:
+            state = self._state
+            state.ann = self._train(state)
+
+    # =================== 검색 ===================
+
+    def similarity_search_by_vector_with_score(
+        self, embedding: List[float], k: int = 4, filter: Optional[dict] = None
+    ) -> List[Tuple[Document, float]]:
+        self._maybe_sync()
+        state = self._state
+        ann = state.ann
+        if ann is None:
+            return super().similarity_search_by_vector_with_score(embedding, k=k, filter=filter)
+
+        query = self._normalize(np.asarray(embedding, dtype=np.float32))
+        order, offsets = ann.lists()
+        probes = self._top_k(ann.centroids @ query, min(self.nprobe, len(ann.centroids)))
+        rows = np.concatenate([order[offsets[cluster] : offsets[cluster + 1]] for cluster in probes])
+        rows = rows[state.valid[rows]]
+        if filter:
+            rows = rows[self._filter_mask(state, filter)[rows]]
+            # 필터로 후보가 모자라면 전수 검색
+            if len(rows) < k:
+                return super().similarity_search_by_vector_with_score(embedding, k=k, filter=filter)
+
+        return self._search_rows(state, np.sort(rows), query, k)
+
+    # =================== 저장/로딩 ===================
+
+    def _write_version(self, directory: Path, state: _IndexState, rows: np.ndarray):
+        super()._write_version(directory, state, rows)
+        if state.ann is not None:
+            # 살아있는 행만 저장하므로 배정도 같은 순서로 저장
+            np.savez(
+                directory / "ivf.npz",
+                centroids=state.ann.centroids,
+                assignments=state.ann.assignments[rows],
+                trained_on=state.ann.trained_on,
+            )
+
+    def _load_version(self, version: Optional[str]):
+        index_path = self._version_directory(version) / "ivf.npz"
+        if index_path.exists():
+            with np.load(index_path) as data:
+                self._loaded_ann = _InvertedLists(data["centroids"], data["assignments"], int(data["trained_on"]))
+        super()._load_version(version)
+
+
+def snapshot_root(collection_name: str = None) -> Path:
+    return settings.VECTOR_STORE_PATH / "snapshots" / (collection_name or settings.CHATBOT_VECTOR_STORE_COLLECTION)
+
+
+def export_snapshot(store: VectorStore, root: Path, keep: int = None) -> str:
+    """벡터 저장소 전체를 mmap 으로 열 수 있는 스냅샷으로 내보내고 버전 포인터를 교체
+
+    snapshots/<collection>/<version>/ 아래에
+    - vectors.f32: 정규화된 float32 행렬 (헤더 없는 raw, row-major)
+    - records.json: ids / documents / metadatas
+    - manifest.json: 행 수, 차원
+    을 쓰고 CURRENT 파일을 원자적으로 교체한다.
+    """
+    keep = keep or settings.CHATBOT_VECTOR_SNAPSHOT_KEEP
+    data = store.get(include=["embeddings", "metadatas", "documents"])
+    if data["ids"]:
+        matrix = NumpyVectorStore._normalize(np.asarray(data["embeddings"], dtype=np.float32))
+    else:
+        matrix = np.zeros((0, 0), dtype=np.float32)
+
+    def write(directory: Path, version: str):
+        np.ascontiguousarray(matrix).tofile(directory / "vectors.f32")
+        with open(directory / "records.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {"ids": data["ids"], "documents": data["documents"], "metadatas": data["metadatas"]},
+                f,
+                ensure_ascii=False,
+            )
+        with open(directory / "manifest.json", "w", encoding="utf-8") as f:
+            json.dump({"version": version, "count": matrix.shape[0], "dimension": matrix.shape[1]}, f)
+
+    with _directory_lock(root):
+        version = _publish_version(root, write, keep)
+
+    print(f"📦 벡터 스냅샷 저장: {root / version} ({matrix.shape[0]}개)")
+    return version
+
+
+class SnapshotVectorStore(NumpyVectorStore):
+    """여러 워커가 같은 스냅샷 파일을 mmap 으로 공유하는 읽기용 저장소
+
+    - 검색 행렬은 np.memmap 으로 열어 모든 프로세스가 페이지 캐시 한 벌을 공유하고, 부팅 시 로딩 비용이 거의 없다.
+    - 쓰기는 원본 저장소(primary)에 반영한 뒤 로컬 상태에도 덧씌운다. persist() 는 원본 저장소만 저장하고,
+      전체를 다시 쓰는 새 스냅샷 내보내기(export)는 색인 배치 후 예약 작업에서만 한다.
+    - 다른 프로세스가 내보낸 새 버전은 CURRENT 포인터를 주기적으로 확인해 교체한다.
+    """
+
+    def __init__(self, embedding_function: Embeddings, primary: VectorStore, root: Path, check_interval: float = None):
+        super().__init__(embedding_function=embedding_function)
+        self.primary = primary
+        self.root = Path(root)
+        self.check_interval = (
+            settings.CHATBOT_VECTOR_SNAPSHOT_CHECK_INTERVAL if check_interval is None else check_interval
+        )
+        self.version = None
+        self._checked_at = 0.0
+
+        if not (self.root / VERSION_POINTER).exists():
+            export_snapshot(self.primary, self.root)
+        self._maybe_reload(force=True)
+
+    def _maybe_reload(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+
+        version = _read_version(self.root)
+        if version and version != self.version:
+            self.load_snapshot(version)
+
+    def load_snapshot(self, version: str):
+        directory = self.root / version
+        with _directory_lock(self.root, exclusive=False):
+            with open(directory / "manifest.json", encoding="utf-8") as f:
+                manifest = json.load(f)
+            with open(directory / "records.json", encoding="utf-8") as f:
+                records = json.load(f)
+
+        count, dimension = manifest["count"], manifest["dimension"]
+        if count:
+            matrix = np.memmap(directory / "vectors.f32", dtype=np.float32, mode="r", shape=(count, dimension))
+        else:
+            matrix = np.zeros((0, 0), dtype=np.float32)
+
+        with self._write_lock:
+            self._swap_state(
+                _IndexState(
+                    matrix,
+                    np.ones(count, dtype=bool),
+                    count,
+                    records["ids"],
+                    records["documents"],
+                    records["metadatas"],
+                )
+            )
+            self._id_to_row = {vector_id: row for row, vector_id in enumerate(records["ids"])}
+            self._deleted = 0
+            self.version = version
+
+    # 쓰기 - 원본 저장소가 기준이며 로컬 상태는 다음 스냅샷 전까지의 덧씌우기
+
+    def add_texts(
+        self, texts: Iterable[str], metadatas: Optional[List[dict]] = None, ids: Optional[List[str]] = None, **kwargs
+    ) -> List[str]:
+        texts = list(texts)
+        ids = list(ids) if ids else [str(uuid.uuid4()) for _ in texts]
+        return self.add_embeddings(texts, self._embedding.embed_documents(texts), metadatas or [{} for _ in texts], ids)
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[dict],
+        ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        ids = list(ids) if ids else [str(uuid.uuid4()) for _ in texts]
+        self.primary.add_embeddings(texts, embeddings, metadatas, ids)
+        return super().add_embeddings(texts, embeddings, metadatas, ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs) -> Optional[bool]:
+        if ids:
+            self.primary.delete(ids=ids)
+        return super().delete(ids=ids)
+
+    def update_metadatas(self, ids: List[str], metadatas: List[dict]):
+        self.primary.update_metadatas(ids, metadatas)
+        super().update_metadatas(ids, metadatas)
+
+    def persist(self):
+        self.primary.persist()
+
+    def export(self) -> str:
+        """원본 저장소 전체를 새 스냅샷 버전으로 내보내고 교체 - O(전체 문서)이므로 요청/시그널 경로에서 호출하지 않는다"""
+        version = export_snapshot(self.primary, self.root)
+        self.load_snapshot(version)
+        return version
+
+    # 읽기 - 새 버전이 있으면 교체 후 처리
+
+    def similarity_search_by_vector_with_score(
+        self, embedding: List[float], k: int = 4, filter: Optional[dict] = None
+    ) -> List[Tuple[Document, float]]:
+        self._maybe_reload()
+        return super().similarity_search_by_vector_with_score(embedding, k=k, filter=filter)
+
+    def get(self, *args, **kwargs) -> Dict[str, Any]:
+        self._maybe_reload()
+        return super().get(*args, **kwargs)
+
+    def count(self) -> int:
+        self._maybe_reload()
+        return super().count()
+
+
+def drop_vector_store(collection_name: str):
+    """컬렉션의 벡터 저장소 데이터 삭제 (정리된 이전 빌드 컬렉션용)"""
+    backend = settings.CHATBOT_VECTOR_STORE_BACKEND
+    if backend in ("chroma", "snapshot"):
+        ChromaVectorStore(
+            collection_name=collection_name, persist_directory=settings.CHATBOT_CHROMA_PERSIST_DIRECTORY
+        ).delete_collection()
+    if backend in ("numpy", "ivf"):
+        shutil.rmtree(settings.VECTOR_STORE_PATH / collection_name, ignore_errors=True)
+    if backend == "snapshot":
+        shutil.rmtree(snapshot_root(collection_name), ignore_errors=True)
+
+
+def build_vector_store(embeddings: Embeddings, collection_name: str = None) -> VectorStore:
+    """설정(CHATBOT_VECTOR_STORE_BACKEND)에 따른 벡터 저장소 생성"""
+    collection_name = collection_name or settings.CHATBOT_VECTOR_STORE_COLLECTION
+    backend = settings.CHATBOT_VECTOR_STORE_BACKEND
+
+    if backend == "chroma":
+        return ChromaVectorStore(
+            collection_name=collection_name,
+            embedding_function=embeddings,
+            persist_directory=settings.CHATBOT_CHROMA_PERSIST_DIRECTORY,
+        )
+    if backend == "numpy":
+        return NumpyVectorStore(
+            embedding_function=embeddings,
+            persist_path=settings.VECTOR_STORE_PATH / collection_name,
+            dtype=settings.CHATBOT_VECTOR_STORE_DTYPE,
+        )
+    if backend == "ivf":
+        return IVFVectorStore(
+            embedding_function=embeddings,
+            persist_path=settings.VECTOR_STORE_PATH / collection_name,
+            dtype=settings.CHATBOT_VECTOR_STORE_DTYPE,
+        )
+    if backend == "snapshot":
+        primary = ChromaVectorStore(
+            collection_name=collection_name,
+            embedding_function=embeddings,
+            persist_directory=settings.CHATBOT_CHROMA_PERSIST_DIRECTORY,
+        )
+        return SnapshotVectorStore(embedding_function=embeddings, primary=primary, root=snapshot_root(collection_name))
+    raise ValueError(f"지원하지 않는 벡터 저장소 백엔드입니다: {backend}")
@@ -0,0 +1,76 @@
+from django.core.management.base import BaseCommand
+
+from app.chat_bot import benchmarks
+
+
+class Command(BaseCommand):
+    help = "챗봇 성능 벤치마크를 실행합니다 (OpenAI 호출 없이 스텁 사용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "suite",
+            choices=["pipeline", "vector_store", "quantization", "ann", "embedding_batch"],
+            help="실행할 벤치마크",
+        )
+        parser.add_argument("--requests", type=int, default=200, help="총 요청 수")
+        parser.add_argument("--concurrency", type=int, default=100, help="비동기 경로 동시 대화 수")
+        parser.add_argument("--sync-threads", type=int, default=4, help="동기 경로 스레드 수")
+        parser.add_argument("--llm-latency", type=float, default=1.0, help="스텁 LLM 응답 지연(초)")
+        parser.add_argument(
+            "--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="벡터 저장소 벤치마크 문서 수"
+        )
+        parser.add_argument("--dimension", type=int, default=1536, help="벡터 차원")
+        parser.add_argument("--k", type=int, default=10, help="검색 결과 수")
+        parser.add_argument("--nprobes", type=int, nargs="+", default=[4, 16, 64], help="IVF 탐색 클러스터 수")
+        parser.add_argument("--qps", type=float, default=200, help="임베딩 배칭 벤치마크 초당 요청 수")
+        parser.add_argument("--duration", type=float, default=5.0, help="임베딩 배칭 벤치마크 시간(초)")
+        parser.add_argument("--embedding-latency", type=float, default=0.05, help="스텁 임베딩 API 지연(초)")
+        parser.add_argument("--batch-window-ms", type=float, default=5, help="배칭 대기 시간(ms)")
+        parser.add_argument("--batch-max-size", type=int, default=64, help="최대 배치 크기")
+        parser.add_argument("--batch-max-latency-ms", type=float, default=20, help="배칭 최대 대기 시간(ms)")
+
+    def handle(self, *args, **options):
+        if options["suite"] == "pipeline":
+            results = benchmarks.benchmark_sync_vs_async(
+                requests=options["requests"],
+                concurrency=options["concurrency"],
+                sync_threads=options["sync_threads"],
+                llm_latency_seconds=options["llm_latency"],
+            )
+            self._print_table(results)
+        elif options["suite"] == "vector_store":
+            results = benchmarks.benchmark_vector_store(
+                sizes=options["sizes"], dimension=options["dimension"], queries=options["requests"], k=options["k"]
+            )
+            self._print_table(results)
+        elif options["suite"] == "quantization":
+            results = benchmarks.benchmark_quantization(
+                sizes=options["sizes"], dimension=options["dimension"], queries=options["requests"], k=options["k"]
+            )
+            self._print_table(results)
+        elif options["suite"] == "ann":
+            results = benchmarks.benchmark_ann(
+                sizes=options["sizes"],
+                dimension=options["dimension"],
+                queries=options["requests"],
+                k=options["k"],
+                nprobes=options["nprobes"],
+            )
+            self._print_table(results)
+        elif options["suite"] == "embedding_batch":
+            results = benchmarks.benchmark_embedding_batching(
+                qps=options["qps"],
+                duration_seconds=options["duration"],
+                api_latency_seconds=options["embedding_latency"],
+                window_ms=options["batch_window_ms"],
+                max_batch_size=options["batch_max_size"],
+                max_latency_ms=options["batch_max_latency_ms"],
+            )
+            self._print_table(results)
+
+    def _print_table(self, results):
+        for name, summary in results.items():
+            line = ", ".join(
+                f"{key}={value:.1f}" if isinstance(value, float) else f"{key}={value}" for key, value in summary.items()
+            )
+            self.stdout.write(f"{name:>22}: {line}")
@@ -0,0 +1,37 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app.chat_bot.embedding_store import ContentEmbeddingStore
+
+
+class Command(BaseCommand):
+    help = "색인용 문서 임베딩 저장소 - 통계 / 다른 환경으로 내보내기 / 가져오기"
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["stats", "export", "import"])
+        parser.add_argument("path", nargs="?", help="export/import 할 .npz 파일 경로")
+        parser.add_argument("--model", default=None, help="export 할 임베딩 모델 (기본: CHATBOT_EMBEDDING_MODEL)")
+
+    def handle(self, *args, **options):
+        store = ContentEmbeddingStore(settings.CHATBOT_CONTENT_EMBEDDING_STORE_PATH)
+        action = options["action"]
+
+        if action == "stats":
+            for model, stats in store.stats().items():
+                self.stdout.write(
+                    f"{model}: 벡터 {stats['vectors']}개, 차원 {stats['dimension']}, {stats['bytes'] / 1024 / 1024:.1f}MB"
+                )
+            return
+
+        if not options["path"]:
+            raise CommandError("파일 경로를 입력하세요")
+        path = Path(options["path"])
+
+        if action == "export":
+            count = store.export(options["model"] or settings.CHATBOT_EMBEDDING_MODEL, path)
+            self.stdout.write(self.style.SUCCESS(f"📦 임베딩 {count}개를 내보냈습니다: {path}"))
+        else:
+            count = store.import_(path)
+            self.stdout.write(self.style.SUCCESS(f"📥 새 임베딩 {count}개를 가져왔습니다"))
@@ -3,13 +3,37 @@
 # management/commands/embed_content.py
 from django.core.management.base import BaseCommand
 
-from app.chat_bot.rag_service import CompanyChatbotService
+from app.chat_bot.rag_service import get_chatbot_service
+from app.chat_bot.vector_stores import SnapshotVectorStore, export_snapshot, snapshot_root
 
 
 class Command(BaseCommand):
     help = "모든 컨텐츠를 크로마에 임베딩합니다"
 
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="내용이 바뀌지 않은 문서도 다시 임베딩합니다")
+        parser.add_argument("--batch-size", type=int, default=None, help="임베딩 API 한 번에 보낼 문서 수")
+        parser.add_argument("--concurrency", type=int, default=None, help="동시에 보낼 임베딩 요청 수")
+        parser.add_argument(
+            "--snapshot", action="store_true", help="임베딩 후 워커들이 mmap 으로 공유하는 벡터 스냅샷을 내보냅니다"
+        )
+
     def handle(self, *args, **options):
-        service = CompanyChatbotService()
-        service.embed_all_content()
-        self.stdout.write(self.style.SUCCESS("✅ 모든 컨텐츠 임베딩이 완료되었습니다!"))
+        service = get_chatbot_service()
+        summary = service.embed_all_content(
+            force=options["force"], batch_size=options["batch_size"], concurrency=options["concurrency"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ 모든 컨텐츠 임베딩이 완료되었습니다! (임베딩 {summary['embedded']}개, "
+                f"건너뜀 {summary['skipped']}개, 실패 {summary['failed']}개)"
+            )
+        )
+
+        if options["snapshot"]:
+            vector_store = service.vector_store
+            if isinstance(vector_store, SnapshotVectorStore):
+                version = vector_store.export()
+            else:
+                version = export_snapshot(vector_store, snapshot_root())
+            self.stdout.write(self.style.SUCCESS(f"📦 벡터 스냅샷 버전: {version}"))
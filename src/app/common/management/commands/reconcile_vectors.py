@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from app.chat_bot.rag_service import get_chatbot_service
+from app.chat_bot.reconcile import reconcile_vectors
+
+
+class Command(BaseCommand):
+    help = "벡터 저장소와 ChromaVector/원본 테이블을 비교해 고아 벡터를 지우고 누락된 벡터를 다시 임베딩합니다"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="차이만 보고하고 아무것도 바꾸지 않습니다")
+
+    def handle(self, *args, **options):
+        report = reconcile_vectors(get_chatbot_service(), dry_run=options["dry_run"])
+        drift = report["orphan_vectors"] + report["dead_rows"] + report["missing_vectors"] + report["unindexed"]
+        style = self.style.SUCCESS if drift == 0 else self.style.WARNING
+        self.stdout.write(style(f"{'✅' if drift == 0 else '⚠️'} 불일치 {drift}건"))
+        for key, value in report.items():
+            self.stdout.write(f"  {key}: {value}")
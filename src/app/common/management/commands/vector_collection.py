@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.chat_bot.indexing import ContentIndexer
+from app.chat_bot.models import VectorCollection
+from app.chat_bot.rag_service import get_chatbot_service
+from app.chat_bot.vector_collections import (
+    activate_collection,
+    build_collection,
+    cleanup_collections,
+    rollback_collection,
+)
+
+
+class Command(BaseCommand):
+    help = "벡터 컬렉션 블루/그린 빌드 - 새 컬렉션 빌드, 교체, 롤백, 이전 컬렉션 정리"
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["list", "build", "activate", "rollback", "cleanup"])
+        parser.add_argument("name", nargs="?", help="activate 할 컬렉션명")
+        parser.add_argument("--model", default=None, help="build 에 사용할 임베딩 모델 (기본: CHATBOT_EMBEDDING_MODEL)")
+        parser.add_argument("--activate", action="store_true", help="build 후 검증을 통과하면 바로 교체합니다")
+        parser.add_argument("--keep", type=int, default=None, help="cleanup 시 남겨 둘 이전 컬렉션 수")
+
+    def handle(self, *args, **options):
+        action = options["action"]
+        if action == "list":
+            for collection in VectorCollection.objects.all():
+                self.stdout.write(
+                    f"{'*' if collection.is_live else ' '} {collection.name} [{collection.status}] "
+                    f"{collection.embedding_model} 문서 {collection.document_count}개 / 벡터 {collection.vector_count}개"
+                )
+
+        elif action == "build":
+            service = get_chatbot_service()
+            collection, problems = build_collection(service, options["model"])
+            if problems:
+                raise CommandError(f"검증 실패: {', '.join(problems)}")
+            self.stdout.write(self.style.SUCCESS(f"✅ 빌드 완료: {collection.name}"))
+            if options["activate"]:
+                self._activate(collection)
+
+        elif action == "activate":
+            if not options["name"]:
+                raise CommandError("activate 할 컬렉션명을 입력하세요")
+            try:
+                collection = VectorCollection.objects.get(name=options["name"])
+            except VectorCollection.DoesNotExist:
+                raise CommandError(f"컬렉션이 없습니다: {options['name']}")
+            self._activate(collection)
+
+        elif action == "rollback":
+            previous = rollback_collection(get_chatbot_service())
+            if previous is None:
+                raise CommandError("되돌릴 이전 컬렉션이 없습니다")
+            self.stdout.write(self.style.SUCCESS(f"↩️ 롤백 완료: {previous.name}"))
+
+        elif action == "cleanup":
+            dropped = cleanup_collections(options["keep"])
+            self.stdout.write(self.style.SUCCESS(f"🗑️ 정리된 컬렉션 {len(dropped)}개"))
+
+    def _activate(self, collection: VectorCollection):
+        service = get_chatbot_service()
+        try:
+            # 빌드하는 동안 수정된 원본은 교체 전에 새 컬렉션에 반영된다
+            activate_collection(collection, service)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        # 따라잡기가 끝난 뒤 교체 직전까지 이전 컬렉션으로 처리된 변경 반영 (해시가 바뀐 문서만)
+        service.sync_live_collection(force=True)
+        ContentIndexer(service).run()
+        self.stdout.write(self.style.SUCCESS(f"🔀 사용 중 컬렉션: {collection.name}"))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.3 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("knowledge_document", "0003_alter_blogpost_url"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chromavector",
+            name="chunk_count",
+            field=models.PositiveIntegerField(default=1, verbose_name="청크 수"),
+        ),
+    ]
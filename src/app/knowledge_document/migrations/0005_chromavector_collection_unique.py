@@ -0,0 +1,22 @@
+# Generated by Django 4.2.3 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("knowledge_document", "0004_chromavector_chunk_count"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="chromavector",
+            name="vector_id",
+            field=models.CharField(db_index=True, max_length=200, verbose_name="크로마 벡터 ID"),
+        ),
+        migrations.AlterUniqueTogether(
+            name="chromavector",
+            unique_together={("content_type", "content_id", "collection_name")},
+        ),
+    ]
@@ -235,7 +235,7 @@ class ChromaVector(models.Model):
     content_id = models.UUIDField(verbose_name="원본 컨텐츠 ID")
 
     # 크로마 정보
-    vector_id = models.CharField(max_length=200, unique=True, verbose_name="크로마 벡터 ID")
+    vector_id = models.CharField(max_length=200, db_index=True, verbose_name="크로마 벡터 ID")
     collection_name = models.CharField(max_length=100, default="company_knowledge", verbose_name="컬렉션명")
 
     # 임베딩 설정
@@ -249,13 +249,15 @@ class ChromaVector(models.Model):
     # 업데이트 관리
     needs_update = models.BooleanField(default=False, verbose_name="업데이트 필요")
     source_content_hash = models.CharField(max_length=64, blank=True, verbose_name="원본 내용 해시")
+    chunk_count = models.PositiveIntegerField(default=1, verbose_name="청크 수")
 
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         verbose_name = "크로마 벡터"
         verbose_name_plural = "크로마 벡터"
-        unique_together = ["content_type", "content_id"]
+        # 컬렉션을 새로 빌드하는 동안 같은 원본의 행이 컬렉션별로 하나씩 존재한다
+        unique_together = ["content_type", "content_id", "collection_name"]
         indexes = [
             models.Index(fields=["content_type", "needs_update"]),
         ]
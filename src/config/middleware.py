@@ -4,6 +4,7 @@ import random
 import re
 import string
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.core.exceptions import PermissionDenied, SuspiciousOperation
 from django.http import Http404
 from django.utils import timezone
@@ -13,11 +14,26 @@ logger = logging.getLogger("request")
 
 
 class SwaggerLoginMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
         response = self.get_response(request)
+        return self._process_response(request, response)
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return self._process_response(request, response)
+
+    @staticmethod
+    def _process_response(request, response):
         if (
             request.content_type == "application/x-www-form-urlencoded"
             and re.match(r"/v(\d)/user/login/", request.path)
@@ -30,18 +46,39 @@ class SwaggerLoginMiddleware:
 
 
 class RequestLogMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
         # before
+        request_body = self._before(request)
+
+        # after
+        response = self.get_response(request)
+        return self._after(request, response, request_body)
+
+    async def __acall__(self, request):
+        request_body = self._before(request)
+        response = await self.get_response(request)
+        # request.user 는 지연 로딩(DB 조회)이므로 동기 컨텍스트에서 로깅
+        return await sync_to_async(self._after)(request, response, request_body)
+
+    @staticmethod
+    def _before(request):
         request.trace_id = (
             str(int(timezone.localtime().timestamp() * 1000)) + "_" + "".join(random.choices(string.ascii_letters, k=4))
         )
-        request_body = request.body
+        return request.body
 
-        # after
-        response = self.get_response(request)
+    def _after(self, request, response, request_body):
         response["X-Trace-Id"] = request.trace_id
         if request.path == "/_health/":
             return response
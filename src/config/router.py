@@ -6,9 +6,14 @@ class Router:
     databases = settings.DATABASES
     default_app_labels: set = {}
 
+    # DatabaseCache 의 캐시 테이블 - 예약 표시(cache.add)/캐시된 값은 쓰자마자 읽으므로 복제 지연이 없는 primary 에서 읽는다
+    primary_app_labels = {"django_cache"}
+
     def db_for_read(self, model, **hints):
         if not self.databases.get("reader"):
             return "default"
+        if model._meta.app_label in self.primary_app_labels:
+            return "default"
         if self._check_in_atomic_block():
             return "default"
         return "reader"
@@ -5,9 +5,19 @@
 # https://docs.aws.amazon.com/eventbridge/latest/userguide/eb-cron-expressions.html
 from django.urls import path
 
+from app.chat_bot.cron import ChatBotCron, ChatBotReconcileCron
+
 SCHEDULES = dict(
     # schedule_name={
     #     "path": path("cron/test/", TestCron.as_view()),
     #     "cron": "* * * * ? *",
     # },
+    chat_bot_outbox_drain={
+        "path": path("cron/chat-bot/outbox-drain/", ChatBotCron.as_view()),
+        "cron": "*/5 * * * ? *",
+    },
+    chat_bot_vector_reconcile={
+        "path": path("cron/chat-bot/vector-reconcile/", ChatBotReconcileCron.as_view()),
+        "cron": "0 18 * * ? *",
+    },
 )
@@ -308,3 +308,82 @@ APPLE_LOGIN_URL = "https://appleid.apple.com/auth/authorize?response_type=code&c
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 VECTOR_STORE_PATH = BASE_DIR / "vector_store"
 os.makedirs(VECTOR_STORE_PATH, exist_ok=True)
+
+
+# CACHE
+# chat_bot 캐시(사용 중 벡터 컬렉션, 아웃박스 예약 표시 등)는 여러 호스트의 워커가 공유해야 하므로 DB 캐시를 사용
+# 캐시 테이블은 마이그레이션이 아니므로 배포 시 migrate 후 `python manage.py createcachetable` 을 실행한다
+# 캐시 테이블 읽기는 config.router.Router 가 reader 가 아닌 primary(default)로 보낸다
+# 답변 캐시 무효화 기준인 지식베이스/문서 버전은 밀려나지 않도록 캐시가 아닌 KnowledgeVersion 테이블에 둔다
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "chat_bot": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "chat_bot_cache",
+        "OPTIONS": {"MAX_ENTRIES": 100000},
+    },
+}
+
+
+# CHATBOT
+CHATBOT_CACHE_ALIAS = "chat_bot"
+CHATBOT_ANSWER_CACHE_ENABLED = True
+CHATBOT_ANSWER_CACHE_SIZE = 1000
+CHATBOT_ANSWER_CACHE_TTL = 60 * 60
+CHATBOT_SEMANTIC_CACHE_ENABLED = True
+CHATBOT_SEMANTIC_CACHE_SIZE = 2000
+CHATBOT_SEMANTIC_CACHE_THRESHOLD = 0.95
+CHATBOT_QUERY_EXPANSION_MODE = "cached"  # local | cached | llm
+CHATBOT_QUERY_EXPANSION_TIMEOUT = 1.5
+CHATBOT_QUERY_EXPANSION_MAX_QUERIES = 4
+CHATBOT_SEARCH_CONCURRENCY = 8
+CHATBOT_VECTOR_STORE_BACKEND = "chroma"  # chroma | numpy | ivf | snapshot
+CHATBOT_VECTOR_STORE_COLLECTION = "company_knowledge"
+CHATBOT_VECTOR_STORE_DTYPE = "float32"  # float32 | float16 | int8 (numpy 백엔드)
+CHATBOT_VECTOR_RESCORE_FACTOR = 4  # int8 검색 시 원본으로 다시 채점할 후보 배수
+CHATBOT_VECTOR_SNAPSHOT_CHECK_INTERVAL = 5  # 초, 새 스냅샷 버전 확인 주기
+CHATBOT_VECTOR_SNAPSHOT_KEEP = 2
+CHATBOT_VECTOR_IVF_NLIST = 0  # 0 이면 4 * sqrt(문서 수)
+CHATBOT_VECTOR_IVF_NPROBE = 16
+CHATBOT_VECTOR_IVF_KMEANS_ITERATIONS = 10
+CHATBOT_VECTOR_IVF_MIN_TRAIN_SIZE = 5000  # 이보다 적으면 전수 검색
+CHATBOT_VECTOR_IVF_TRAIN_SAMPLE_SIZE = 50000
+CHATBOT_LEXICAL_SEARCH_ENABLED = True
+CHATBOT_LEXICAL_WEIGHT = 2.0  # RRF 병합 시 키워드 검색 결과 가중치
+CHATBOT_LEXICAL_SYNC_INTERVAL = 5  # 초, 다른 워커의 지식베이스 변경 확인 주기
+CHATBOT_LEXICAL_SYNC_OVERLAP_SECONDS = 60  # 변경분 동기화 시 updated_at 기준점을 이만큼 겹쳐 다시 읽음
+CHATBOT_LEXICAL_SHORTCUT_QUESTION_TYPES = ["tech"]  # 키워드 검색만으로 답할 질문 유형
+CHATBOT_LEXICAL_SHORTCUT_MIN_HITS = 3
+CHATBOT_EMBEDDING_CACHE_ENABLED = True
+CHATBOT_EMBEDDING_CACHE_MEMORY_BYTES = 64 * 1024 * 1024
+CHATBOT_EMBEDDING_CACHE_PATH = VECTOR_STORE_PATH / "embedding_cache.sqlite3"
+CHATBOT_EMBEDDING_BATCH_ENABLED = True
+CHATBOT_EMBEDDING_BATCH_WINDOW_MS = 5  # 마지막 요청 이후 이 시간 동안 새 요청이 없으면 전송
+CHATBOT_EMBEDDING_BATCH_MAX_SIZE = 64
+CHATBOT_EMBEDDING_BATCH_MAX_LATENCY_MS = 20  # 첫 요청이 최대로 기다리는 시간
+CHATBOT_INDEX_BATCH_SIZE = 256  # embed_documents 한 번에 보낼 문서 수
+CHATBOT_INDEX_CONCURRENCY = 4
+CHATBOT_REINDEX_DEBOUNCE_SECONDS = 30  # 이 시간 동안의 편집을 모아 한 번에 재임베딩
+CHATBOT_OUTBOX_BATCH_SIZE = 500  # 아웃박스 변경을 한 트랜잭션에서 처리할 개수
+CHATBOT_CHUNK_SIZE = 500  # 긴 본문(회사 컨텐츠 내용, 블로그 요약)을 나눌 청크 크기 (글자 수)
+CHATBOT_CHUNK_OVERLAP = 100  # 이웃 청크와 겹치는 문장 길이 (글자 수)
+CHATBOT_CHUNKS_PER_DOCUMENT = 3  # 원본 하나당 프롬프트에 넣을 최대 청크 수
+CHATBOT_EMBEDDING_MODEL = "text-embedding-3-small"  # 새 컬렉션 빌드 기본 모델 (사용 중 모델은 VectorCollection 기준)
+CHATBOT_VECTOR_COLLECTION_CHECK_INTERVAL = 5  # 워커가 사용 중 컬렉션 교체를 확인하는 주기 (초)
+CHATBOT_VECTOR_COLLECTION_KEEP = 1  # 롤백용으로 남겨 둘 이전 컬렉션 수
+CHATBOT_VECTOR_COLLECTION_MIN_SELF_MATCH = 0.9  # 검증 시 표본 벡터가 자기 원본을 찾아야 하는 비율
+CHATBOT_CONTENT_EMBEDDING_STORE_ENABLED = True  # 색인 시 같은 텍스트의 문서 임베딩 재사용
+CHATBOT_CONTENT_EMBEDDING_STORE_PATH = VECTOR_STORE_PATH / "content_embeddings"
+CHATBOT_RETRIEVAL_MIN_FILTERED_RESULTS = 3  # 필터 검색으로 찾은 원본이 이보다 적으면 전체 컬렉션에서도 검색
+CHATBOT_RETRIEVAL_MIN_SCORE = 0.25  # 이 코사인 유사도 미만의 벡터 검색 결과는 프롬프트에 넣지 않음
+CHATBOT_RETRIEVAL_RELATIVE_SCORE_GAP = 0.3  # 1위 유사도보다 이 비율 이상 낮은 결과는 제외
+CHATBOT_RETRIEVAL_SCORE_DROP = 0.08  # 유사도가 이만큼 이상 급격히 떨어지는 지점에서 k 를 자름
+CHATBOT_RETRIEVAL_MIN_K = 2  # 상대 간격/급락 컷오프로 이보다 적게 줄이지 않음
+CHATBOT_OUTBOX_CLAIM_TIMEOUT_SECONDS = 600  # 가져간 뒤 이 시간 안에 끝나지 않은 아웃박스 배치는 다른 워커가 다시 처리
+CHATBOT_VECTOR_STORE_SYNC_INTERVAL = 5  # 초, numpy/ivf 저장소가 다른 프로세스가 저장한 새 버전을 확인하는 주기
+CHATBOT_VECTOR_SNAPSHOT_EXPORT_DEBOUNCE_SECONDS = 30  # 이 시간 동안의 쓰기를 모아 스냅샷을 한 번만 내보냄
+CHATBOT_RELEVANCE_STATS_FLUSH_INTERVAL = 30  # 초, 원본별 검색 통계를 메모리에 모았다가 DB 에 반영하는 주기
+CHATBOT_RECONCILE_GRACE_SECONDS = 900  # 정합성 검사에서 최근 이 시간 안에 수정된 원본은 색인 중일 수 있어 건너뜀
+CHATBOT_CHROMA_PERSIST_DIRECTORY = str(BASE_DIR / "chroma_db")  # 크로마 저장소 경로 (웹/셀러리/관리 명령이 실행 위치와 무관하게 같은 경로 사용)
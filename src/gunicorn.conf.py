@@ -1,5 +1,25 @@
+import os
+
 bind = "0.0.0.0:8080"
 workers = 3  # 0.5 vCPU, 2 GB
 wsgi_app = "config.wsgi:application"
+
+# GUNICORN_ASGI=1 이면 uvicorn 워커로 ASGI 앱을 띄워 send_message_async 가 이벤트 루프 하나에서 여러 대화를 동시에 처리한다.
+# ASGI 에서는 동기 뷰가 워커당 스레드 하나로 직렬화되고 Django 4.2 는 동기 스트리밍 응답(send_message_stream)을
+# 모두 모은 뒤 보내므로, 비동기 엔드포인트(/chat_bot/send_message_async/)만 받는 별도 프로세스 그룹에서 켠다.
+if os.environ.get("GUNICORN_ASGI"):
+    wsgi_app = "config.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
 preload = True
 timeout = 40
+
+
+def post_worker_init(worker):
+    # 워커마다 챗봇 서비스를 미리 생성해 첫 요청에서 초기화 비용을 치르지 않도록 한다.
+    # (preload 된 마스터에서 만들면 fork 후 클라이언트가 공유되므로 반드시 워커에서 생성)
+    from app.chat_bot.rag_service import get_chatbot_service
+
+    try:
+        get_chatbot_service().warmup()
+    except Exception as e:
+        worker.log.warning(f"챗봇 서비스 워밍업 실패: {e}")